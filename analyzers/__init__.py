@@ -6,6 +6,7 @@ from .base_analyzer import BaseAnalyzer
 from .cv_analyzer import CVAnalyzer
 from .diploma_analyzer import DiplomaAnalyzer
 from .sgk_analyzer import SGKAnalyzer
+from .hitap_analyzer import HitapAnalyzer
 from .adli_sicil_analyzer import AdliSicilAnalyzer
 from .proje_analyzer import ProjeAnalyzer
 from .sektor_belge_analyzer import SektorBelgeAnalyzer
@@ -15,6 +16,7 @@ __all__ = [
     'CVAnalyzer',
     'DiplomaAnalyzer',
     'SGKAnalyzer',
+    'HitapAnalyzer',
     'AdliSicilAnalyzer',
     'ProjeAnalyzer',
     'SektorBelgeAnalyzer',
@@ -2,15 +2,38 @@
 Adli Sicil Kaydı analyzer.
 """
 
+import logging
+from typing import Dict, Any, Optional
 from .base_analyzer import BaseAnalyzer
+from services.adli_sicil_parser import AdliSicilParser
+
+logger = logging.getLogger(__name__)
 
 
 class AdliSicilAnalyzer(BaseAnalyzer):
-    """Adli sicil analiz sınıfı"""
+    """Adli sicil analiz sınıfı - temiz kayıtlarda özel parser kullanır"""
+
+    def __init__(self):
+        super().__init__()
+        self.parser = AdliSicilParser()
 
     def get_document_type(self) -> str:
         return "Adli Sicil Kaydı"
 
+    def analyze(self, belge_id: int, belge_content: str = None, belgeTipi: str = None) -> Optional[Dict[str, Any]]:
+        """
+        e-Devlet adli sicil kaydı için özel parse ("kaydı yoktur" kalıbı).
+        Fallback: Kayıt varsa veya şablon tanınmazsa LLM chunk analizi.
+        """
+        result = self._parse_deterministic(belge_id, self.parser.parse_adli_sicil_document, "Adli Sicil")
+
+        if result:
+            logger.info("✓ Adli sicil parse başarılı: kayıt yok")
+            return result
+
+        logger.warning("⚠️ FALLBACK: LLM chunk analizi denenecek...")
+        return super().analyze(belge_id)
+
     def get_prompt_template(self) -> str:
         return """Sen bir adli sicil belgesi analiz uzmanısın. Adli sicil durumunu tespit et.
 
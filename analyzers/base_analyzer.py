@@ -3,16 +3,36 @@ Base analyzer sınıfı.
 Tüm analyzer'ların türetileceği base class.
 """
 
+import base64
+import json
 import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Any
 from datetime import datetime
 
 from services.ollama_service import OllamaService
+from app.services.circuit_breaker import LLMUnavailableError
+from app.services.llm_scheduler import propagate_priority
 from services.document_processor import DocumentProcessor
-from services.chunk_manager import ChunkManager
+from services.chunk_manager import ChunkManager, chunk_dedup_stats, chunk_hash
+from services.template_parser import parse_stats
+from services.model_cascade import (
+    CAPRAZ_DOGRULAMA, EKSIK_ALAN, SONUC_YOK, VALIDASYON, cascade_stats, completeness
+)
+from app.models.extraction_profiles import ExtractionProfile, get_extraction_profile
+from app.models.relevance_profiles import RelevanceProfile, get_relevance_profile, chunk_filter_stats
 from models import Belge
 from models.database import db
+from config.settings import (
+    OCR_RETRY_DPI, OCR_MIN_CONFIDENCE, OCR_SKIP_CONFIDENCE, OCR_VISION_FALLBACK,
+    CHUNK_MAX_CONCURRENCY, CHUNK_BY_TOKENS, CHUNK_TOKEN_MARGIN, CHUNK_MAX_TOKENS,
+    CHUNK_RELEVANCE_FILTER, CHUNK_DEDUP_ENABLED,
+    OLLAMA_OPTIONS, OLLAMA_MODEL,
+    OLLAMA_CASCADE_ENABLED, OLLAMA_CASCADE_SMALL_MODEL, OLLAMA_CASCADE_LARGE_MODEL,
+    OLLAMA_CASCADE_MIN_COMPLETENESS
+)
 
 logger = logging.getLogger(__name__)
 
@@ -20,11 +40,22 @@ logger = logging.getLogger(__name__)
 class BaseAnalyzer(ABC):
     """Base analyzer sınıfı"""
 
+    # Cascade: dolu alan oranı bunun altındaysa büyük modele yükselt (None = OLLAMA_CASCADE_MIN_COMPLETENESS)
+    CASCADE_MIN_COMPLETENESS: Optional[float] = None
+
     def __init__(self):
         """Initialize"""
         self.ollama = OllamaService()
         self.doc_processor = DocumentProcessor()
-        self.chunk_manager = ChunkManager()
+        self.chunk_manager = ChunkManager(token_counter=self.ollama.token_counter)
+        self._token_budget = None
+        self._prompt_hash: Optional[str] = None
+
+        # Cascade kademesinin modeli (None = servis modeli)
+        self.active_model: Optional[str] = None
+        # Üst yazı çapraz doğrulaması (orchestrator verir): sonuç tutarlıysa True
+        self.cross_check: Optional[Callable[[Dict], bool]] = None
+        self._cascade_info: Optional[Dict[str, Any]] = None
 
     @abstractmethod
     def get_prompt_template(self) -> str:
@@ -46,6 +77,75 @@ class BaseAnalyzer(ABC):
         """
         pass
 
+    def get_extraction_profile(self) -> Optional[ExtractionProfile]:
+        """
+        Belge tipine ait metin çıkarma profilini döndür.
+
+        Returns:
+            ExtractionProfile: Profil, tanımlı değilse None (tüm belge okunur)
+        """
+        return get_extraction_profile(self.get_document_type())
+
+    def get_relevance_profile(self) -> Optional[RelevanceProfile]:
+        """
+        Belge tipine ait chunk ilgililik profilini döndür.
+
+        Returns:
+            RelevanceProfile: Profil, tanımlı değilse / filtre kapalıysa None
+            (tüm chunk'lar LLM'e gönderilir)
+        """
+        if not CHUNK_RELEVANCE_FILTER:
+            return None
+        return get_relevance_profile(self.get_document_type())
+
+    def get_chunk_token_budget(self) -> Optional[int]:
+        """
+        Chunk başına belge metnine kalan token bütçesi.
+
+        num_ctx - num_predict (beklenen çıktı) - sistem promptu + şablon
+        (şema dahil) - CHUNK_TOKEN_MARGIN. Şablon sabit olduğundan bir kez
+        hesaplanır.
+
+        Returns:
+            int: Token bütçesi, token bütçeli chunk'lama kapalıysa / bütçe
+            yetersizse None (karakter bazlı chunk'lama)
+        """
+        if not CHUNK_BY_TOKENS:
+            return None
+
+        if self._token_budget is None:
+            counter = self.ollama.token_counter
+            template = self.get_prompt_template().format(
+                document_text='', document_type=self.get_document_type()
+            )
+            counter.calibrate(template)
+
+            overhead = counter.count(self.ollama.DOCUMENT_SYSTEM_PROMPT) + counter.count(template)
+            budget = (
+                OLLAMA_OPTIONS['num_ctx']
+                - OLLAMA_OPTIONS['num_predict']
+                - overhead
+                - CHUNK_TOKEN_MARGIN
+            )
+            if CHUNK_MAX_TOKENS:
+                budget = min(budget, CHUNK_MAX_TOKENS)
+
+            if budget < 256:
+                logger.warning(
+                    f"{self.get_document_type()}: token bütçesi yetersiz ({budget}), "
+                    f"karakter bazlı chunk'lama kullanılacak"
+                )
+                budget = 0
+            else:
+                logger.info(
+                    f"{self.get_document_type()}: chunk token bütçesi {budget} "
+                    f"(num_ctx {OLLAMA_OPTIONS['num_ctx']}, prompt {overhead}, "
+                    f"çıktı {OLLAMA_OPTIONS['num_predict']})"
+                )
+            self._token_budget = budget
+
+        return self._token_budget or None
+
     def analyze(self, belge_id: int) -> Optional[Dict[str, Any]]:
         """
         Belgeyi analiz et.
@@ -55,6 +155,9 @@ class BaseAnalyzer(ABC):
 
         Returns:
             Dict: Analiz sonucu, başarısızsa None
+
+        Raises:
+            LLMUnavailableError: Ollama devre kesicisi açık (başvuru bekletilmeli)
         """
         try:
             # Belgeyi al
@@ -72,12 +175,14 @@ class BaseAnalyzer(ABC):
 
             # İşleme başla
             start_time = datetime.now()
+            self._cascade_info = None
             Belge.mark_as_analyzing(belge_id)
 
             # Belgeyi işle (PDF veya görsel)
             processed = self.doc_processor.process_document(
                 belge['belgeIcerik'],
-                belge.get('belge_uzantisi')
+                belge.get('belge_uzantisi'),
+                profile=self.get_extraction_profile()
             )
 
             if not processed['success']:
@@ -85,15 +190,21 @@ class BaseAnalyzer(ABC):
                 Belge.mark_as_analyzed(belge_id, False, processed.get('error'))
                 return None
 
-            # PHASE 2.2: OCR Kalite Kontrolü
-            if processed.get('text'):
-                ocr_quality = self._check_ocr_quality(processed['text'])
-                if not ocr_quality['acceptable']:
-                    logger.warning(f"OCR kalitesi düşük: {ocr_quality['reason']}")
+            # PHASE 2.2: OCR Kalite Kontrolü (EasyOCR güven skorlarıyla)
+            processed, ocr_route = self._apply_ocr_route(belge, processed)
+
+            if ocr_route['route'] == 'skip':
+                logger.warning(f"LLM atlandı, OCR kalitesi yetersiz: {ocr_route['reason']}")
+                Belge.mark_as_analyzed(belge_id, False, f"OCR kalitesi yetersiz: {ocr_route['reason']}")
+                self._save_analysis_log(
+                    belge_id, belge['basvuruId'], start_time, None, False,
+                    ocr_stats=processed.get('ocr_stats'), ocr_route=ocr_route['route']
+                )
+                return None
 
             # Metin varsa chunk'lara böl
             if processed.get('text'):
-                result = self._analyze_text(processed['text'], belge_id)
+                result = self._analyze_text_cascade(processed['text'], belge_id)
 
             # Görsel varsa vision ile analiz et
             elif processed.get('image_base64'):
@@ -115,15 +226,140 @@ class BaseAnalyzer(ABC):
             Belge.mark_as_analyzed(belge_id, True)
 
             # Log kaydet
-            self._save_analysis_log(belge_id, belge['basvuruId'], start_time, result, True)
+            self._save_analysis_log(
+                belge_id, belge['basvuruId'], start_time, result, True,
+                ocr_stats=processed.get('ocr_stats'), ocr_route=ocr_route['route']
+            )
 
             return result
 
+        except LLMUnavailableError as e:
+            logger.warning(f"LLM erişilemiyor, belge analiz edilmedi: {belge_id}")
+            Belge.mark_as_analyzed(belge_id, False, f"LLM erişilemiyor: {e}")
+            raise
+
         except Exception as e:
             logger.error(f"Analiz hatası: {e}")
             Belge.mark_as_analyzed(belge_id, False, str(e))
             return None
 
+    def _parse_deterministic(self, belge_id: int, parse_fn, label: str) -> Optional[Dict[str, Any]]:
+        """
+        Şablon belgeyi LLM'siz parse et (SGKAnalyzer ile aynı sözleşme).
+
+        Args:
+            belge_id: Belge ID
+            parse_fn: PDF bytes → Dict veya None döndüren parser metodu
+            label: İsabet oranı raporundaki belge tipi adı
+
+        Returns:
+            Dict: Parse sonucu, şablon tanınmazsa None (çağıran LLM'e düşer)
+        """
+        belge = Belge.get_by_id(belge_id)
+        if not belge or not belge.get('belgeIcerik'):
+            return None
+
+        result = None
+        start = time.perf_counter()
+        uzanti = (belge.get('belge_uzantisi') or 'pdf').lower().lstrip('.')
+
+        # Görsel / taranmış belgelerde metin katmanı yok: doğrudan LLM (OCR) yolu
+        if uzanti == 'pdf':
+            try:
+                result = parse_fn(base64.b64decode(belge['belgeIcerik']))
+            except Exception as e:
+                logger.error(f"{label} parse hatası: {e}", exc_info=True)
+
+        elapsed = time.perf_counter() - start
+        parse_stats.record(label, bool(result), elapsed)
+        logger.info(
+            f"📊 Deterministik parse {'isabet' if result else 'ıska'}: {label} ({elapsed * 1000:.0f} ms, "
+            f"isabet oranı {parse_stats.hit_rate(label):.0%})"
+        )
+
+        if result:
+            Belge.mark_as_analyzed(belge_id, True)
+        return result
+
+    def _apply_ocr_route(self, belge: Dict, processed: Dict[str, Any]):
+        """
+        OCR kalite kararını uygula.
+
+        Düşük güvende önce yüksek DPI ile OCR tekrarlanır; hâlâ düşükse
+        içerik taşıyan sayfalar vision modele yönlendirilir ya da LLM tamamen atlanır.
+
+        Args:
+            belge: Belge dict
+            processed: process_document sonucu
+
+        Returns:
+            Tuple[Dict, Dict]: (güncel processed, {'route', 'reason'})
+        """
+        route = self._decide_ocr_route(processed)
+
+        if route['route'] == 'retry_ocr':
+            logger.info(f"🔁 OCR {OCR_RETRY_DPI} DPI ile tekrarlanıyor ({route['reason']})")
+            retried = self.doc_processor.process_document(
+                belge['belgeIcerik'],
+                belge.get('belge_uzantisi'),
+                profile=self.get_extraction_profile(),
+                ocr_dpi=OCR_RETRY_DPI
+            )
+            if retried['success']:
+                processed = retried
+            route = self._decide_ocr_route(processed, retried=True)
+
+        if route['route'] == 'vision':
+            pdf_bytes = self.doc_processor.decode_base64(belge['belgeIcerik'])
+            image_b64 = self.doc_processor.render_pdf_vision_image(pdf_bytes) if pdf_bytes else None
+            if image_b64:
+                logger.info(f"👁️ Vision modele yönlendiriliyor ({route['reason']})")
+                processed = {**processed, 'text': None, 'image_base64': image_b64}
+            elif ((processed.get('ocr_stats') or {}).get('ortalama_guven') or 0.0) < OCR_SKIP_CONFIDENCE:
+                route = {'route': 'skip', 'reason': route['reason']}
+            else:
+                route = {'route': 'llm', 'reason': 'Vision için görsel oluşturulamadı'}
+
+        return processed, route
+
+    def _decide_ocr_route(self, processed: Dict[str, Any], retried: bool = False) -> Dict[str, str]:
+        """
+        OCR özetine göre ucuz karar ver (LLM çağrısı yapmadan).
+
+        Args:
+            processed: process_document sonucu
+            retried: Yüksek DPI denemesi yapıldı mı?
+
+        Returns:
+            Dict: {'route': 'llm' | 'retry_ocr' | 'vision' | 'skip', 'reason': str}
+        """
+        stats = processed.get('ocr_stats')
+
+        # Metin katmanı olan sayfalar varsa mevcut davranış (metin kontrolü + LLM)
+        if not stats or not stats['ocr_sayfa_sayisi'] or stats['ocr_sayfa_sayisi'] < stats['sayfa_sayisi']:
+            if processed.get('text'):
+                ocr_quality = self._check_ocr_quality(processed['text'], stats)
+                if not ocr_quality['acceptable']:
+                    logger.warning(f"OCR kalitesi düşük: {ocr_quality['reason']}")
+            return {'route': 'llm', 'reason': 'Metin katmanı mevcut'}
+
+        confidence = stats['ortalama_guven'] or 0.0
+        reason = f"ortalama güven {confidence:.2f}, düşük güven oranı %{(stats['dusuk_guven_orani'] or 0) * 100:.0f}"
+
+        if confidence >= OCR_MIN_CONFIDENCE:
+            return {'route': 'llm', 'reason': reason}
+
+        if not retried and (stats['dpi'] or 0) < OCR_RETRY_DPI:
+            return {'route': 'retry_ocr', 'reason': reason}
+
+        if OCR_VISION_FALLBACK:
+            return {'route': 'vision', 'reason': reason}
+
+        if confidence < OCR_SKIP_CONFIDENCE:
+            return {'route': 'skip', 'reason': reason}
+
+        return {'route': 'llm', 'reason': reason}
+
     def _analyze_text(self, text: str, belge_id: int) -> Optional[Dict[str, Any]]:
         """
         Metin analizi (chunk'larla).
@@ -135,22 +371,27 @@ class BaseAnalyzer(ABC):
         Returns:
             Dict: Analiz sonucu
         """
-        # Chunk'lara böl
-        chunks = self.chunk_manager.create_chunks(text)
+        # Chunk'lara böl (profil varsa chunk sayısı sınırlı)
+        profile = self.get_extraction_profile()
+        chunks = self.chunk_manager.create_chunks(
+            text,
+            max_chunks=profile.max_chunks if profile else None,
+            token_budget=self.get_chunk_token_budget()
+        )
 
         logger.info(f"Belge {belge_id}: {len(chunks)} chunk oluşturuldu")
 
+        # Şema alanlarına katkı veremeyecek chunk'lar (kaynakça, kalıp metin) gönderilmez
+        chunks = self._filter_relevant_chunks(chunks, belge_id)
+
         chunk_results = []
         chunk_data_for_db = []  # DB'ye kaydetmek için
 
-        # Her chunk'ı analiz et
-        for i, chunk in enumerate(chunks):
-            chunk_result = self.ollama.analyze_document(
-                document_text=chunk.text,
-                document_type=self.get_document_type(),
-                prompt_template=self.get_prompt_template()
-            )
+        # Chunk'ları eşzamanlı gönder, sonuçları chunk sırasıyla işle (merge deterministik kalsın)
+        raw_results = self._dispatch_chunks(chunks)
 
+        for chunk, chunk_result in zip(chunks, raw_results):
+            i = chunk.index
             # VALIDATION: chunk_result yapısını kontrol et
             if not chunk_result:
                 logger.warning(f"Chunk {i} için sonuç None")
@@ -184,7 +425,9 @@ class BaseAnalyzer(ABC):
                 'end': chunk.end,
                 'data': chunk_result['data'],
                 'model': chunk_result.get('model'),
-                'duration': chunk_result.get('duration')
+                'duration': chunk_result.get('duration'),
+                'usage': chunk_result.get('usage'),
+                'hash': chunk.hash
             })
 
         # Chunk sonuçlarını birleştir
@@ -198,6 +441,266 @@ class BaseAnalyzer(ABC):
 
         return None
 
+    def _analyze_text_cascade(self, text: str, belge_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Metin analizi, cascade açıksa önce küçük sonra gerekirse büyük model.
+
+        Büyük model de sonuç üretemezse küçük modelin sonucu kullanılır.
+
+        Args:
+            text: Belge metni
+            belge_id: Belge ID
+
+        Returns:
+            Dict: Analiz sonucu
+        """
+        if not OLLAMA_CASCADE_ENABLED:
+            return self._analyze_text(text, belge_id)
+
+        document_type = self.get_document_type()
+        try:
+            self.active_model = OLLAMA_CASCADE_SMALL_MODEL
+            result = self._analyze_text(text, belge_id)
+            reasons = self._escalation_reasons(result)
+            cascade_stats.record(document_type, reasons)
+
+            if not reasons:
+                self._cascade_info = {'kademe': 1, 'nedenler': []}
+                return result
+
+            logger.info(
+                f"⬆️ {document_type} (belge {belge_id}): {OLLAMA_CASCADE_LARGE_MODEL} modeline "
+                f"yükseltiliyor ({', '.join(reasons)})"
+            )
+            self.active_model = OLLAMA_CASCADE_LARGE_MODEL
+            escalated = self._analyze_text(text, belge_id)
+
+            if escalated is None:
+                logger.warning(f"{document_type}: büyük model sonuç üretemedi, küçük model sonucu kullanılıyor")
+                self._cascade_info = {'kademe': 1, 'nedenler': reasons}
+                return result
+
+            self._cascade_info = {'kademe': 2, 'nedenler': reasons}
+            return escalated
+        finally:
+            self.active_model = None
+
+    def _escalation_reasons(self, result: Optional[Dict[str, Any]]) -> list:
+        """
+        Küçük model sonucunun büyük modele yükseltilme nedenleri.
+
+        Returns:
+            list: Neden kodları (boş = sonuç kabul)
+        """
+        if not result:
+            return [SONUC_YOK]
+
+        reasons = []
+        if not self._validate_result(result)['valid']:
+            reasons.append(VALIDASYON)
+
+        if self.cross_check is not None and not self.cross_check(result):
+            reasons.append(CAPRAZ_DOGRULAMA)
+
+        threshold = self.CASCADE_MIN_COMPLETENESS
+        if threshold is None:
+            threshold = OLLAMA_CASCADE_MIN_COMPLETENESS
+        if completeness(result) < threshold:
+            reasons.append(EKSIK_ALAN)
+
+        return reasons
+
+    def _filter_relevant_chunks(self, chunks: list, belge_id: int) -> list:
+        """
+        İlgililik profiline göre LLM'e gidecek chunk'ları seç.
+
+        Chunk index'leri korunur (DB'deki chunk_index orijinal sırayı gösterir).
+
+        Args:
+            chunks: Chunk listesi
+            belge_id: Belge ID (log için)
+
+        Returns:
+            list: Tutulan chunk'lar (belge sırasıyla)
+        """
+        profile = self.get_relevance_profile()
+        if profile is None or len(chunks) <= max(1, profile.min_keep):
+            return chunks
+
+        keep, scores = profile.select([chunk.text for chunk in chunks])
+        kept = [chunks[i] for i in keep]
+
+        document_type = self.get_document_type()
+        chunk_filter_stats.add(document_type, len(chunks), len(chunks) - len(kept))
+
+        if len(kept) < len(chunks):
+            skipped = [f"{i} (puan {s['score']:.1f})" for i, s in enumerate(scores) if i not in keep]
+            logger.info(
+                f"Belge {belge_id}: {len(chunks) - len(kept)}/{len(chunks)} chunk ilgisiz, atlandı: "
+                f"{', '.join(skipped)} | {document_type} atlama oranı: "
+                f"{chunk_filter_stats.skip_rate(document_type):.0%}"
+            )
+
+        return kept
+
+    def _analyze_chunk(self, chunk) -> Optional[Dict[str, Any]]:
+        """
+        Tek chunk'ı LLM ile analiz et (hata durumunda None).
+
+        LLMUnavailableError yutulmaz: devre açıkken kalan chunk'lar da
+        hemen düşeceği için belge analizi bırakılır.
+
+        Args:
+            chunk: Chunk
+
+        Returns:
+            Dict: analyze_document sonucu
+        """
+        try:
+            return self.ollama.analyze_document(
+                document_text=chunk.text,
+                document_type=self.get_document_type(),
+                prompt_template=self.get_prompt_template(),
+                model=self.active_model
+            )
+        except LLMUnavailableError:
+            raise
+        except Exception as e:
+            logger.error(f"Chunk {chunk.index} analiz hatası: {e}")
+            return None
+
+    def _dispatch_chunks(self, chunks: list) -> list:
+        """
+        Chunk'ları sınırlı eşzamanlılıkla Ollama'ya gönder.
+
+        Toplam süre yaklaşık en yavaş chunk kadar olur (chunk sayısı
+        CHUNK_MAX_CONCURRENCY'yi aşmadıkça). CHUNK_DEDUP_ENABLED açıksa
+        aynı metinli chunk'lar bir kez gönderilir; daha önce (başka belge /
+        çalıştırmada) aynı prompt ve modelle analiz edilmiş chunk'lar hiç
+        gönderilmez.
+
+        Args:
+            chunks: Chunk listesi
+
+        Returns:
+            list: Chunk sırasıyla analyze_document sonuçları
+        """
+        if not CHUNK_DEDUP_ENABLED:
+            return self._send_chunks(chunks)
+
+        results = self._lookup_prior_results(chunks)
+        pending = {}
+        for chunk in chunks:
+            if chunk.hash and chunk.hash not in results:
+                pending.setdefault(chunk.hash, chunk)
+        unhashed = [chunk for chunk in chunks if not chunk.hash]
+
+        reused = sum(1 for chunk in chunks if chunk.hash in results)
+        sent = list(pending.values()) + unhashed
+        for chunk, result in zip(sent, self._send_chunks(sent)):
+            if chunk.hash:
+                results[chunk.hash] = result
+            else:
+                results[id(chunk)] = result
+
+        # Belge içi tekrarlar: sonuç paylaşılır, token / süre sayaçları bir kez yazılır
+        ordered = []
+        seen = set()
+        for chunk in chunks:
+            key = chunk.hash or id(chunk)
+            result = results.get(key)
+            if key in seen and result:
+                result = {**result, 'duration': 0.0, 'usage': None, 'reused': True}
+            seen.add(key)
+            ordered.append(result)
+
+        duplicates = len(chunks) - reused - len(sent)
+        chunk_dedup_stats.add(self.get_document_type(), len(chunks), reused + duplicates)
+        if reused or duplicates:
+            logger.info(
+                f"♻️ {len(chunks)} chunk'tan {reused} önceki sonuçtan, {duplicates} belge içi "
+                f"tekrardan karşılandı; {len(sent)} chunk LLM'e gidiyor"
+            )
+        return ordered
+
+    def _send_chunks(self, chunks: list) -> list:
+        """Chunk'ları LLM'e gönder (chunk sırasıyla sonuçlar)"""
+        workers = max(1, min(CHUNK_MAX_CONCURRENCY, len(chunks)))
+
+        if workers == 1:
+            return [self._analyze_chunk(chunk) for chunk in chunks]
+
+        logger.info(f"{len(chunks)} chunk {workers} eşzamanlı istekle analiz ediliyor")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chunk") as executor:
+            # map girdi sırasını korur
+            # Thread'ler çağıranın LLM öncelik sınıfını miras almaz
+            return list(executor.map(propagate_priority(self._analyze_chunk), chunks))
+
+    def get_prompt_hash(self) -> str:
+        """
+        Chunk sonucunu belirleyen prompt'un hash'i.
+
+        Sistem promptu + belge tipi + şablon; şablon değişince önceki chunk
+        sonuçları yeniden kullanılmaz. Şablon sabit olduğundan bir kez
+        hesaplanır.
+        """
+        if self._prompt_hash is None:
+            self._prompt_hash = chunk_hash("\x00".join((
+                self.ollama.DOCUMENT_SYSTEM_PROMPT,
+                self.get_document_type(),
+                self.get_prompt_template()
+            )))
+        return self._prompt_hash
+
+    def _lookup_prior_results(self, chunks: list) -> Dict[str, Dict[str, Any]]:
+        """
+        Aynı metin + prompt + modelle daha önce kaydedilmiş chunk sonuçları.
+
+        Args:
+            chunks: Chunk listesi
+
+        Returns:
+            Dict: chunk hash → analyze_document biçiminde sonuç (bulunanlar)
+        """
+        hashes = sorted({chunk.hash for chunk in chunks if chunk.hash})
+        if not hashes:
+            return {}
+
+        model = self.active_model or self.ollama.model
+        query = f"""
+            SELECT c.chunk_text_hash, c.response_json
+            FROM chunk_sonuclari c
+            INNER JOIN belge_analiz_log l ON l.id = c.log_id
+            WHERE c.chunk_text_hash IN ({', '.join('?' * len(hashes))})
+              AND c.prompt_hash = ?
+              AND c.response_valid = 1
+              AND l.ollama_model = ?
+            ORDER BY c.id
+        """
+        try:
+            rows = db.fetchall(query, (*hashes, self.get_prompt_hash(), model))
+        except Exception as e:
+            logger.warning(f"Önceki chunk sonuçları okunamadı (migration 006 uygulandı mı?): {e}")
+            return {}
+
+        results = {}
+        for row in rows:
+            try:
+                data = json.loads(row['response_json'])
+            except (TypeError, ValueError):
+                continue
+            if isinstance(data, dict):
+                # En yeni kayıt kazanır
+                results[row['chunk_text_hash']] = {
+                    'success': True,
+                    'data': data,
+                    'model': model,
+                    'duration': 0.0,
+                    'usage': None,
+                    'reused': True
+                }
+        return results
+
     def _analyze_image(self, image_base64: str, belge_id: int) -> Optional[Dict[str, Any]]:
         """
         Görsel analizi (vision model ile).
@@ -216,7 +719,20 @@ class BaseAnalyzer(ABC):
         )
 
         if result and result.get('success'):
-            return result['data']
+            data = result['data']
+            # Tek "chunk" olarak kaydet (vision çağrısının token / süre sayaçları için)
+            if isinstance(data, dict):
+                data_copy = {k: v for k, v in data.items() if k != '_chunk_data'}
+                data['_chunk_data'] = [{
+                    'index': 0,
+                    'start': 0,
+                    'end': 0,
+                    'data': data_copy,
+                    'model': result.get('model'),
+                    'duration': result.get('duration'),
+                    'usage': result.get('usage')
+                }]
+            return data
 
         return None
 
@@ -226,7 +742,9 @@ class BaseAnalyzer(ABC):
         basvuru_id: int,
         start_time: datetime,
         result: Optional[Dict],
-        success: bool
+        success: bool,
+        ocr_stats: Optional[Dict] = None,
+        ocr_route: Optional[str] = None
     ):
         """
         Analiz logunu ve chunk sonuçlarını kaydet.
@@ -237,9 +755,10 @@ class BaseAnalyzer(ABC):
             start_time: Başlangıç zamanı
             result: Analiz sonucu
             success: Başarılı mı?
+            ocr_stats: OCR kalite özeti (summarize_pages)
+            ocr_route: OCR kararı (llm, retry_ocr, vision, skip)
         """
         try:
-            import json
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
 
@@ -247,17 +766,35 @@ class BaseAnalyzer(ABC):
             chunk_data = result.get('_chunk_data', []) if result else []
             chunk_sayisi = len(chunk_data)
 
+            # Ollama token / süre sayaçları (cache'ten gelen chunk'larda usage yok)
+            usages = [chunk['usage'] for chunk in chunk_data if chunk.get('usage')]
+            # Hiçbir chunk'ta gelmeyen sayaç 0 değil NULL yazılır
+            usage_total = {
+                key: sum(u[key] for u in usages if u[key] is not None)
+                if any(u[key] is not None for u in usages) else None
+                for key in ('prompt_tokens', 'eval_tokens', 'prompt_s', 'eval_s', 'load_s')
+            } if usages else {}
+
             # Log kaydı
             query = """
                 INSERT INTO belge_analiz_log (
                     belgeId, basvuruId, belgeTipi,
                     ollama_url, ollama_model,
-                    chunk_sayisi,
-                    basarili, islem_baslangic, islem_bitis, islem_suresi_sn
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    chunk_sayisi, toplam_token_tahmini, model_kademesi, yukseltme_nedeni,
+                    prompt_token_toplam, cevap_token_toplam,
+                    prompt_suresi_sn, uretim_suresi_sn, yukleme_suresi_sn,
+                    basarili, islem_baslangic, islem_bitis, islem_suresi_sn,
+                    ocr_sayfa_sayisi, ocr_ortalama_guven, ocr_min_guven,
+                    ocr_dusuk_guven_orani, ocr_dpi, ocr_karar
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """
+            ocr_stats = ocr_stats or {}
 
-            from config.settings import OLLAMA_BASE_URL, OLLAMA_MODEL
+            from config.settings import OLLAMA_BASE_URL
+
+            # Cascade'de kullanılan kademenin modeli
+            model = next((chunk['model'] for chunk in chunk_data if chunk.get('model')), None) or OLLAMA_MODEL
+            cascade = self._cascade_info or {}
 
             with db.get_cursor() as cursor:
                 cursor.execute(query, (
@@ -265,12 +802,26 @@ class BaseAnalyzer(ABC):
                     basvuru_id,
                     self.get_document_type(),
                     OLLAMA_BASE_URL,
-                    OLLAMA_MODEL,
+                    model,
                     chunk_sayisi if chunk_sayisi > 0 else 1,
+                    (usage_total['prompt_tokens'] or 0) + (usage_total['eval_tokens'] or 0) if usages else None,
+                    cascade.get('kademe'),
+                    ','.join(cascade.get('nedenler', [])) or None,
+                    usage_total.get('prompt_tokens'),
+                    usage_total.get('eval_tokens'),
+                    usage_total.get('prompt_s'),
+                    usage_total.get('eval_s'),
+                    usage_total.get('load_s'),
                     1 if success else 0,
                     start_time.isoformat(),
                     end_time.isoformat(),
-                    duration
+                    duration,
+                    ocr_stats.get('ocr_sayfa_sayisi'),
+                    ocr_stats.get('ortalama_guven'),
+                    ocr_stats.get('min_guven'),
+                    ocr_stats.get('dusuk_guven_orani'),
+                    ocr_stats.get('dpi'),
+                    ocr_route
                 ))
 
                 # Log ID'yi al
@@ -280,20 +831,33 @@ class BaseAnalyzer(ABC):
                 if chunk_data and log_id:
                     chunk_query = """
                         INSERT INTO chunk_sonuclari (
-                            log_id, chunk_index, chunk_start, chunk_end, response_json, response_valid
-                        ) VALUES (?, ?, ?, ?, ?, ?)
+                            log_id, chunk_index, chunk_start, chunk_end, chunk_text_hash, prompt_hash,
+                            response_json, response_valid,
+                            api_call_suresi_sn, prompt_token, cevap_token,
+                            prompt_suresi_sn, uretim_suresi_sn, yukleme_suresi_sn, toplam_suresi_sn
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     """
 
                     for chunk in chunk_data:
                         try:
                             response_json = json.dumps(chunk['data'], ensure_ascii=False)
+                            usage = chunk.get('usage') or {}
                             cursor.execute(chunk_query, (
                                 log_id,
                                 chunk['index'],
                                 chunk['start'],
                                 chunk['end'],
+                                chunk.get('hash'),
+                                self.get_prompt_hash() if chunk.get('hash') else None,
                                 response_json,
-                                1  # Valid JSON
+                                1,  # Valid JSON
+                                chunk.get('duration'),
+                                usage.get('prompt_tokens'),
+                                usage.get('eval_tokens'),
+                                usage.get('prompt_s'),
+                                usage.get('eval_s'),
+                                usage.get('load_s'),
+                                usage.get('total_s')
                             ))
                         except Exception as e:
                             logger.error(f"Chunk {chunk['index']} kaydedilemedi: {e}")
@@ -342,18 +906,25 @@ class BaseAnalyzer(ABC):
         except Exception as e:
             return {'valid': False, 'error': f'Format kontrolü hatası: {str(e)}'}
 
-    def _check_ocr_quality(self, text: str) -> Dict[str, Any]:
+    def _check_ocr_quality(self, text: str, ocr_stats: Optional[Dict] = None) -> Dict[str, Any]:
         """
         PHASE 2.2: OCR Kalite Kontrolü
 
         Args:
             text: Çıkarılan metin
+            ocr_stats: OCR kalite özeti (varsa EasyOCR güveni kullanılır)
 
         Returns:
             Dict: {'acceptable': bool, 'reason': str, 'confidence': float}
         """
         import re
 
+        # EasyOCR güven skoru varsa tahmin yerine onu kullan
+        if ocr_stats and ocr_stats.get('ortalama_guven') is not None:
+            confidence = ocr_stats['ortalama_guven']
+            if confidence < OCR_MIN_CONFIDENCE:
+                return {'acceptable': False, 'reason': f'OCR güveni düşük ({confidence:.2f})', 'confidence': confidence}
+
         # Boş mu?
         if not text or len(text.strip()) < 100:
             return {'acceptable': False, 'reason': 'Metin çok kısa (<100 karakter)', 'confidence': 0.0}
@@ -2,15 +2,38 @@
 Diploma analyzer.
 """
 
+import logging
+from typing import Dict, Any, Optional
 from .base_analyzer import BaseAnalyzer
+from services.diploma_parser import DiplomaParser
+
+logger = logging.getLogger(__name__)
 
 
 class DiplomaAnalyzer(BaseAnalyzer):
-    """Diploma analiz sınıfı"""
+    """Diploma analiz sınıfı - YÖK mezun belgesinde özel parser kullanır"""
+
+    def __init__(self):
+        super().__init__()
+        self.parser = DiplomaParser()
 
     def get_document_type(self) -> str:
         return "Yök Lisans Diploması"
 
+    def analyze(self, belge_id: int, belge_content: str = None, belgeTipi: str = None) -> Optional[Dict[str, Any]]:
+        """
+        YÖK mezun belgesi için özel parse (MEZUNİYET BİLGİSİ bölümleri).
+        Fallback: Şablon tanınmazsa LLM chunk analizi.
+        """
+        result = self._parse_deterministic(belge_id, self.parser.parse_diploma_document, "Diploma")
+
+        if result:
+            logger.info(f"✓ Diploma parse başarılı: {len(result['diplomalar'])} mezuniyet kaydı")
+            return result
+
+        logger.warning("⚠️ FALLBACK: LLM chunk analizi denenecek...")
+        return super().analyze(belge_id)
+
     def get_prompt_template(self) -> str:
         return """Sen bir diploma analiz uzmanısın. YÖK diploma belgesinden SADECE BELGEDEKİ bilgileri çıkar.
 
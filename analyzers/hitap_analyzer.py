@@ -0,0 +1,36 @@
+"""
+HİTAP Hizmet Dökümü analyzer.
+"""
+
+import logging
+from typing import Dict, Any, Optional
+from .base_analyzer import BaseAnalyzer
+from .sgk_analyzer import SGKAnalyzer
+from services.hitap_parser import HitapParser
+
+logger = logging.getLogger(__name__)
+
+
+class HitapAnalyzer(SGKAnalyzer):
+    """HİTAP analiz sınıfı - Özel parser kullanır, LLM yedeğinde SGK prompt'u"""
+
+    def __init__(self):
+        super().__init__()
+        self.parser = HitapParser()
+
+    def get_document_type(self) -> str:
+        return "Hitap Hizmet Dökümü"
+
+    def analyze(self, belge_id: int, belge_content: str = None, belgeTipi: str = None) -> Optional[Dict[str, Any]]:
+        """
+        HİTAP belgesi için özel parse (görev satırları + toplam süre).
+        Fallback: Şablon tanınmazsa LLM chunk analizi.
+        """
+        result = self._parse_deterministic(belge_id, self.parser.parse_hitap_document, "Hitap")
+
+        if result:
+            logger.info(f"✓ HİTAP parse başarılı: {result['toplam_is_deneyimi_yil']}y {result['toplam_is_deneyimi_ay']}a")
+            return self._clear_sector_fields(result)
+
+        logger.warning("⚠️ FALLBACK: LLM chunk analizi denenecek...")
+        return BaseAnalyzer.analyze(self, belge_id)
@@ -101,23 +101,20 @@ SADECE JSON DÖNDÜR. AÇIKLAMA, YORUM, MARKDOWN YAPMA!
         Returns:
             Dict: Analiz sonucu
         """
-        # Chunk'lara böl
-        chunks = self.chunk_manager.create_chunks(text)
+        # SADECE İLK CHUNK'I İŞLE - chunk'lar lazy üretildiği için sonrası hiç oluşturulmaz
+        first_chunk = next(self.chunk_manager.iter_chunks(text), None)
 
-        logger.info(f"Sektör Belgesi {belge_id}: {len(chunks)} chunk oluşturuldu, SADECE İLK CHUNK işlenecek")
-
-        if not chunks:
+        if first_chunk is None:
             return None
 
-        # SADECE İLK CHUNK'I İŞLE
-        first_chunk = chunks[0]
-
-        chunk_result = self.ollama.analyze_document(
-            document_text=first_chunk.text,
-            document_type=self.get_document_type(),
-            prompt_template=self.get_prompt_template()
+        logger.info(
+            f"Sektör Belgesi {belge_id}: SADECE İLK CHUNK işlenecek "
+            f"({first_chunk.end - first_chunk.start}/{len(text)} karakter)"
         )
 
+        # Aynı metin daha önce analiz edildiyse önceki sonuç kullanılır
+        chunk_result = self._dispatch_chunks([first_chunk])[0]
+
         if chunk_result and chunk_result.get('success'):
             result = chunk_result['data']
 
@@ -132,7 +129,9 @@ SADECE JSON DÖNDÜR. AÇIKLAMA, YORUM, MARKDOWN YAPMA!
                 'end': first_chunk.end,
                 'data': data_copy,  # Shallow copy kullan, recursive yapı olmasın
                 'model': chunk_result.get('model'),
-                'duration': chunk_result.get('duration')
+                'duration': chunk_result.get('duration'),
+                'usage': chunk_result.get('usage'),
+                'hash': first_chunk.hash
             }]
 
             return result
@@ -2,12 +2,10 @@
 SGK Hizmet Dökümü analyzer.
 """
 
-import base64
 import logging
 from typing import Dict, Any, Optional
 from .base_analyzer import BaseAnalyzer
 from services.sgk_parser import SGKParser
-from models.belge import Belge
 
 logger = logging.getLogger(__name__)
 
@@ -29,61 +27,35 @@ class SGKAnalyzer(BaseAnalyzer):
         """
         logger.info(f"SGK belgesi özel parser ile analiz ediliyor (belgeId={belge_id})...")
 
-        # PDF bytes al
-        belge = Belge.get_by_id(belge_id)
-        if not belge or not belge.get('belgeIcerik'):
-            logger.error(f"Belge içeriği bulunamadı: {belge_id}")
-            return None
+        # Özel parser kullan (chunk'lamadan!)
+        result = self._parse_deterministic(belge_id, self.parser.parse_sgk_document, "SGK")
 
-        try:
-            pdf_bytes = base64.b64decode(belge['belgeIcerik'])
-        except Exception as e:
-            logger.error(f"Base64 decode hatası: {e}")
-            return None
+        if result:
+            logger.info(f"✓ SGK parse başarılı: {result['toplam_is_deneyimi_yil']}y {result['toplam_is_deneyimi_ay']}a")
+            return self._clear_sector_fields(result)
 
-        # Özel parser kullan (chunk'lamadan!)
-        try:
-            result = self.parser.parse_sgk_document(pdf_bytes)
-
-            if result:
-                logger.info(f"✓ SGK parse başarılı: {result['toplam_is_deneyimi_yil']}y {result['toplam_is_deneyimi_ay']}a")
-
-                # ÖNEMLİ: Sektör bilgilerini NULL yap!
-                # SGK belgesinde sektör bilgisi YOK, sadece toplam deneyim var
-                # Sektör bilgileri SADECE sektör belgelerinden gelecek
-                result['tecrube_enerji'] = None
-                result['tecrube_enerji_yil'] = None
-                result['tecrube_enerji_ay'] = None
-                result['tecrube_metal'] = None
-                result['tecrube_metal_yil'] = None
-                result['tecrube_metal_ay'] = None
-                result['tecrube_mineral'] = None
-                result['tecrube_mineral_yil'] = None
-                result['tecrube_mineral_ay'] = None
-                result['tecrube_kimya'] = None
-                result['tecrube_kimya_yil'] = None
-                result['tecrube_kimya_ay'] = None
-                result['tecrube_atik'] = None
-                result['tecrube_atik_yil'] = None
-                result['tecrube_atik_ay'] = None
-                result['tecrube_diger'] = None
-                result['tecrube_diger_yil'] = None
-                result['tecrube_diger_ay'] = None
-
-                logger.info("Sektör bilgileri NULL olarak işaretlendi (sektör belgelerinden gelecek)")
-
-                return result
-            else:
-                logger.warning("SGK parser sonuç döndürmedi")
-
-        except Exception as e:
-            logger.error(f"SGK parse hatası: {e}", exc_info=True)
+        logger.warning("SGK parser sonuç döndürmedi")
 
         # Fallback: LLM chunk analizi
         logger.warning("⚠️ FALLBACK: LLM chunk analizi denenecek...")
         logger.warning("⚠️ DİKKAT: LLM chunk analizi güvenilir değil! Manuel kontrol gerekli!")
 
-        return super().analyze(belge_id, belge_content, belgeTipi)
+        return super().analyze(belge_id)
+
+    @staticmethod
+    def _clear_sector_fields(result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        ÖNEMLİ: Sektör bilgilerini NULL yap!
+        Hizmet dökümünde sektör bilgisi YOK, sadece toplam deneyim var.
+        Sektör bilgileri SADECE sektör belgelerinden gelecek.
+        """
+        for sektor in ('enerji', 'metal', 'mineral', 'kimya', 'atik', 'diger'):
+            result[f'tecrube_{sektor}'] = None
+            result[f'tecrube_{sektor}_yil'] = None
+            result[f'tecrube_{sektor}_ay'] = None
+
+        logger.info("Sektör bilgileri NULL olarak işaretlendi (sektör belgelerinden gelecek)")
+        return result
 
     def get_prompt_template(self) -> str:
         return """Sen bir SGK belgesi analiz uzmanısın. Aşağıdaki SGK Hizmet Dökümü belgesini DETAYLI analiz et ve TÜM iş deneyimi bilgilerini JSON formatında çıkar.
@@ -16,6 +16,7 @@ import json
 sys.path.insert(0, str(Path(__file__).parent))
 
 from models.database import db
+from app.services.ollama_client import usage_breakdown
 
 app = FastAPI(
     title="Yeşil Dönüşüm Başvuru Analiz API",
@@ -75,8 +76,13 @@ async def root():
 
 
 @app.get("/api/stats")
-async def get_stats():
-    """Genel istatistikler - YENİ VERİTABANI YAPISI"""
+async def get_stats(saat: int = 24, son_chunk: int = 500):
+    """
+    Genel istatistikler - YENİ VERİTABANI YAPISI
+
+    llm_performans: Ollama token / süre sayaçlarından prompt-üretim dağılımı
+    (son `saat` saat) ve kayan pencere (son `son_chunk` chunk) token/sn.
+    """
 
     # Toplam başvuru
     query = "SELECT COUNT(*) as count FROM basvurular"
@@ -109,7 +115,85 @@ async def get_stats():
         "islenen_basvuru": islenen_basvuru,
         "basarili_analiz": basarili_basvuru,
         "basarili_belge": basarili_belge,
-        "toplam_chunk": toplam_chunk
+        "toplam_chunk": toplam_chunk,
+        "llm_performans": get_llm_performance(saat, son_chunk),
+        "model_kademe": get_cascade_stats(saat)
+    }
+
+
+def get_cascade_stats(saat: int) -> Dict[str, Any]:
+    """Belge tipi bazlı büyük modele yükseltme oranları (cascade açıkken yazılan kayıtlar)"""
+    query = """
+        SELECT belgeTipi,
+               COUNT(*) as belge,
+               SUM(CASE WHEN model_kademesi = 2 THEN 1 ELSE 0 END) as yukseltilen
+        FROM belge_analiz_log
+        WHERE model_kademesi IS NOT NULL
+          AND created_at >= datetime('now', ?)
+        GROUP BY belgeTipi
+        ORDER BY belge DESC
+    """
+    try:
+        rows = db.fetchall(query, (f"-{saat} hours",))
+    except Exception as e:
+        return {"hata": f"Kademe bilgisi okunamadı (migration 005 uygulandı mı?): {e}"}
+
+    return {
+        row['belgeTipi']: {
+            "belge": row['belge'],
+            "yukseltilen": row['yukseltilen'],
+            "yukseltme_orani": round(row['yukseltilen'] / row['belge'], 3) if row['belge'] else 0.0,
+        }
+        for row in rows
+    }
+
+
+def get_llm_performance(saat: int, son_chunk: int) -> Dict[str, Any]:
+    """chunk_sonuclari'ndaki Ollama sayaçlarından token/sn ve süre payları"""
+    usage_columns = """
+        COUNT(*) as chunk,
+        SUM(prompt_token) as prompt_token,
+        SUM(cevap_token) as cevap_token,
+        SUM(prompt_suresi_sn) as prompt_sn,
+        SUM(uretim_suresi_sn) as uretim_sn,
+        SUM(yukleme_suresi_sn) as yukleme_sn
+    """
+
+    def breakdown(row) -> Dict[str, Any]:
+        result = usage_breakdown(
+            row['prompt_token'] or 0, row['cevap_token'] or 0,
+            row['prompt_sn'] or 0.0, row['uretim_sn'] or 0.0, row['yukleme_sn'] or 0.0
+        )
+        result['chunk'] = row['chunk']
+        return result
+
+    try:
+        # Son N saat (migration 004 öncesi kayıtlarda sayaç yok, NULL satırlar sayılmaz)
+        query = f"""
+            SELECT {usage_columns}
+            FROM chunk_sonuclari
+            WHERE cevap_token IS NOT NULL
+              AND created_at >= datetime('now', ?)
+        """
+        donem = db.fetchone(query, (f"-{saat} hours",))
+
+        # Kayan pencere: son N model çağrısı
+        query = f"""
+            SELECT {usage_columns}
+            FROM (
+                SELECT * FROM chunk_sonuclari
+                WHERE cevap_token IS NOT NULL
+                ORDER BY id DESC
+                LIMIT ?
+            )
+        """
+        pencere = db.fetchone(query, (son_chunk,))
+    except Exception as e:
+        return {"hata": f"LLM sayaçları okunamadı (migration 004 uygulandı mı?): {e}"}
+
+    return {
+        f"son_{saat}_saat": breakdown(donem),
+        f"son_{son_chunk}_chunk": breakdown(pencere),
     }
 
 
@@ -23,10 +23,53 @@ class Settings(BaseSettings):
     OLLAMA_BASE_URL: str = "llm.csb.gov.tr"  # Default - .env ile override edilir
     OLLAMA_MODEL: str = "gemma3:27b"  # Default - .env ile override edilir
     OLLAMA_TIMEOUT: int = 600  # 10 dakika - belgeler uzun olabilir
+    OLLAMA_STREAM: bool = True  # JSON tamamlanınca stream'i kapat (erken sonlandırma)
+    OLLAMA_MAX_RETRIES: int = 2
+    OLLAMA_RETRY_DELAY: float = 2.0  # Exponential backoff tabanı (sn); config/settings.py ile aynı
+    OLLAMA_BREAKER_THRESHOLD: int = 5  # Üst üste bu kadar hatada devre açılır (istekler hemen reddedilir)
+    OLLAMA_BREAKER_RESET_SECONDS: int = 60  # Açık devre bu süre sonra tek deneme isteğine izin verir
+    OLLAMA_RETRY_BUDGET_RATIO: float = 0.2  # Retry'lar son 60 sn'deki isteklerin bu oranını aşamaz
+    OLLAMA_RETRY_BUDGET_MIN: int = 3  # Düşük trafikte izin verilen retry
+    OLLAMA_POOL_SIZE: int = 10  # Paylaşılan HTTP bağlantı havuzu
+    OLLAMA_KEEP_ALIVE: str = "30m"  # Model + KV cache bellekte kalsın (prefix tekrar kullanımı)
+    OLLAMA_STRUCTURED_OUTPUT: bool = True  # Belge şemasını Ollama format'ı olarak ver (grammar ile sınırlı JSON)
+    OLLAMA_WARMUP: bool = True  # Toplu çalıştırma başında modeli yükle + bağlantıyı doğrula
+    OLLAMA_IDLE_KEEP_ALIVE: str = "0"  # Kuyruk boşalınca ("0" = modeli bırak, boş = dokunma)
+    OLLAMA_VERIFY_SSL: bool = False  # Kurum proxy'si self-signed sertifika kullanıyor
+    # Birden fazla Ollama makinesi (boş = sadece OLLAMA_BASE_URL)
+    # .env: OLLAMA_BACKENDS=["http://ollama1:11434", "http://ollama2:11434"]
+    OLLAMA_BACKENDS: list = []
+    OLLAMA_HEALTH_INTERVAL: int = 30  # Backend sağlık kontrolü aralığı (sn, /api/tags)
+
+    # LLM yanıt cache'i (SQLite, TTL + LRU)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_PATH: str = "./data/llm_cache.db"
+    LLM_CACHE_TTL_HOURS: int = 168  # 7 gün
+    LLM_CACHE_MAX_ENTRIES: int = 5000
+    LLM_CACHE_MAX_MB: int = 200
+
+    # Öncelikli LLM istek zamanlayıcı (interactive > deadline > backfill, weighted fair queuing)
+    LLM_SCHEDULER_ENABLED: bool = True
+    LLM_SCHEDULER_SLOTS: int = 4  # Tüm backend'lerde toplam eşzamanlı istek
+    LLM_SCHEDULER_WEIGHTS: dict = {"interactive": 100, "deadline": 10, "backfill": 1}
+    LLM_SCHEDULER_CAPS: dict = {"backfill": 3}  # Sınıf başına eşzamanlı istek (verilmeyen = slot sayısı)
+    LLM_SCHEDULER_SHARED_PATH: str = "./data/llm_scheduler.db"  # Worker'lar arası paylaşım, boş = süreç içi
+    LLM_SCHEDULER_LEASE_SECONDS: int = 900  # Çöken sürecin slotu bu sürede düşer
+
+    # LLM istek / yanıt log'u (arka planda günlük NDJSON + başvuru indeksi)
+    LLM_LOG_ENABLED: bool = True
+    LLM_LOG_DIR: str = "./llm_logs"
+    LLM_LOG_COMPRESS: bool = False  # Günlük dosyaları gzip ile yaz (.ndjson.gz)
+    LLM_LOG_RETENTION_DAYS: int = 30  # 0 = süre sınırı yok
+    LLM_LOG_MAX_MB: int = 1024  # Toplam boyut sınırı, aşılırsa en eski günler silinir
+    LLM_LOG_QUEUE_SIZE: int = 10000  # Kuyruk doluysa kayıt düşürülür (LLM çağrısı beklemez)
 
     # OCR
     OCR_LANGUAGES: list = ["tr", "en"]
     OCR_GPU: bool = False
+    OCR_PREPROCESS_ENABLED: bool = True  # grayscale + binarization + deskew + kırpma
+    OCR_PREPROCESS_BINARIZE: bool = True
+    OCR_SKIP_CONFIDENCE: float = 0.2  # Bu ortalama güvenin altındaki OCR metni LLM'e gönderilmez
 
     # External API (CSB eBasvuru)
     # Test API: https://test-ebasv-s.csb.gov.tr
@@ -40,6 +83,13 @@ class Settings(BaseSettings):
     # SYD Hizmet ID'leri (Production: 10307-10312, Test: 10251-10256)
     HIZMET_IDS: list = ["10307", "10308", "10309", "10310", "10311", "10312"]  # Tüm canlı SYD hizmetleri
 
+    # Küçük belgeleri (adli sicil, diploma, hitap) tek LLM isteğinde topla
+    LLM_BATCH_ENABLED: bool = True
+    LLM_BATCH_DOCUMENT_TYPES: list = ["adli sicil kaydı", "yök lisans diploması", "hitap hizmet dökümü"]
+    LLM_BATCH_MAX_DOCS: int = 4  # İstek başına en fazla belge
+    LLM_BATCH_MAX_PROMPT_TOKENS: int = 6000  # Sistem + kullanıcı prompt'u (tahmini)
+    LLM_BATCH_NUM_CTX: int = 8192  # Toplu isteklerde context penceresi (prompt + tüm belgelerin çıktısı)
+
     # Processing
     MAX_FILE_SIZE_MB: int = 10
     TEMP_DIR: str = "./temp"
@@ -3,16 +3,20 @@ Ana belge işleme pipeline'ı
 """
 import logging
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 from datetime import datetime
 
 from app.services.file_service import FileService
 from app.services.ocr_service import OCRService
 from app.services.ollama_service import OllamaService
+from app.services.circuit_breaker import LLMUnavailableError
 from app.core.document_classifier import DocumentClassifier
 from app.core.document_validator import DocumentValidator
 from app.core.document_requirements import DocumentRequirementsChecker
 from app.models.schemas import DOCUMENT_SCHEMAS, MASTER_SCHEMA
+from app.prompts.batch_prompt import BATCH_SYSTEM_PROMPT
+from app.models.extraction_profiles import get_extraction_profile
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +41,10 @@ class DocumentProcessor:
 
         Returns:
             Master JSON
+
+        Raises:
+            LLMUnavailableError: Ollama devre kesicisi açık; başvuru eksik
+                sonuçla kaydedilmez, çağıran bekletip sonra tekrar dener
         """
         logger.info(f"▶️  Başvuru işleniyor: {basvuru_data['takip_no']}")
 
@@ -73,13 +81,25 @@ class DocumentProcessor:
                 belge["basvuru_id"] = basvuru_info["basvuru_id"]
 
                 # Belgeyi işle (başvuru türü bilgisi ile)
-                result = await self.process_document(belge, basvuru_turu)
+                # Küçük belgelerin LLM adımı ertelenir, aşağıda toplu istekte yapılır
+                result = await self.process_document(
+                    belge, basvuru_turu, defer_llm=settings.LLM_BATCH_ENABLED
+                )
                 processed_documents.append(result)
 
+            except LLMUnavailableError:
+                logger.warning(f"⏸️  LLM erişilemiyor, başvuru yarıda bırakıldı: {basvuru_data['takip_no']}")
+                raise
+
             except Exception as e:
                 logger.error(f"❌ Belge işleme hatası ({belge['belge_adi']}): {str(e)}")
                 continue
 
+        # Ertelenen küçük belgeler: birkaç belge tek LLM isteğinde
+        processed_documents = self._extract_deferred_documents(
+            processed_documents, basvuru_turu, basvuru_info["basvuru_id"]
+        )
+
         # Master JSON oluştur
         master_json = self.create_master_json(
             basvuru_info,
@@ -91,13 +111,15 @@ class DocumentProcessor:
         logger.info(f"✅ Başvuru tamamlandı: {basvuru_data['takip_no']}")
         return master_json
 
-    async def process_document(self, belge: Dict, basvuru_turu: str = None) -> Dict:
+    async def process_document(self, belge: Dict, basvuru_turu: str = None, defer_llm: bool = False) -> Dict:
         """
         Tek bir belgeyi işle
 
         Args:
             belge: Belge bilgileri (base64, ad, tip vs.)
             basvuru_turu: Başvuru türü (Akademisyen, Bakanlık, Sektör)
+            defer_llm: Toplu çıkarıma uygun tiplerde LLM adımını atla,
+                durum "llm_bekliyor" ve metinle dön (_extract_deferred_documents)
 
         Returns:
             İşlenmiş belge verisi
@@ -132,10 +154,30 @@ class DocumentProcessor:
                     "veri": {}
                 }
 
-            # 3. Metin çıkar (OCR)
-            text = self.ocr_service.extract_text(file_path)
+            # 3. Metin çıkar (OCR) - belge tipi profiline göre sadece gerekli sayfalar
+            extraction = self.ocr_service.extract_document(
+                file_path,
+                profile=get_extraction_profile(doc_type)
+            )
+            text = extraction["text"]
+            ocr_stats = extraction["ocr_stats"]
             logger.info(f"✅ Metin çıkarıldı: {len(text)} karakter")
 
+            # OCR güveni çok düşükse LLM'e gönderme (dakikalarca çöp metin işlenmesin)
+            if ocr_stats and (ocr_stats["ortalama_guven"] or 0.0) < settings.OCR_SKIP_CONFIDENCE:
+                logger.warning(f"⚠️  OCR güveni düşük ({ocr_stats['ortalama_guven']}): {belge_adi}")
+                return {
+                    "belge_id": belge["belge_id"],
+                    "belge_adi": belge_adi,
+                    "belge_tipi": doc_type,
+                    "api_belge_tipi": belge.get("belge_tipi"),
+                    "durum": "ocr_kalitesiz",
+                    "ocr_kalitesi": ocr_stats,
+                    "ocr_sayfalari": [page.to_dict() for page in extraction["pages"]],
+                    "base64": base64_data,
+                    "veri": {}
+                }
+
             if not text or len(text) < 50:
                 logger.warning(f"⚠️  Çok az metin: {belge_adi}")
                 return {
@@ -150,6 +192,19 @@ class DocumentProcessor:
 
             # 4. LLM ile veri çıkar (başvuru türü ile)
             extracted_data = {}
+            if doc_type in DOCUMENT_SCHEMAS and defer_llm and doc_type in settings.LLM_BATCH_DOCUMENT_TYPES:
+                return {
+                    "belge_id": belge["belge_id"],
+                    "belge_adi": belge_adi,
+                    "belge_tipi": doc_type,
+                    "api_belge_tipi": belge.get("belge_tipi"),
+                    "durum": "llm_bekliyor",
+                    "ocr_kalitesi": ocr_stats,
+                    "base64": base64_data,
+                    "veri": {},
+                    "_metin": text
+                }
+
             if doc_type in DOCUMENT_SCHEMAS:
                 schema = DOCUMENT_SCHEMAS[doc_type]
                 # basvuru_id'yi al (eğer varsa)
@@ -172,6 +227,7 @@ class DocumentProcessor:
                 "belge_tipi": doc_type,  # İçerikten tespit edilen
                 "api_belge_tipi": belge.get("belge_tipi"),  # API'den gelen
                 "durum": "basarili",
+                "ocr_kalitesi": ocr_stats,  # Sadece görsel OCR'da dolu
                 "base64": base64_data,  # Viewer için base64 içeriği
                 "veri": extracted_data
             }
@@ -180,6 +236,111 @@ class DocumentProcessor:
             # 5. Geçici dosyayı temizle
             self.file_service.cleanup_temp_files(file_path)
 
+    def _extract_deferred_documents(
+        self,
+        processed_documents: List[Dict],
+        basvuru_turu: Optional[str],
+        basvuru_id
+    ) -> List[Dict]:
+        """
+        LLM adımı ertelenen küçük belgeleri toplu isteklerle işle
+
+        Belgeler LLM_BATCH_MAX_DOCS ve LLM_BATCH_MAX_PROMPT_TOKENS sınırına
+        kadar aynı isteğe konur. Toplu yanıtta çıkmayan veya tek kalan
+        belgeler eskisi gibi tek tek işlenir; tek tek de başarısız olan
+        belge listeden çıkarılır (process_application'daki hata davranışı).
+
+        Returns:
+            List[Dict]: Güncellenmiş belge listesi (sıra korunur)
+        """
+        pending = [doc for doc in processed_documents if doc.get("durum") == "llm_bekliyor"]
+        if not pending:
+            return processed_documents
+
+        batches = self._pack_batches(pending, basvuru_turu)
+        failed = set()
+
+        for batch in batches:
+            results = {}
+            if len(batch) > 1:
+                try:
+                    results = self.ollama_service.extract_structured_batch(
+                        [
+                            {
+                                "belge_id": doc["belge_id"],
+                                "document_type": doc["belge_tipi"],
+                                "text": doc["_metin"],
+                                "schema": DOCUMENT_SCHEMAS[doc["belge_tipi"]]
+                            }
+                            for doc in batch
+                        ],
+                        basvuru_turu=basvuru_turu,
+                        basvuru_id=basvuru_id
+                    )
+                except LLMUnavailableError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"⚠️  Toplu çıkarım başarısız, belgeler tek tek işlenecek: {e}")
+
+            for doc in batch:
+                if doc["belge_id"] in results:
+                    doc["veri"] = results[doc["belge_id"]]
+                else:
+                    try:
+                        doc["veri"] = self.ollama_service.extract_structured_data(
+                            text=doc["_metin"],
+                            document_type=doc["belge_tipi"],
+                            schema=DOCUMENT_SCHEMAS[doc["belge_tipi"]],
+                            basvuru_turu=basvuru_turu,
+                            basvuru_id=basvuru_id
+                        )
+                    except LLMUnavailableError:
+                        raise
+                    except Exception as e:
+                        logger.error(f"❌ Belge işleme hatası ({doc['belge_adi']}): {str(e)}")
+                        failed.add(id(doc))
+                        continue
+
+                doc["durum"] = "basarili"
+                doc.pop("_metin", None)
+                logger.info(f"✅ Veri çıkarıldı: {doc['belge_tipi']}")
+
+        return [doc for doc in processed_documents if id(doc) not in failed]
+
+    def _pack_batches(self, documents: List[Dict], basvuru_turu: Optional[str]) -> List[List[Dict]]:
+        """
+        Belgeleri token bütçesine göre gruplara ayır (sıra korunarak, greedy)
+
+        Tek başına bütçeyi aşan belge kendi grubunda kalır (tek istek).
+        """
+        budget = settings.LLM_BATCH_MAX_PROMPT_TOKENS - self.ollama_service.token_counter.count(BATCH_SYSTEM_PROMPT)
+        batches: List[List[Dict]] = []
+        current: List[Dict] = []
+        used = 0
+
+        for doc in documents:
+            tokens = self.ollama_service.estimate_batch_tokens(
+                doc["belge_id"], doc["belge_tipi"], doc["_metin"],
+                DOCUMENT_SCHEMAS[doc["belge_tipi"]], basvuru_turu
+            )
+            if tokens is None or tokens > budget:
+                batches.append([doc])
+                continue
+
+            if current and (used + tokens > budget or len(current) >= settings.LLM_BATCH_MAX_DOCS):
+                batches.append(current)
+                current, used = [], 0
+
+            current.append(doc)
+            used += tokens
+
+        if current:
+            batches.append(current)
+
+        if len(batches) < len(documents):
+            logger.info(f"📦 {len(documents)} küçük belge {len(batches)} LLM isteğinde işlenecek")
+        return batches
+
     def create_master_json(
         self,
         basvuru_info: Dict,
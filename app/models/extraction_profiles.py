@@ -0,0 +1,100 @@
+"""
+Belge tiplerine göre metin çıkarma profilleri
+
+Bazı belgelerde ihtiyaç duyulan alanlar ilk 1-2 sayfadadır (diploma, adli sicil,
+üst yazı). Profil; hangi sayfaların okunacağını, hangi anchor'lar bulununca
+okumanın durdurulacağını ve kaç chunk oluşturulacağını belirler.
+
+Anahtarlar DOCUMENT_SCHEMAS ile aynıdır (turkish_lower ile normalize edilmiş).
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from app.core.document_classifier import turkish_lower
+
+
+# Sık kullanılan anchor pattern'leri
+TC_KIMLIK_NO = r"T\.?\s*C\.?\s*Kimlik\s*(?:No|Numarası)"
+# Adli sicil kaydının son cümlesi: kayıt yoksa belge burada biter (başlıkla eşleşmez)
+ADLI_SICIL_KAYDI_YOK = r"Adli\s+Sicil\s+Kayd[ıi]\s*:?\s*(?:Yoktur|Bulunmamaktad[ıi]r)"
+DILEKCE_METNI = r"\d+\s*[\-\.]\s*Dilekçe"
+
+
+@dataclass(frozen=True)
+class ExtractionProfile:
+    """Belge tipi bazlı metin çıkarma profili"""
+
+    # Okunacak maksimum sayfa sayısı (None = tüm sayfalar)
+    max_pages: Optional[int] = None
+
+    # Hepsi bulunduğunda okuma durdurulur (regex, büyük/küçük harf duyarsız)
+    stop_anchors: Tuple[str, ...] = ()
+
+    # Oluşturulacak maksimum chunk sayısı (None = hepsi)
+    max_chunks: Optional[int] = None
+
+    _compiled: List[Pattern] = field(default_factory=list, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(
+            self,
+            '_compiled',
+            [re.compile(p, re.IGNORECASE) for p in self.stop_anchors]
+        )
+
+    def page_allowed(self, page_num: int) -> bool:
+        """Sayfa (1'den başlar) profil sınırları içinde mi?"""
+        return self.max_pages is None or page_num <= self.max_pages
+
+    def anchors_found(self, text: str) -> bool:
+        """Tüm stop anchor'ları metinde bulundu mu?"""
+        if not self._compiled or not text:
+            return False
+        return all(p.search(text) for p in self._compiled)
+
+
+# Belge tipi → Profil mapping
+# Listede olmayan tipler tüm sayfaları okur (eski davranış)
+EXTRACTION_PROFILES: Dict[str, ExtractionProfile] = {
+    # Üst yazı: kişisel bilgiler ve ek listesi ilk sayfada, liste "Dilekçe Metni" ile biter
+    "ustyazi": ExtractionProfile(max_pages=2, stop_anchors=(TC_KIMLIK_NO, DILEKCE_METNI)),
+
+    # YÖK e-Devlet diploması: tüm mezuniyet satırları ilk sayfalarda
+    "yök lisans diploması": ExtractionProfile(max_pages=2),
+
+    # Adli sicil kaydı: e-Devlet belgesi; kayıt yoksa tek sayfa, kayıt varsa 2. sayfa da okunur
+    "adli sicil kaydı": ExtractionProfile(max_pages=2, stop_anchors=(TC_KIMLIK_NO, ADLI_SICIL_KAYDI_YOK)),
+
+    # Sektör belgeleri: SektorBelgeAnalyzer sadece ilk chunk'ı kullanıyor
+    "enerji üretimi": ExtractionProfile(max_pages=3, max_chunks=1),
+    "metal üretimi ve işlemesi": ExtractionProfile(max_pages=3, max_chunks=1),
+    "mineral endüstrisi": ExtractionProfile(max_pages=3, max_chunks=1),
+    "kimya endüstrisi": ExtractionProfile(max_pages=3, max_chunks=1),
+    "atık yönetimi": ExtractionProfile(max_pages=3, max_chunks=1),
+    "diğer üretim faaliyetleri": ExtractionProfile(max_pages=3, max_chunks=1),
+}
+
+# Farklı yazımlar → profil anahtarı
+_PROFILE_ALIASES = {
+    "üst yazı": "ustyazi",
+    "sektör belgesi": "diğer üretim faaliyetleri",
+}
+
+
+def get_extraction_profile(document_type: Optional[str]) -> Optional[ExtractionProfile]:
+    """
+    Belge tipine göre metin çıkarma profilini döndür
+
+    Args:
+        document_type: Belge tipi (API belgeTipi veya schema key'i)
+
+    Returns:
+        ExtractionProfile veya None (profil yoksa tüm belge okunur)
+    """
+    if not document_type:
+        return None
+
+    key = turkish_lower(document_type.strip())
+    key = _PROFILE_ALIASES.get(key, key)
+    return EXTRACTION_PROFILES.get(key)
@@ -0,0 +1,78 @@
+"""
+DOCUMENT_SCHEMAS → Ollama structured output şeması
+
+schemas.py'deki şemalar prompt'a metin olarak gömülmek için yazıldı:
+alanlar opsiyonel, null tipi yok, ek alanlara izin var. Ollama'ya `format`
+olarak verilen şema ise çıktıyı dilbilgisiyle (grammar) sınırlar; bu
+yüzden derlenirken:
+
+- Her nesnenin tüm alanları required yapılır (model alan atlamaz, yoksa null yazar)
+- Yaprak tipler null kabul eder ("Belgede yoksa null" kuralı)
+- additionalProperties: false (şemada olmayan alan üretilmez)
+- Nesne / dizi tipleri kendisi de null olabilir
+
+Böylece yanıt her zaman geçerli JSON olur; markdown fence ayıklama ve
+bozuk JSON yüzünden tekrarlanan chunk'lar ortadan kalkar.
+"""
+from typing import Any, Dict, Optional
+
+
+def _nullable(type_value) -> list:
+    types = type_value if isinstance(type_value, list) else [type_value]
+    return types if "null" in types else types + ["null"]
+
+
+def compile_output_schema(schema: Dict[str, Any], nullable: bool = False) -> Dict[str, Any]:
+    """
+    Belge şemasını Ollama `format` parametresine uygun JSON Schema'ya çevir
+
+    Args:
+        schema: DOCUMENT_SCHEMAS değeri (veya alt şema)
+        nullable: Bu düğüm null olabilir mi (kök nesne hariç hepsi)
+
+    Returns:
+        Dict: JSON Schema
+    """
+    compiled: Dict[str, Any] = {}
+    schema_type = schema.get("type")
+
+    if schema_type == "object" or "properties" in schema:
+        properties = {
+            name: compile_output_schema(sub_schema, nullable=True)
+            for name, sub_schema in schema.get("properties", {}).items()
+        }
+        compiled["type"] = _nullable("object") if nullable else "object"
+        compiled["properties"] = properties
+        compiled["required"] = list(properties)
+        compiled["additionalProperties"] = False
+
+    elif schema_type == "array":
+        compiled["type"] = _nullable("array") if nullable else "array"
+        if "items" in schema:
+            compiled["items"] = compile_output_schema(schema["items"])
+
+    elif schema_type:
+        compiled["type"] = _nullable(schema_type) if nullable else schema_type
+
+    for key in ("enum", "description", "format"):
+        if key in schema:
+            compiled[key] = schema[key]
+    if "enum" in compiled and nullable and None not in compiled["enum"]:
+        compiled["enum"] = compiled["enum"] + [None]
+
+    return compiled
+
+
+def get_output_format(schema: Optional[Dict[str, Any]]):
+    """
+    Ollama `format` değeri
+
+    Args:
+        schema: Belge şeması (boş / None ise serbest JSON)
+
+    Returns:
+        Dict veya "json"
+    """
+    if not schema or not schema.get("properties"):
+        return "json"
+    return compile_output_schema(schema)
@@ -0,0 +1,151 @@
+"""
+Yapılandırılmış OCR sonuçları
+
+EasyOCR her tespit için (box, text, confidence) döndürür. Sadece text'i
+saklamak yerine sayfa bazlı satırlar, kutular ve güven skorları tutulur;
+analyzer'lar bu özetle LLM'e gitmeden karar verebilir (LLM atla, yüksek
+DPI ile OCR tekrarla, vision modele yönlendir).
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+
+# Bu güvenin altındaki satırlar "düşük güvenli" sayılır
+LOW_CONFIDENCE_THRESHOLD = 0.5
+
+# Bundan kısa OCR sayfaları metne eklenmez (istatistiklerde kalır)
+MIN_OCR_PAGE_CHARS = 20
+
+# Sayfa başlığı (mevcut metin formatıyla uyumlu)
+_PAGE_HEADERS = {
+    'text': "--- Sayfa {page} ---",
+    'ocr': "--- Sayfa {page} (OCR) ---",
+    'ocr-full': "--- Sayfa {page} (OCR-Full) ---",
+}
+
+
+@dataclass
+class OCRLine:
+    """Tek OCR satırı (EasyOCR detection)"""
+    text: str
+    confidence: float
+    box: List[List[float]]  # 4 köşe: [[x, y], ...]
+
+    @classmethod
+    def from_detection(cls, detection: Sequence) -> "OCRLine":
+        """EasyOCR (box, text, confidence) tuple'ından oluştur"""
+        box, text, confidence = detection[0], detection[1], detection[2]
+        return cls(
+            text=text,
+            confidence=float(confidence),
+            box=[[float(x), float(y)] for x, y in box]
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'text': self.text, 'confidence': round(self.confidence, 4), 'box': self.box}
+
+
+@dataclass
+class OCRPage:
+    """Tek sayfanın çıkarma sonucu"""
+    page_num: int
+    source: str  # 'text' (PDF metin katmanı), 'ocr', 'ocr-full'
+    text: str = ""
+    lines: List[OCRLine] = field(default_factory=list)
+    dpi: Optional[int] = None
+
+    @classmethod
+    def from_detections(cls, page_num: int, detections: Sequence, source: str = 'ocr',
+                        dpi: Optional[int] = None) -> "OCRPage":
+        """EasyOCR readtext sonucundan sayfa oluştur"""
+        lines = [OCRLine.from_detection(d) for d in detections]
+        return cls(
+            page_num=page_num,
+            source=source,
+            text='\n'.join(line.text for line in lines),
+            lines=lines,
+            dpi=dpi
+        )
+
+    @property
+    def is_ocr(self) -> bool:
+        return self.source != 'text'
+
+    @property
+    def has_content(self) -> bool:
+        """Metne eklenecek kadar içerik var mı?"""
+        if self.is_ocr:
+            return len(self.text.strip()) > MIN_OCR_PAGE_CHARS
+        return bool(self.text.strip())
+
+    @property
+    def mean_confidence(self) -> Optional[float]:
+        """Karakter sayısı ağırlıklı ortalama güven (metin katmanında None)"""
+        if not self.is_ocr:
+            return None
+        total_chars = sum(len(line.text) for line in self.lines)
+        if total_chars == 0:
+            return 0.0
+        return sum(line.confidence * len(line.text) for line in self.lines) / total_chars
+
+    def render(self) -> str:
+        """Başlıklı sayfa metni"""
+        header = _PAGE_HEADERS.get(self.source, _PAGE_HEADERS['text']).format(page=self.page_num)
+        return f"{header}\n{self.text}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'page_num': self.page_num,
+            'source': self.source,
+            'dpi': self.dpi,
+            'mean_confidence': self.mean_confidence,
+            'lines': [line.to_dict() for line in self.lines],
+        }
+
+
+def pages_to_text(pages: List[OCRPage]) -> str:
+    """Sayfaları sayfa sırasıyla tek metne birleştir"""
+    return '\n\n'.join(
+        page.render() for page in sorted(pages, key=lambda p: p.page_num) if page.has_content
+    )
+
+
+def summarize_pages(pages: List[OCRPage]) -> Dict[str, Any]:
+    """
+    OCR kalite özeti (belge_analiz_log'a yazılır)
+
+    Returns:
+        Dict: {
+            'sayfa_sayisi', 'ocr_sayfa_sayisi', 'satir_sayisi',
+            'ortalama_guven', 'min_guven', 'dusuk_guven_orani', 'dpi'
+        }
+        Güven alanları OCR sayfası yoksa None.
+    """
+    ocr_pages = [p for p in pages if p.is_ocr]
+    lines = [line for p in ocr_pages for line in p.lines]
+    total_chars = sum(len(line.text) for line in lines)
+
+    summary = {
+        'sayfa_sayisi': len(pages),
+        'ocr_sayfa_sayisi': len(ocr_pages),
+        'satir_sayisi': len(lines),
+        'ortalama_guven': None,
+        'min_guven': None,
+        'dusuk_guven_orani': None,
+        'dpi': max((p.dpi for p in ocr_pages if p.dpi), default=None),
+    }
+
+    if not ocr_pages:
+        return summary
+
+    if total_chars == 0:
+        summary.update({'ortalama_guven': 0.0, 'min_guven': 0.0, 'dusuk_guven_orani': 1.0})
+        return summary
+
+    low_chars = sum(len(line.text) for line in lines if line.confidence < LOW_CONFIDENCE_THRESHOLD)
+    summary.update({
+        'ortalama_guven': sum(line.confidence * len(line.text) for line in lines) / total_chars,
+        'min_guven': min(line.confidence for line in lines),
+        'dusuk_guven_orani': low_chars / total_chars,
+    })
+    return summary
@@ -0,0 +1,258 @@
+"""
+Belge tiplerine göre chunk ilgililik (relevance) profilleri
+
+Uzun CV ve proje dosyalarında chunk'ların bir kısmı (kaynakça, yayın
+listesi, KVKK / imza metni gibi kalıp metinler) çıkarılacak alanların
+hiçbirine katkı vermez ama yine de LLM'e gönderiliyordu. Profil, şema
+alanlarına karşılık gelen anchor'ları (tarih aralığı, üniversite, SGK
+sicil, proje adı ...) ve sektör anahtar kelimelerini derlenmiş regex olarak
+tutar; chunk LLM'e gönderilmeden önce puanlanır.
+
+Puan = anchor eşleşmeleri + sektör kelimeleri / 2 - gürültü eşleşmeleri
+(atıf kalıpları, kaynakça başlığı, kalıp metin). Chunk, en az min_fields
+alanın anchor'ı bulunur ve puanı pozitifse ilgili sayılır. Güvenlik için
+ilk chunk (başlık / kişisel bilgiler) her zaman, ayrıca en az min_keep
+chunk (en yüksek puanlılar) tutulur.
+
+Anahtarlar analyzer belge tipleri ile aynıdır (turkish_lower ile normalize
+edilmiş). Listede olmayan tiplerde filtre uygulanmaz.
+"""
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+from app.core.document_classifier import turkish_lower
+
+
+# Ortak anchor'lar (turkish_lower uygulanmış metin üzerinde aranır)
+TARIH = (
+    r"\b\d{1,2}[./-]\d{1,2}[./-](?:19|20)\d{2}\b",
+    r"\b(?:19|20)\d{2}\s*[-–—]\s*(?:(?:19|20)\d{2}|halen|devam|günümüz|hâlen)",
+    r"\b(?:ocak|şubat|mart|nisan|mayıs|haziran|temmuz|ağustos|eylül|ekim|kasım|aralık)\s+(?:19|20)\d{2}\b",
+)
+TC_KIMLIK = (r"t\.?\s*c\.?\s*kimlik", r"\b[1-9]\d{10}\b")
+UNIVERSITE = (
+    r"[üu]niversite", r"fak[üu]lte", r"y[üu]ksek\s*okul", r"enstit[üu]",
+    r"lisans", r"doktora", r"mezun", r"bölüm[üu]?\b",
+)
+SGK_SICIL = (
+    r"\bsgk\b", r"sicil\s*(?:no|numarası)", r"sigortal", r"işe\s*giriş", r"işten\s*çıkış",
+    r"prim\s*gün", r"hizmet\s*dökümü", r"işyeri", r"\b4\s*/?\s*[abc]\b",
+)
+PROJE_ADI = (
+    r"proje\s*(?:adı|no|numarası|başlığı|türü|bütçesi|yürütücüsü|süresi)",
+    r"tübitak", r"\bbap\b", r"horizon", r"ufuk\s*2020", r"\bab\s+projesi",
+    r"yürütücü", r"araştırmacı", r"bursiyer", r"danışman",
+)
+IS_DENEYIMI = (
+    r"deneyim", r"tecrübe", r"çalıştı", r"pozisyon", r"\bgörev", r"mühendis", r"uzman",
+    r"müdür", r"şef\b", r"\ba\.?\s?ş\.", r"\bltd\b", r"şirket", r"firma", r"bakanlığı", r"müdürlüğü",
+)
+KISISEL = (
+    r"ad[ıi]?\s*soyad", r"doğum\s*(?:tarihi|yeri)", r"e-?posta|e-?mail", r"telefon|\btel\s*[:.]",
+    r"\badres", r"uyruk",
+)
+
+# Sektör anahtar kelimeleri (tek başına yeterli değil, puanı destekler)
+SEKTOR_KELIMELERI = (
+    r"çevre", r"enerji", r"atık", r"arıtma", r"emisyon", r"kimya", r"maden", r"metal",
+    r"mineral", r"\bçed\b", r"santral", r"rafineri", r"döküm", r"çimento",
+)
+
+# Alan içermeyen chunk'ları ele veren kalıplar
+GURULTU = (
+    r"\(\s*(?:19|20)\d{2}[a-z]?\s*\)",  # APA atıf yılı: (2019)
+    r"\bdoi\b|doi\.org",
+    r"\bet\s+al\.",
+    r"\bvol\.|\bpp\.|\bss\.\s*\d",
+    r"\bjournal\b|\bdergisi\b|\bproceedings\b",
+    r"^\s*\[\d+\]",  # [12] numaralı kaynak satırı
+    r"^\s*(?:kaynakça|kaynaklar|references|bibliography|yararlanılan\s+kaynaklar)\s*:?\s*$",
+    r"kişisel\s+verilerin\s+korunması|aydınlatma\s+metni",
+)
+
+
+@dataclass(frozen=True)
+class RelevanceProfile:
+    """Belge tipi bazlı chunk ilgililik profili"""
+
+    # (alan adı, anchor regex'leri) - alan sayımı bunlardan yapılır
+    anchors: Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+    # Puanı destekleyen ama tek başına yeterli olmayan kelimeler
+    keywords: Tuple[str, ...] = ()
+
+    # Puandan düşülen kalıplar
+    noise: Tuple[str, ...] = GURULTU
+
+    # İlgili sayılmak için anchor'ı bulunması gereken alan sayısı
+    min_fields: int = 1
+
+    # Filtre sonrası en az tutulacak chunk sayısı
+    min_keep: int = 1
+
+    # İlk chunk her zaman tutulur (başlık / kişisel bilgiler)
+    keep_first: bool = True
+
+    # Alan başına sayılan en fazla eşleşme (tek alanın puanı şişirmesin)
+    max_hits_per_field: int = 5
+
+    _compiled: List[Tuple[str, List[Pattern]]] = field(default_factory=list, init=False, repr=False, compare=False)
+    _keywords: List[Pattern] = field(default_factory=list, init=False, repr=False, compare=False)
+    _noise: List[Pattern] = field(default_factory=list, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(
+            self,
+            '_compiled',
+            [(name, [re.compile(p, re.MULTILINE) for p in patterns]) for name, patterns in self.anchors]
+        )
+        object.__setattr__(self, '_keywords', [re.compile(p, re.MULTILINE) for p in self.keywords])
+        object.__setattr__(self, '_noise', [re.compile(p, re.MULTILINE) for p in self.noise])
+
+    def score(self, text: str) -> Dict[str, Any]:
+        """
+        Chunk metnini puanla
+
+        Returns:
+            Dict: score, fields (eşleşen alanlar), noise, relevant
+        """
+        lowered = turkish_lower(text or "")
+
+        fields = {}
+        signal = 0.0
+        for name, patterns in self._compiled:
+            hits = sum(len(p.findall(lowered)) for p in patterns)
+            if hits:
+                fields[name] = hits
+                signal += min(hits, self.max_hits_per_field)
+
+        signal += sum(min(len(p.findall(lowered)), self.max_hits_per_field) for p in self._keywords) / 2
+        noise = sum(len(p.findall(lowered)) for p in self._noise)
+        score = signal - noise
+
+        return {
+            'score': score,
+            'fields': fields,
+            'noise': noise,
+            'relevant': len(fields) >= self.min_fields and score > 0,
+        }
+
+    def select(self, texts: List[str]) -> Tuple[List[int], List[Dict[str, Any]]]:
+        """
+        Tutulacak chunk'ları seç
+
+        Args:
+            texts: Chunk metinleri (belge sırasıyla)
+
+        Returns:
+            Tuple: (tutulan indeksler - sıralı, chunk başına score() sonucu)
+        """
+        scores = [self.score(text) for text in texts]
+        keep = {i for i, s in enumerate(scores) if s['relevant']}
+
+        if self.keep_first and texts:
+            keep.add(0)
+
+        # Güvenlik minimumu: en yüksek puanlı chunk'larla tamamla
+        if len(keep) < self.min_keep:
+            ranked = sorted(range(len(texts)), key=lambda i: scores[i]['score'], reverse=True)
+            for i in ranked:
+                if len(keep) >= self.min_keep:
+                    break
+                keep.add(i)
+
+        return sorted(keep), scores
+
+
+# Belge tipi → Profil mapping
+RELEVANCE_PROFILES: Dict[str, RelevanceProfile] = {
+    # CLI CV şablonu: ad soyad, eğitim, iş deneyimi / sektör tecrübesi, projeler
+    "özgeçmiş/cv": RelevanceProfile(
+        anchors=(
+            ("kisisel", KISISEL + TC_KIMLIK),
+            ("egitim", UNIVERSITE),
+            ("is_deneyimi", IS_DENEYIMI + TARIH),
+            ("projeler", PROJE_ADI),
+        ),
+        keywords=SEKTOR_KELIMELERI,
+    ),
+
+    # Proje dosyası: tür, başlık, yıl ilk sayfalarda; kaynakça / yöntem metni gereksiz
+    "proje dosyası": RelevanceProfile(
+        anchors=(
+            ("proje_bilgileri", PROJE_ADI + TARIH),
+            ("arastirmaci", (r"kurum", r"[üu]niversite", r"unvan", r"\brol[üu]?\b")),
+            ("ozet", (r"\bözet\b", r"\bamaç", r"\bhedef", r"\bçıktı", r"\bsonuç\b")),
+        ),
+        keywords=SEKTOR_KELIMELERI,
+    ),
+
+    # SGK / HİTAP dökümü: LLM yedek yolunda tablo dışı sayfalar (açıklama / imza) atlanır
+    "sgk hizmet dökümü": RelevanceProfile(
+        anchors=(("calisma_gecmisi", SGK_SICIL + TARIH), ("kisi", TC_KIMLIK + KISISEL)),
+    ),
+    "hitap hizmet dökümü": RelevanceProfile(
+        anchors=(
+            ("gorev_gecmisi", (r"kurum", r"kadro", r"unvan", r"görev", r"hizmet\s*süresi") + TARIH),
+            ("kisi", TC_KIMLIK + KISISEL + (r"sicil\s*(?:no|numarası)",)),
+        ),
+    ),
+}
+
+# Farklı yazımlar → profil anahtarı
+_PROFILE_ALIASES = {
+    "cv": "özgeçmiş/cv",
+    "özgeçmiş": "özgeçmiş/cv",
+    "proje dosyası (1)": "proje dosyası",
+    "proje dosyası (2)": "proje dosyası",
+    "proje dosyası (3)": "proje dosyası",
+}
+
+
+def get_relevance_profile(document_type: Optional[str]) -> Optional[RelevanceProfile]:
+    """
+    Belge tipine göre chunk ilgililik profilini döndür
+
+    Args:
+        document_type: Belge tipi (analyzer belge tipi veya schema key'i)
+
+    Returns:
+        RelevanceProfile veya None (profil yoksa tüm chunk'lar gönderilir)
+    """
+    if not document_type:
+        return None
+
+    key = turkish_lower(document_type.strip())
+    key = _PROFILE_ALIASES.get(key, key)
+    return RELEVANCE_PROFILES.get(key)
+
+
+class ChunkFilterStats:
+    """Belge tipi bazlı atlanan chunk sayaçları (süreç geneli)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, List[int]] = {}
+
+    def add(self, document_type: str, total: int, skipped: int):
+        with self._lock:
+            counts = self._counts.setdefault(document_type, [0, 0])
+            counts[0] += total
+            counts[1] += skipped
+
+    def skip_rate(self, document_type: str) -> float:
+        with self._lock:
+            total, skipped = self._counts.get(document_type, (0, 0))
+            return skipped / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                doc_type: {'chunks': total, 'skipped': skipped, 'skip_rate': skipped / total if total else 0.0}
+                for doc_type, (total, skipped) in self._counts.items()
+            }
+
+
+chunk_filter_stats = ChunkFilterStats()
@@ -6,6 +6,44 @@ from abc import ABC, abstractmethod
 from typing import Dict, Optional
 
 
+# Şablon belge metni yerine bu işaretle render edilir (statik kısmı ayırmak için)
+DOCUMENT_PLACEHOLDER = "\x00BELGE_METNI\x00"
+
+# Belge metninden sonra gelen sabit kapanış (talimatlar artık metinden önce)
+DOCUMENT_FOOTER = "\n\n=== BELGE SONU ===\nYukarıdaki JSON şemasına ve talimatlara göre SADECE JSON döndür."
+
+
+def build_prefix_first_prompt(rendered: str, text: str, placeholder: str = DOCUMENT_PLACEHOLDER) -> str:
+    """
+    Belge metni ortada olan prompt'u statik kısım önde olacak şekilde düzenle
+
+    Şablonlar "giriş + BELGE METNİ başlığı + metin + şema + talimatlar"
+    sırasında. Metin ortada olduğu için her chunk'ta ilk birkaç satırdan
+    sonrası farklılaşıyor ve Ollama'nın KV cache'i şema/talimat kısmını
+    tekrar hesaplıyor. Yeni sıra:
+
+        giriş + şema + talimatlar (byte-identical) + başlık + metin + kapanış
+
+    Args:
+        rendered: Şablonun metin yerine placeholder ile render edilmiş hali
+        text: Belge metni
+        placeholder: Metin işareti
+
+    Returns:
+        str: Prompt (placeholder yoksa metin sona eklenir)
+    """
+    if placeholder not in rendered:
+        return f"{rendered.rstrip()}\n\n=== BELGE METNİ ===\n{text}{DOCUMENT_FOOTER}"
+
+    before, after = rendered.split(placeholder, 1)
+    intro, _, header = before.rstrip().rpartition('\n')
+    if not intro.strip():
+        # Başlık satırı yok, metinden önceki her şey giriş
+        intro, header = before.rstrip(), "=== BELGE METNİ ==="
+
+    return f"{intro.rstrip()}\n\n{after.strip()}\n\n{header.strip()}\n{text}{DOCUMENT_FOOTER}"
+
+
 class BasePromptTemplate(ABC):
     """
     Abstract base class for all prompt templates
@@ -27,6 +65,15 @@ class BasePromptTemplate(ABC):
         """Belge tipini döndür"""
         pass
 
+    def get_prefix_first_prompt(self, text: str, schema: Dict) -> str:
+        """
+        Statik kısmı (giriş, şema, talimatlar) önde, belge metni sonda prompt
+
+        Aynı belge tipinin tüm çağrılarında metne kadar olan kısım birebir
+        aynıdır; Ollama bu prefix'i KV cache'ten kullanır.
+        """
+        return build_prefix_first_prompt(self.get_user_prompt(DOCUMENT_PLACEHOLDER, schema), text)
+
     def format_schema(self, schema: Dict) -> str:
         """JSON şemasını formatla"""
         import json
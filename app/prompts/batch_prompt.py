@@ -0,0 +1,82 @@
+"""
+Çoklu belge (batch) prompt'u
+
+Adli sicil, diploma ve hitap gibi kısa belgeler tek başına küçük bir
+metin için tam sistem prompt'u ve ayrı bir LLM isteği harcıyordu. Bir
+başvurunun küçük belgeleri tek istekte gönderilir:
+
+- Her belge kendi bölümünde: belge tipinin uzmanlık notları (sistem
+  prompt'u), şeması, talimatları ve metni
+- Çıktı şeması belge anahtarlarından (belge_<id>) oluşan tek nesne;
+  structured output ile her anahtar kendi belge şemasına sınırlanır
+- Yanıt belge anahtarlarına göre geri bölünür
+"""
+from typing import Any, Dict, List, Tuple
+
+from app.prompts.base_prompt import BasePromptTemplate
+
+
+BATCH_SYSTEM_PROMPT = """Sen Türk kamu idaresinde çalışan bir belge işleme uzmanısın.
+Aynı başvuruya ait birden fazla belge veriliyor. Her belge kendi bölümünde,
+kendi uzmanlık notları, JSON şeması ve talimatlarıyla birlikte gelir.
+
+KURALLAR:
+- Her belgenin bilgisini SADECE o belgenin anahtarına yaz
+- Belgeler arasında bilgi taşıma, bir belgede olmayanı diğerinden tamamlama
+- Sadece belgede açıkça yazılı bilgileri kullan, tahmin yapma
+- Belgede yoksa null döndür"""
+
+
+def batch_key(belge_id: Any) -> str:
+    """Yanıttaki belge anahtarı"""
+    return f"belge_{belge_id}"
+
+
+def build_batch_schema(documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Belge anahtarlarıyla birleşik şema
+
+    Args:
+        documents: belge_id ve schema içeren belge listesi
+
+    Returns:
+        Dict: {"type": "object", "properties": {"belge_<id>": şema, ...}}
+    """
+    return {
+        "type": "object",
+        "properties": {batch_key(doc["belge_id"]): doc["schema"] for doc in documents},
+    }
+
+
+def build_batch_section(belge_id: Any, document_type: str, text: str,
+                        template: BasePromptTemplate, schema: Dict) -> str:
+    """Tek belgenin bölümü (token tahmini için ayrı da kullanılır)"""
+    return (
+        f"##### {batch_key(belge_id)} ({document_type}) #####\n"
+        f"=== UZMANLIK NOTLARI ===\n{template.get_system_prompt().strip()}\n\n"
+        f"{template.get_prefix_first_prompt(text, schema)}"
+    )
+
+
+def build_batch_prompt(documents: List[Dict[str, Any]]) -> Tuple[str, str]:
+    """
+    Çoklu belge prompt'u
+
+    Args:
+        documents: belge_id, document_type, text, template, schema içeren liste
+
+    Returns:
+        Tuple: (sistem prompt'u, kullanıcı prompt'u)
+    """
+    sections = [
+        build_batch_section(doc["belge_id"], doc["document_type"], doc["text"], doc["template"], doc["schema"])
+        for doc in documents
+    ]
+    keys = ", ".join(batch_key(doc["belge_id"]) for doc in documents)
+
+    user_prompt = "\n\n".join(sections) + (
+        f"\n\n=== ÇIKTI ===\n"
+        f"Tek bir JSON nesnesi döndür. Anahtarlar: {keys}. "
+        f"Her anahtarın değeri, o belgenin bölümündeki şemaya uyan nesnedir."
+    )
+    return BATCH_SYSTEM_PROMPT, user_prompt
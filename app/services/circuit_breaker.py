@@ -0,0 +1,252 @@
+"""
+LLM çağrıları için devre kesici (circuit breaker) ve retry bütçesi
+
+Ollama kapalıyken her chunk "retry × timeout" kadar bekliyordu; yüzlerce
+chunk'lık bir toplu çalıştırma saatlerce boşa dönüyordu.
+
+Devre kesici (süreç geneli):
+- closed: istekler normal gider; üst üste FAILURE_THRESHOLD hata → open
+- open: istekler Ollama'ya gitmeden LLMUnavailableError ile hemen düşer;
+  reset_timeout sonra half-open
+- half-open: tek deneme isteğine izin verilir; başarılıysa closed,
+  başarısızsa tekrar open. Deneme sürerken gelen çağrılar reddedilmez,
+  sonucunu bekler (en fazla probe_timeout): devre kapanırsa devam eder,
+  tekrar açılırsa LLMUnavailableError alır
+
+Retry bütçesi: son window_seconds içinde retry sayısı, istek sayısının
+ratio katını (en az min_retries) aşamaz. Sorun yaygınsa retry'lar trafiği
+katlamaz, hata hemen yukarı çıkar.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class LLMUnavailableError(RuntimeError):
+    """Devre açık: Ollama'ya istek gönderilmedi (hızlı hata)"""
+
+
+class CircuitBreaker:
+    """closed / open / half-open devre kesici"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0, name: str = "ollama",
+                 probe_timeout: float = 300.0):
+        """
+        Args:
+            failure_threshold: Devreyi açan üst üste hata sayısı
+            reset_timeout: Açık kalma süresi (sn), sonra half-open
+            name: Log adı
+            probe_timeout: Half-open denemesinin sonucunu en fazla bekleme süresi (sn)
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.name = name
+        self.probe_timeout = probe_timeout
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        # Half-open denemesinin sonucunu bekleyen çağrılar
+        self._probe_done = threading.Condition(self._lock)
+
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        """Süre dolduysa open → half-open (lock altında)"""
+        if self._state == self.OPEN and time.time() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+            logger.info(f"🟡 Devre yarı açık ({self.name}): deneme isteğine izin veriliyor")
+        return self._state
+
+    def available(self) -> bool:
+        """
+        Çağrılar kabul ediliyor mu? (istek göndermeden)
+
+        Half-open'da deneme sürse de True: before_call reddetmez, sonucunu bekler.
+        """
+        return self.state != self.OPEN
+
+    def before_call(self):
+        """
+        İstekten önce çağrılır
+
+        Half-open denemesi sürüyorsa sonucunu bekler (en fazla probe_timeout).
+
+        Raises:
+            LLMUnavailableError: Devre açık, deneme başarısız oldu veya sonuç beklenirken süre doldu
+        """
+        deadline = time.time() + self.probe_timeout
+        with self._lock:
+            while True:
+                state = self._current_state()
+
+                if state == self.CLOSED:
+                    return
+
+                if state == self.HALF_OPEN and not self._probe_in_flight:
+                    self._probe_in_flight = True
+                    return
+
+                if state == self.OPEN:
+                    remaining = max(0.0, self.reset_timeout - (time.time() - self._opened_at))
+                    message = f"devre açık ({self.name}, ~{remaining:.0f}s sonra tekrar denenecek)"
+                    break
+
+                # Half-open, deneme sürüyor: sonucu bekle (record_success / record_failure / release_probe)
+                wait = deadline - time.time()
+                if wait <= 0:
+                    message = f"devre yarı açık, deneme {self.probe_timeout:.0f}s içinde sonuçlanmadı ({self.name})"
+                    break
+                self._probe_done.wait(wait)
+
+            self.rejected += 1
+
+        raise LLMUnavailableError(f"Ollama erişilemiyor, {message}")
+
+    def record_success(self):
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"🟢 Devre kapandı ({self.name}): Ollama tekrar yanıt veriyor")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+            self._probe_done.notify_all()
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            state = self._current_state()
+
+            if state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if state != self.OPEN:
+                    self.times_opened += 1
+                    logger.error(
+                        f"🔴 Devre açıldı ({self.name}): {self._failures} üst üste hata, "
+                        f"{self.reset_timeout:.0f}s boyunca istekler hemen reddedilecek"
+                    )
+                self._state = self.OPEN
+                self._opened_at = time.time()
+                self._probe_in_flight = False
+                self._probe_done.notify_all()
+
+    def release_probe(self):
+        """Half-open denemesi sonuçsuz bitti (ör. 4xx): yeni denemeye izin ver"""
+        with self._lock:
+            self._probe_in_flight = False
+            self._probe_done.notify_all()
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'state': self._current_state(),
+                'consecutive_failures': self._failures,
+                'times_opened': self.times_opened,
+                'rejected': self.rejected,
+            }
+
+
+class RetryBudget:
+    """Kayan pencerede istek sayısıyla orantılı retry sınırı"""
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 3, window_seconds: float = 60.0):
+        """
+        Args:
+            ratio: İstek başına izin verilen retry oranı
+            min_retries: Düşük trafikte pencere başına izin verilen retry
+            window_seconds: Pencere uzunluğu (sn)
+        """
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window_seconds = window_seconds
+
+        self._requests: deque = deque()
+        self._retries: deque = deque()
+        self._lock = threading.Lock()
+        self.exhausted = 0
+
+    def _trim(self, now: float):
+        cutoff = now - self.window_seconds
+        while self._requests and self._requests[0] < cutoff:
+            self._requests.popleft()
+        while self._retries and self._retries[0] < cutoff:
+            self._retries.popleft()
+
+    def record_request(self):
+        now = time.time()
+        with self._lock:
+            self._trim(now)
+            self._requests.append(now)
+
+    def try_acquire(self) -> bool:
+        """Retry için bütçeden pay al (yoksa False)"""
+        now = time.time()
+        with self._lock:
+            self._trim(now)
+            allowed = max(self.min_retries, int(len(self._requests) * self.ratio))
+            if len(self._retries) >= allowed:
+                self.exhausted += 1
+                return False
+            self._retries.append(now)
+            return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            self._trim(time.time())
+            return {
+                'window_requests': len(self._requests),
+                'window_retries': len(self._retries),
+                'exhausted': self.exhausted,
+            }
+
+
+# Backend listesi → devre kesici / retry bütçesi (aynı süreçteki tüm istemciler paylaşır)
+_breakers: Dict[Tuple[str, ...], CircuitBreaker] = {}
+_budgets: Dict[Tuple[str, ...], RetryBudget] = {}
+_registry_lock = threading.Lock()
+
+
+def get_circuit_breaker(urls: List[str], **kwargs) -> CircuitBreaker:
+    """
+    Paylaşılan devre kesiciyi döndür
+
+    Args:
+        urls: Backend adresleri
+        **kwargs: CircuitBreaker parametreleri (sadece ilk oluşturmada kullanılır)
+    """
+    key = tuple(url.rstrip('/') for url in urls)
+    with _registry_lock:
+        if key not in _breakers:
+            _breakers[key] = CircuitBreaker(**kwargs)
+        return _breakers[key]
+
+
+def get_retry_budget(urls: List[str], **kwargs) -> RetryBudget:
+    """
+    Paylaşılan retry bütçesini döndür
+
+    Args:
+        urls: Backend adresleri
+        **kwargs: RetryBudget parametreleri (sadece ilk oluşturmada kullanılır)
+    """
+    key = tuple(url.rstrip('/') for url in urls)
+    with _registry_lock:
+        if key not in _budgets:
+            _budgets[key] = RetryBudget(**kwargs)
+        return _budgets[key]
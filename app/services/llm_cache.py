@@ -0,0 +1,243 @@
+"""
+Kalıcı LLM yanıt cache'i (SQLite)
+
+Aynı (model, system prompt, user prompt, options, format, images) isteği
+Ollama'ya tekrar gönderilmez; yanıt milisaniyeler içinde cache'ten döner.
+analyze_from_db.py tekrar çalıştırmaları ve crash sonrası kurtarma bu sayede
+LLM süresini yeniden ödemez.
+
+- Anahtar: isteğin tamamının SHA-256 hash'i
+- TTL: süresi dolan kayıtlar okunmaz ve eviction'da silinir
+- LRU: kayıt sayısı veya toplam boyut sınırı aşılınca en eski erişilenler silinir
+- Sayaçlar: hit / miss / set / eviction (süreç bazlı) + kayıt başına hit_count
+- Bypass: okuma atlanır, yanıt yine yazılır (cache yenileme)
+- Yazma: çağıran doğrulayıcı verirse (OllamaClient.generate cache_if) sadece
+  JSON olarak ayrıştırılabilen yanıtlar yazılır; bozuk çıktı tekrar oynatılmaz
+
+Hem CLI (services/ollama_service.py) hem API (app/services/ollama_service.py)
+tarafından kullanılır.
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """SQLite tabanlı TTL + LRU yanıt cache'i"""
+
+    def __init__(
+        self,
+        db_path: Path,
+        ttl_seconds: int = 7 * 24 * 3600,
+        max_entries: int = 5000,
+        max_bytes: int = 200 * 1024 * 1024,
+        enabled: bool = True
+    ):
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.bypass = False
+
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if self.enabled:
+            self._connect()
+
+    def _connect(self):
+        """Bağlantıyı aç ve tabloyu oluştur"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                cache_key TEXT PRIMARY KEY,
+                model TEXT,
+                response TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                hit_count INTEGER DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache(last_access);
+            CREATE INDEX IF NOT EXISTS idx_llm_cache_created ON llm_cache(created_at);
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(payload: Dict[str, Any]) -> str:
+        """
+        İstek payload'undan deterministik cache anahtarı üret
+
+        Args:
+            payload: Ollama'ya gönderilecek istek (stream gibi taşıma alanları hariç)
+
+        Returns:
+            SHA-256 hex digest
+        """
+        canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    @property
+    def active(self) -> bool:
+        return self.enabled and self._conn is not None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Cache'ten yanıt al
+
+        Returns:
+            Kaydedilmiş Ollama yanıtı veya None (miss, süresi dolmuş ya da bypass)
+        """
+        if not self.active or self.bypass:
+            return None
+
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT response, created_at FROM llm_cache WHERE cache_key = ?",
+                    (key,)
+                ).fetchone()
+
+                if row is None or now - row[1] > self.ttl_seconds:
+                    self.misses += 1
+                    return None
+
+                self._conn.execute(
+                    "UPDATE llm_cache SET last_access = ?, hit_count = hit_count + 1 WHERE cache_key = ?",
+                    (now, key)
+                )
+                self._conn.commit()
+                self.hits += 1
+
+            return json.loads(row[0])
+
+        except Exception as e:
+            logger.warning(f"LLM cache okuma hatası: {e}")
+            return None
+
+    def set(self, key: str, response: Dict[str, Any], model: Optional[str] = None):
+        """Yanıtı cache'e yaz ve gerekirse eviction yap"""
+        if not self.active:
+            return
+
+        now = time.time()
+        try:
+            data = json.dumps(response, ensure_ascii=False)
+            with self._lock:
+                self._conn.execute(
+                    """
+                    INSERT OR REPLACE INTO llm_cache
+                        (cache_key, model, response, size_bytes, created_at, last_access, hit_count)
+                    VALUES (?, ?, ?, ?, ?, ?, 0)
+                    """,
+                    (key, model, data, len(data.encode('utf-8')), now, now)
+                )
+                self.sets += 1
+                self._evict(now)
+                self._conn.commit()
+
+        except Exception as e:
+            logger.warning(f"LLM cache yazma hatası: {e}")
+
+    def _evict(self, now: float):
+        """Süresi dolanları sil, sonra sınır aşılıyorsa LRU sırasıyla sil (lock altında)"""
+        cursor = self._conn.execute(
+            "DELETE FROM llm_cache WHERE created_at < ?",
+            (now - self.ttl_seconds,)
+        )
+        self.evictions += cursor.rowcount
+
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM llm_cache"
+        ).fetchone()
+
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        # En eski erişilenlerden başlayarak sınırların altına inene kadar sil
+        rows = self._conn.execute(
+            "SELECT cache_key, size_bytes FROM llm_cache ORDER BY last_access ASC"
+        )
+        to_delete = []
+        for cache_key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            to_delete.append((cache_key,))
+            count -= 1
+            total -= size
+
+        self._conn.executemany("DELETE FROM llm_cache WHERE cache_key = ?", to_delete)
+        self.evictions += len(to_delete)
+        logger.debug(f"LLM cache eviction: {len(to_delete)} kayıt silindi")
+
+    def clear(self):
+        """Tüm cache'i temizle"""
+        if not self.active:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache istatistikleri"""
+        result = {
+            'enabled': self.enabled,
+            'bypass': self.bypass,
+            'hits': self.hits,
+            'misses': self.misses,
+            'sets': self.sets,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / (self.hits + self.misses) if (self.hits + self.misses) else 0.0,
+            'entries': 0,
+            'size_bytes': 0,
+        }
+
+        if self.active:
+            with self._lock:
+                entries, size = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM llm_cache"
+                ).fetchone()
+            result.update({'entries': entries, 'size_bytes': size})
+
+        return result
+
+
+# Dosya yolu → cache (aynı süreçteki tüm OllamaService instance'ları paylaşır)
+_caches: Dict[str, LLMResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_llm_cache(db_path: Path, **kwargs) -> LLMResponseCache:
+    """
+    Paylaşılan cache instance'ını döndür
+
+    Args:
+        db_path: SQLite dosya yolu
+        **kwargs: LLMResponseCache parametreleri (sadece ilk oluşturmada kullanılır)
+    """
+    key = str(Path(db_path).resolve())
+    with _caches_lock:
+        if key not in _caches:
+            try:
+                _caches[key] = LLMResponseCache(db_path, **kwargs)
+            except Exception as e:
+                logger.error(f"LLM cache açılamadı, cache devre dışı: {e}")
+                _caches[key] = LLMResponseCache(db_path, **{**kwargs, 'enabled': False})
+        return _caches[key]
@@ -0,0 +1,347 @@
+"""
+Arka planda toplu yazan LLM denetim (audit) log'u
+
+Her LLM çağrısı eskiden llm_logs/<basvuru_id>/ altına ayrı, girintili bir
+JSON dosyası yazıyordu: sıcak yolda makedirs + json.dump(indent=2), ve
+dizinde milyonlarca küçük dosya.
+
+Sink:
+- write(): kaydı kompakt JSON'a çevirip bellek kuyruğuna koyar (bloklamaz;
+  kuyruk doluysa kayıt düşürülür ve sayılır)
+- Arka plan thread'i kuyruğu toplu olarak günlük NDJSON dosyasına ekler:
+  llm_logs/YYYY-MM-DD.ndjson (compress=True ise .ndjson.gz, her toplu
+  yazım ayrı bir gzip üyesi)
+- İndeks (llm_logs/index.db, SQLite): basvuru_id → (dosya, offset, uzunluk).
+  read(basvuru_id) sadece ilgili blokları okur; başvuru bazlı inceleme
+  (eski dizin yapısı) böyle devam eder
+- Saklama: retention_days'ten eski günlük dosyalar ve toplam boyut
+  max_bytes'ı aşarsa en eski günler silinir (indeks kayıtlarıyla birlikte)
+- Süreç kapanırken (atexit) kuyruk boşaltılır
+
+Okuma: scripts/llm_logs.py --basvuru 123
+"""
+import atexit
+import gzip
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LLMLogSink:
+    """Kuyruklu, toplu yazan NDJSON log sink'i"""
+
+    INDEX_FILE = "index.db"
+
+    def __init__(
+        self,
+        log_dir: Path,
+        compress: bool = False,
+        retention_days: int = 30,
+        max_bytes: int = 1024 * 1024 * 1024,
+        queue_size: int = 10000,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        enabled: bool = True
+    ):
+        """
+        Args:
+            log_dir: Log dizini
+            compress: Günlük dosyaları gzip ile yaz
+            retention_days: Bu günden eski dosyalar silinir (0 = süre sınırı yok)
+            max_bytes: Toplam log boyutu sınırı (0 = sınırsız)
+            queue_size: Bellek kuyruğu kapasitesi
+            batch_size: Tek yazımda en fazla kayıt
+            flush_interval: Kuyruk boşken bekleme süresi (sn)
+            enabled: False ise write() hiçbir şey yapmaz
+        """
+        self.log_dir = Path(log_dir)
+        self.compress = compress
+        self.retention_days = retention_days
+        self.max_bytes = max_bytes
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enabled = enabled
+
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_retention = 0.0
+
+        if self.enabled:
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+            self._thread = threading.Thread(target=self._run, name="llm-log-sink", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    # ========== YAZMA (SICAK YOL) ==========
+
+    def write(self, record: Dict[str, Any]):
+        """
+        Kaydı kuyruğa koy (bloklamaz)
+
+        Kayıt burada serileştirilir: çağıran, döndürülen veriyi sonradan
+        değiştirse de log'a çağrı anındaki hali yazılır.
+        """
+        if not self.enabled:
+            return
+
+        try:
+            line = json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=str)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"LLM log kaydı serileştirilemedi: {e}")
+            return
+
+        try:
+            self._queue.put_nowait({
+                'basvuru_id': record.get('basvuru_id'),
+                'day': datetime.now().strftime('%Y-%m-%d'),
+                'line': line,
+            })
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning(f"⚠️ LLM log kuyruğu dolu, {self.dropped} kayıt düşürüldü")
+
+    # ========== ARKA PLAN YAZICI ==========
+
+    def _run(self):
+        """Kuyruğu toplu olarak dosyaya ve indekse yaz"""
+        conn = self._open_index()
+
+        while True:
+            try:
+                items = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                items = []
+
+            while items and len(items) < self.batch_size:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            batch = [item for item in items if item is not None]
+            if batch:
+                try:
+                    self._write_batch(conn, batch)
+                except Exception as e:
+                    logger.warning(f"LLM log yazılamadı ({len(batch)} kayıt): {e}")
+            for _ in items:
+                self._queue.task_done()
+
+            if self._stop.is_set() and self._queue.empty():
+                break
+
+            if time.time() - self._last_retention > 3600:
+                try:
+                    self._apply_retention(conn)
+                except Exception as e:
+                    logger.warning(f"LLM log saklama temizliği başarısız: {e}")
+                self._last_retention = time.time()
+
+        conn.close()
+
+    def _open_index(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.log_dir / self.INDEX_FILE), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS llm_log_index (
+                basvuru_id TEXT,
+                file TEXT NOT NULL,
+                byte_offset INTEGER NOT NULL,
+                byte_length INTEGER NOT NULL,
+                records INTEGER NOT NULL,
+                created_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_llm_log_basvuru ON llm_log_index(basvuru_id);
+            CREATE INDEX IF NOT EXISTS idx_llm_log_file ON llm_log_index(file);
+        """)
+        conn.commit()
+        return conn
+
+    def _file_name(self, day: str) -> str:
+        return f"{day}.ndjson.gz" if self.compress else f"{day}.ndjson"
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[Dict[str, Any]]):
+        """Gün başına tek blok ekle, bloktaki başvurular için indeks satırı yaz"""
+        by_day: Dict[str, List[Dict[str, Any]]] = {}
+        for item in batch:
+            by_day.setdefault(item['day'], []).append(item)
+
+        now = datetime.now().isoformat()
+        rows = []
+        for day, items in by_day.items():
+            file_name = self._file_name(day)
+            data = ("\n".join(item['line'] for item in items) + "\n").encode('utf-8')
+            if self.compress:
+                data = gzip.compress(data)
+
+            # O_APPEND: blok tek write ile dosya sonuna gider (birden fazla süreç aynı dosyaya yazabilir)
+            fd = os.open(str(self.log_dir / file_name), os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o644)
+            try:
+                os.write(fd, data)
+                offset = os.lseek(fd, 0, os.SEEK_CUR) - len(data)
+            finally:
+                os.close(fd)
+
+            counts: Dict[Optional[str], int] = {}
+            for item in items:
+                key = str(item['basvuru_id']) if item['basvuru_id'] is not None else None
+                counts[key] = counts.get(key, 0) + 1
+            rows.extend((key, file_name, offset, len(data), n, now) for key, n in counts.items())
+
+        conn.executemany(
+            "INSERT INTO llm_log_index (basvuru_id, file, byte_offset, byte_length, records, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        conn.commit()
+
+        self.written += len(batch)
+        self.batches += 1
+
+    def _apply_retention(self, conn: sqlite3.Connection):
+        """Eski / fazla günlük dosyaları sil"""
+        files = sorted(self.log_dir.glob("*.ndjson*"))
+        today = self._file_name(datetime.now().strftime('%Y-%m-%d'))
+        removed = []
+
+        if self.retention_days > 0:
+            cutoff = (datetime.now() - timedelta(days=self.retention_days)).strftime('%Y-%m-%d')
+            for path in files:
+                if path.name.split('.')[0] < cutoff:
+                    removed.append(path)
+
+        remaining = [p for p in files if p not in removed]
+        if self.max_bytes > 0:
+            total = sum(p.stat().st_size for p in remaining)
+            for path in remaining:
+                if total <= self.max_bytes or path.name == today:
+                    break
+                total -= path.stat().st_size
+                removed.append(path)
+
+        for path in removed:
+            path.unlink(missing_ok=True)
+            conn.execute("DELETE FROM llm_log_index WHERE file = ?", (path.name,))
+        if removed:
+            conn.commit()
+            logger.info(f"🧹 LLM log saklama: {len(removed)} günlük dosya silindi")
+
+    # ========== OKUMA ==========
+
+    def read(self, basvuru_id: Any = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Başvurunun LLM log kayıtları (eskiden yeniye)
+
+        Args:
+            basvuru_id: Başvuru ID (None = başvurusuz "genel" kayıtlar)
+            limit: En fazla kayıt (sondan)
+        """
+        return read_llm_logs(self.log_dir, basvuru_id, limit)
+
+    def flush(self, timeout: float = 10.0):
+        """Kuyruktaki kayıtlar yazılana kadar bekle"""
+        deadline = time.time() + timeout
+        while self._thread and self._thread.is_alive() and self._queue.unfinished_tasks and time.time() < deadline:
+            time.sleep(0.05)
+
+    def close(self):
+        """Kuyruğu boşalt ve yazıcıyı durdur"""
+        if not self._thread or not self._thread.is_alive():
+            return
+        self._stop.set()
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+        self._thread.join(timeout=30)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'enabled': self.enabled,
+            'written': self.written,
+            'dropped': self.dropped,
+            'batches': self.batches,
+            'queued': self._queue.qsize(),
+        }
+
+
+def read_llm_logs(log_dir: Path, basvuru_id: Any = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    İndeksten başvurunun bloklarını bulup kayıtları oku
+
+    Sink çalışmıyorken de (viewer, script) kullanılabilir.
+    """
+    log_dir = Path(log_dir)
+    index_path = log_dir / LLMLogSink.INDEX_FILE
+    if not index_path.exists():
+        return []
+
+    key = str(basvuru_id) if basvuru_id is not None else None
+    conn = sqlite3.connect(str(index_path), timeout=30)
+    try:
+        rows = conn.execute(
+            "SELECT file, byte_offset, byte_length FROM llm_log_index WHERE basvuru_id IS ? ORDER BY rowid",
+            (key,)
+        ).fetchall()
+    finally:
+        conn.close()
+
+    records = []
+    for file_name, offset, length in rows:
+        path = log_dir / file_name
+        if not path.exists():
+            continue
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read(length)
+        if file_name.endswith('.gz'):
+            data = gzip.decompress(data)
+
+        for line in data.decode('utf-8').splitlines():
+            if not line:
+                continue
+            record = json.loads(line)
+            record_key = str(record.get('basvuru_id')) if record.get('basvuru_id') is not None else None
+            if record_key == key:
+                records.append(record)
+
+    return records[-limit:] if limit else records
+
+
+# Log dizini → sink (aynı süreçteki tüm servisler paylaşır)
+_sinks: Dict[str, LLMLogSink] = {}
+_sinks_lock = threading.Lock()
+
+
+def get_llm_log_sink(log_dir: Path, **kwargs) -> LLMLogSink:
+    """
+    Paylaşılan log sink'ini döndür
+
+    Args:
+        log_dir: Log dizini
+        **kwargs: LLMLogSink parametreleri (sadece ilk oluşturmada kullanılır)
+    """
+    key = str(Path(log_dir).resolve())
+    with _sinks_lock:
+        if key not in _sinks:
+            try:
+                _sinks[key] = LLMLogSink(log_dir, **kwargs)
+            except Exception as e:
+                logger.warning(f"LLM log sink açılamadı, log kapalı: {e}")
+                _sinks[key] = LLMLogSink(log_dir, **{**kwargs, 'enabled': False})
+        return _sinks[key]
@@ -0,0 +1,433 @@
+"""
+Öncelikli LLM istek zamanlayıcı
+
+Görüntüleyiciden tek başvurunun yeniden analizi ile gece çalışan toplu
+(backfill) işler aynı Ollama backend'leri için FIFO yarışıyordu: binlerce
+chunk'ın arkasına düşen etkileşimli istek dakikalarca bekliyordu.
+
+Öncelik sınıfları (en aciliyle başlayarak):
+- interactive: Operatörün "bunu şimdi yeniden çalıştır" isteği
+- deadline: Son tarihi olan / etiketlenmemiş normal işler (varsayılan)
+- backfill: Toplu geçmiş işleme
+
+Süreç içinde:
+- Weighted fair queuing (self-clocked): her istek sınıf ağırlığına göre
+  bir bitiş etiketi alır (başlangıç + maliyet / ağırlık); boşalan slot en
+  küçük etiketli bekleyen isteğe verilir. Düşük sınıflar aç kalmaz, sadece
+  daha seyrek sıra alır
+- Sınıf başına eşzamanlılık üst sınırı: backfill varsayılan olarak
+  slotların birini boş bırakır; etkileşimli istek uzun bir toplu çağrının
+  bitmesini beklemeden başlar
+
+Süreçler arası (SQLite, isteğe bağlı):
+- Dolu slotlar kira (lease) olarak tutulur; toplam ve sınıf sınırları tüm
+  worker'lar için geçerlidir. Çöken sürecin kiraları süresi dolunca düşer
+- Bekleyen istek sayıları yayınlanır: başka bir süreçte daha acil sınıftan
+  bekleyen varken düşük sınıf boş slotu almaz
+
+Öncelik çağrı bağlamından okunur:
+
+    with llm_priority(INTERACTIVE):
+        orchestrator.run()
+
+Thread havuzuna verilen işler bağlamı miras almaz; propagate_priority ile
+sarılmalıdır.
+"""
+import atexit
+import itertools
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+INTERACTIVE = "interactive"
+DEADLINE = "deadline"
+BACKFILL = "backfill"
+
+# En aciliyle başlayarak
+PRIORITIES = (INTERACTIVE, DEADLINE, BACKFILL)
+
+DEFAULT_WEIGHTS = {INTERACTIVE: 100.0, DEADLINE: 10.0, BACKFILL: 1.0}
+
+
+_current_priority: ContextVar[Optional[str]] = ContextVar("llm_priority", default=None)
+
+
+def _check_priority(priority: str) -> str:
+    if priority not in PRIORITIES:
+        raise ValueError(f"Geçersiz LLM önceliği: {priority} (geçerli: {', '.join(PRIORITIES)})")
+    return priority
+
+
+@contextmanager
+def llm_priority(priority: str) -> Iterator[None]:
+    """Blok içindeki LLM çağrılarının öncelik sınıfı"""
+    token = _current_priority.set(_check_priority(priority))
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority(default: str = DEADLINE) -> str:
+    """Çağrı bağlamının öncelik sınıfı (etiketlenmemişse default)"""
+    return _current_priority.get() or default
+
+
+def propagate_priority(fn: Callable) -> Callable:
+    """
+    Çağıranın önceliğini thread havuzundaki işe taşı
+
+    Kullanım:
+        executor.map(propagate_priority(self._analyze_chunk), chunks)
+    """
+    priority = _current_priority.get()
+
+    def wrapper(*args, **kwargs):
+        token = _current_priority.set(priority)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current_priority.reset(token)
+
+    return wrapper
+
+
+@dataclass
+class _Ticket:
+    """Slot bekleyen tek istek"""
+    priority: str
+    finish: float
+    seq: int
+    enqueued_at: float = field(default_factory=time.time)
+    granted: bool = False
+    lease_id: Optional[str] = None
+
+
+class SharedSlotStore:
+    """SQLite üzerinden süreçler arası slot kiraları ve bekleyen sayıları"""
+
+    # Bekleyen sayısı bu süre yenilenmezse (süreç öldü) dikkate alınmaz
+    WAITER_TTL = 10.0
+
+    def __init__(self, db_path: Path, lease_seconds: float = 900.0):
+        """
+        Args:
+            db_path: Paylaşılan SQLite dosyası
+            lease_seconds: Kira süresi (en uzun LLM çağrısından uzun olmalı)
+        """
+        self.db_path = Path(db_path)
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.db_path), check_same_thread=False, timeout=30, isolation_level=None
+        )
+        self._lock = threading.Lock()
+        self._last_published: Optional[Tuple[Tuple[str, int], ...]] = None
+        self._last_publish_time = 0.0
+
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS llm_slot_leases (
+                    lease_id TEXT PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    priority TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS llm_slot_waiters (
+                    owner TEXT NOT NULL,
+                    priority TEXT NOT NULL,
+                    waiting INTEGER NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (owner, priority)
+                );
+            """)
+        atexit.register(self.close)
+
+    def try_acquire(self, priority: str, slots: int, caps: Dict[str, int]) -> Optional[str]:
+        """
+        Boş slot varsa kirala
+
+        Returns:
+            str: Kira ID'si, slot yoksa / daha acil bekleyen varsa None
+        """
+        more_urgent = PRIORITIES[:PRIORITIES.index(priority)]
+        now = time.time()
+
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM llm_slot_leases WHERE expires_at < ?", (now,))
+                counts = dict(conn.execute(
+                    "SELECT priority, COUNT(*) FROM llm_slot_leases GROUP BY priority"
+                ).fetchall())
+
+                if sum(counts.values()) >= slots or counts.get(priority, 0) >= caps[priority]:
+                    conn.execute("ROLLBACK")
+                    return None
+
+                if more_urgent:
+                    placeholders = ", ".join("?" for _ in more_urgent)
+                    waiting = conn.execute(
+                        f"SELECT COALESCE(SUM(waiting), 0) FROM llm_slot_waiters "
+                        f"WHERE owner != ? AND expires_at >= ? AND priority IN ({placeholders})",
+                        (self.owner, now, *more_urgent)
+                    ).fetchone()[0]
+                    if waiting:
+                        conn.execute("ROLLBACK")
+                        return None
+
+                lease_id = uuid.uuid4().hex
+                conn.execute(
+                    "INSERT INTO llm_slot_leases (lease_id, owner, priority, expires_at) VALUES (?, ?, ?, ?)",
+                    (lease_id, self.owner, priority, now + self.lease_seconds)
+                )
+                conn.execute("COMMIT")
+                return lease_id
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def release(self, lease_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_slot_leases WHERE lease_id = ?", (lease_id,))
+
+    def publish_waiting(self, counts: Dict[str, int]):
+        """
+        Bu süreçte bekleyen istek sayılarını yayınla, kiraları yenile
+
+        Değişmediyse sadece WAITER_TTL / 3'te bir yazılır.
+        """
+        snapshot = tuple(sorted(counts.items()))
+        now = time.time()
+        if snapshot == self._last_published and now - self._last_publish_time < self.WAITER_TTL / 3:
+            return
+
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM llm_slot_waiters WHERE owner = ?", (self.owner,))
+                conn.executemany(
+                    "INSERT INTO llm_slot_waiters (owner, priority, waiting, expires_at) VALUES (?, ?, ?, ?)",
+                    [(self.owner, p, n, now + self.WAITER_TTL) for p, n in counts.items() if n]
+                )
+                conn.execute(
+                    "UPDATE llm_slot_leases SET expires_at = ? WHERE owner = ?",
+                    (now + self.lease_seconds, self.owner)
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        self._last_published = snapshot
+        self._last_publish_time = now
+
+    def close(self):
+        """Bu sürecin kira ve bekleyen kayıtlarını sil"""
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM llm_slot_leases WHERE owner = ?", (self.owner,))
+                self._conn.execute("DELETE FROM llm_slot_waiters WHERE owner = ?", (self.owner,))
+            except sqlite3.Error:
+                pass
+
+
+class LLMScheduler:
+    """Weighted fair queuing + sınıf başına eşzamanlılık sınırı"""
+
+    def __init__(
+        self,
+        slots: int = 4,
+        weights: Optional[Dict[str, float]] = None,
+        caps: Optional[Dict[str, int]] = None,
+        store: Optional[SharedSlotStore] = None,
+        poll_interval: float = 0.25
+    ):
+        """
+        Args:
+            slots: Toplam eşzamanlı LLM isteği (tüm backend'ler)
+            weights: Sınıf ağırlıkları (büyük = daha sık sıra)
+            caps: Sınıf başına eşzamanlı istek üst sınırı (verilmeyen = slots)
+            store: Süreçler arası paylaşım (None = sadece bu süreç)
+            poll_interval: Paylaşımlı modda slot bekleme yoklama aralığı (sn)
+        """
+        self.slots = max(1, slots)
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.caps = {p: max(1, min(self.slots, (caps or {}).get(p) or self.slots)) for p in PRIORITIES}
+        self.store = store
+        self.poll_interval = poll_interval
+
+        self._cond = threading.Condition()
+        self._waiting: List[_Ticket] = []
+        self._in_flight = {p: 0 for p in PRIORITIES}
+        self._last_finish = {p: 0.0 for p in PRIORITIES}
+        self._virtual_time = 0.0
+        self._seq = itertools.count()
+
+        self._granted = {p: 0 for p in PRIORITIES}
+        self._wait_total = {p: 0.0 for p in PRIORITIES}
+        self._wait_max = {p: 0.0 for p in PRIORITIES}
+
+    @contextmanager
+    def slot(self, priority: Optional[str] = None, cost: float = 1.0) -> Iterator[str]:
+        """
+        İstek süresince bir slot ayır (sıra gelene kadar bekler)
+
+        Args:
+            priority: Öncelik sınıfı (None = çağrı bağlamındaki)
+            cost: İsteğin göreli maliyeti (bitiş etiketi)
+
+        Yields:
+            str: Kullanılan öncelik sınıfı
+        """
+        priority = _check_priority(priority or current_priority())
+
+        with self._cond:
+            start = max(self._virtual_time, self._last_finish[priority])
+            ticket = _Ticket(priority, start + cost / self.weights[priority], next(self._seq))
+            self._last_finish[priority] = ticket.finish
+            self._waiting.append(ticket)
+            self._dispatch()
+
+            try:
+                while not ticket.granted:
+                    self._cond.wait(timeout=self.poll_interval if self.store else None)
+                    if not ticket.granted:
+                        self._dispatch()
+            except BaseException:
+                if ticket.granted:
+                    self._release(ticket)
+                else:
+                    self._waiting.remove(ticket)
+                    self._dispatch()
+                raise
+
+        try:
+            yield priority
+        finally:
+            with self._cond:
+                self._release(ticket)
+
+    def _dispatch(self):
+        """Boş slotları en küçük bitiş etiketli uygun isteklere ver (lock altında)"""
+        if self.store is not None:
+            try:
+                self.store.publish_waiting({p: sum(1 for t in self._waiting if t.priority == p) for p in PRIORITIES})
+            except sqlite3.Error as e:
+                logger.warning(f"LLM zamanlayıcı bekleyen sayısı yayınlanamadı: {e}")
+
+        for ticket in sorted(self._waiting, key=lambda t: (t.finish, t.seq)):
+            if sum(self._in_flight.values()) >= self.slots:
+                break
+            if self._in_flight[ticket.priority] >= self.caps[ticket.priority]:
+                continue
+
+            if self.store is not None:
+                try:
+                    ticket.lease_id = self.store.try_acquire(ticket.priority, self.slots, self.caps)
+                except sqlite3.Error as e:
+                    # Paylaşım dosyasına ulaşılamıyor: sadece süreç içi sınırlar uygulanır
+                    logger.warning(f"LLM zamanlayıcı paylaşımlı slot alınamadı, yerel devam: {e}")
+                    ticket.lease_id = None
+                else:
+                    if ticket.lease_id is None:
+                        continue
+
+            ticket.granted = True
+            self._waiting.remove(ticket)
+            self._in_flight[ticket.priority] += 1
+            self._virtual_time = max(self._virtual_time, ticket.finish)
+
+            waited = time.time() - ticket.enqueued_at
+            self._granted[ticket.priority] += 1
+            self._wait_total[ticket.priority] += waited
+            self._wait_max[ticket.priority] = max(self._wait_max[ticket.priority], waited)
+            self._cond.notify_all()
+
+    def _release(self, ticket: _Ticket):
+        """Slotu bırak ve sıradakine ver (lock altında)"""
+        self._in_flight[ticket.priority] -= 1
+        if ticket.lease_id is not None and self.store is not None:
+            try:
+                self.store.release(ticket.lease_id)
+            except sqlite3.Error as e:
+                logger.warning(f"LLM zamanlayıcı kirası bırakılamadı (süresi dolunca düşer): {e}")
+        ticket.lease_id = None
+        self._dispatch()
+        self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Sınıf bazında bekleyen / çalışan / bekleme süreleri"""
+        with self._cond:
+            return {
+                'slots': self.slots,
+                'shared': self.store is not None,
+                'classes': {
+                    p: {
+                        'weight': self.weights[p],
+                        'cap': self.caps[p],
+                        'in_flight': self._in_flight[p],
+                        'waiting': sum(1 for t in self._waiting if t.priority == p),
+                        'granted': self._granted[p],
+                        'avg_wait': self._wait_total[p] / self._granted[p] if self._granted[p] else 0.0,
+                        'max_wait': self._wait_max[p],
+                    }
+                    for p in PRIORITIES
+                },
+            }
+
+
+# Backend listesi → zamanlayıcı (aynı süreçteki tüm istemciler slotları paylaşır)
+_schedulers: Dict[Tuple[str, ...], LLMScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_llm_scheduler(
+    urls: List[str],
+    shared_path: Optional[Path] = None,
+    lease_seconds: float = 900.0,
+    **kwargs
+) -> LLMScheduler:
+    """
+    Paylaşılan zamanlayıcıyı döndür
+
+    Args:
+        urls: Backend adresleri
+        shared_path: Süreçler arası SQLite dosyası (None = sadece bu süreç)
+        lease_seconds: Paylaşımlı kira süresi
+        **kwargs: LLMScheduler parametreleri (sadece ilk oluşturmada kullanılır)
+    """
+    key = tuple(url.rstrip('/') for url in urls)
+    with _schedulers_lock:
+        if key not in _schedulers:
+            store = None
+            if shared_path:
+                try:
+                    store = SharedSlotStore(shared_path, lease_seconds=lease_seconds)
+                except sqlite3.Error as e:
+                    logger.warning(f"LLM zamanlayıcı paylaşım dosyası açılamadı, süreç içi çalışılacak: {e}")
+            _schedulers[key] = LLMScheduler(store=store, **kwargs)
+            scheduler = _schedulers[key]
+            logger.info(
+                f"LLM zamanlayıcı: {scheduler.slots} slot, sınırlar "
+                f"{', '.join(f'{p}={c}' for p, c in scheduler.caps.items())}"
+                f"{' (süreçler arası)' if store else ''}"
+            )
+        return _schedulers[key]
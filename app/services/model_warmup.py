@@ -0,0 +1,180 @@
+"""
+Ollama model ısıtma (warm-up) ve soğutma (cooldown)
+
+Boşta kalan Ollama'ya gelen ilk istek modelin diske/belleğe yüklenmesini
+bekler; büyük modellerde bu süre istek timeout'unu aşıp retry'lara yol
+açıyor. Toplu çalıştırmalardan önce kullanılan tüm modeller her backend'de
+boş prompt ile yüklenir ve keep_alive ile bellekte tutulur. Kuyruk
+boşaldığında modeller idle keep_alive ile (0 = hemen) bırakılır.
+
+Ollama: prompt'suz /api/generate isteği modeli sadece yükler, keep_alive=0
+modeli bellekten çıkarır.
+"""
+import logging
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+_DURATION_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+
+
+def parse_keep_alive(value) -> Optional[float]:
+    """
+    Ollama keep_alive değerini saniyeye çevir
+
+    Args:
+        value: "30m", "1h", "45s", "1h30m", 300 veya "-1"
+
+    Returns:
+        float: Saniye, negatif değerlerde None (süresiz)
+    """
+    if value is None or value == "":
+        return 0.0
+    if isinstance(value, (int, float)):
+        return None if value < 0 else float(value)
+
+    text = str(value).strip()
+    try:
+        number = float(text)
+        return None if number < 0 else number
+    except ValueError:
+        pass
+
+    if text.startswith('-'):
+        return None
+
+    total = 0.0
+    for amount, unit in re.findall(r'(\d+(?:\.\d+)?)(ms|h|m|s)', text):
+        total += float(amount) * _DURATION_UNITS[unit]
+    return total
+
+
+class ModelWarmup:
+    """Backend × model bazlı yükleme durumu"""
+
+    # keep_alive dolmadan bu kadar önce yeniden ısıtılır (sn)
+    REFRESH_MARGIN = 60
+
+    def __init__(self, client, keep_alive, load_timeout: float = 600):
+        """
+        Args:
+            client: OllamaClient (session + router)
+            keep_alive: Isıtılan modelin bellekte kalma süresi
+            load_timeout: Model yükleme timeout'u (sn)
+        """
+        self.client = client
+        self.keep_alive = keep_alive
+        self.load_timeout = load_timeout
+
+        self._warm_until: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    def _post(self, backend_url: str, model: str, keep_alive) -> bool:
+        """Prompt'suz generate: modeli yükle veya keep_alive'ını güncelle"""
+        try:
+            response = self.client.session.post(
+                f"{backend_url}/api/generate",
+                json={"model": model, "keep_alive": keep_alive, "stream": False},
+                timeout=self.load_timeout,
+                verify=self.client.verify
+            )
+            response.raise_for_status()
+            return True
+        except Exception as e:
+            logger.warning(f"Ollama model isteği başarısız ({model} @ {backend_url}): {e}")
+            return False
+
+    def is_warm(self, model: str) -> bool:
+        """Model tüm sağlıklı backend'lerde hâlâ yüklü sayılıyor mu?"""
+        now = time.time()
+        with self._lock:
+            return all(
+                self._warm_until.get((backend.url, model), 0) > now
+                for backend in self.client.router.backends if backend.healthy
+            )
+
+    def warm_up(self, models: List[str], force: bool = False) -> Dict[str, bool]:
+        """
+        Modelleri her sağlıklı backend'de yükle
+
+        Args:
+            models: Model adları
+            force: Yakın zamanda ısıtılmış olsa da tekrar yükle
+
+        Returns:
+            Dict: model → en az bir backend'de yüklendi mi
+        """
+        self.client.router.maybe_check_health()
+        ttl = parse_keep_alive(self.keep_alive)
+        results = {}
+
+        for model in dict.fromkeys(models):
+            loaded = False
+            for backend in self.client.router.backends:
+                if not backend.healthy:
+                    continue
+
+                key = (backend.url, model)
+                if not force and self._warm_until.get(key, 0) > time.time():
+                    loaded = True
+                    continue
+
+                start = time.time()
+                if self._post(backend.url, model, self.keep_alive):
+                    loaded = True
+                    until = float('inf') if ttl is None else time.time() + max(0, ttl - self.REFRESH_MARGIN)
+                    with self._lock:
+                        self._warm_until[key] = until
+                    logger.info(f"🔥 Model yüklendi: {model} @ {backend.url} ({time.time() - start:.1f}s)")
+
+            results[model] = loaded
+
+        return results
+
+    def cool_down(self, models: List[str], idle_keep_alive="0") -> int:
+        """
+        Kuyruk boşken modelleri bırak
+
+        Args:
+            models: Model adları
+            idle_keep_alive: Yeni keep_alive ("0" = hemen bellekten çıkar)
+
+        Returns:
+            int: İstek gönderilen backend × model sayısı
+        """
+        count = 0
+        for model in dict.fromkeys(models):
+            for backend in self.client.router.backends:
+                if backend.healthy and self._post(backend.url, model, idle_keep_alive):
+                    count += 1
+                with self._lock:
+                    self._warm_until.pop((backend.url, model), None)
+
+        if count:
+            logger.info(f"❄️ Kuyruk boş, modeller bırakıldı (keep_alive={idle_keep_alive}): {', '.join(dict.fromkeys(models))}")
+        return count
+
+
+# Router → warm-up durumu (aynı süreçteki tüm servisler paylaşır)
+_warmups: Dict[int, ModelWarmup] = {}
+_warmups_lock = threading.Lock()
+
+
+def get_model_warmup(client, keep_alive, load_timeout: float = 600) -> ModelWarmup:
+    """
+    İstemcinin router'ına ait paylaşılan warm-up durumunu döndür
+
+    Args:
+        client: OllamaClient
+        keep_alive: Isıtma keep_alive değeri (sadece ilk oluşturmada kullanılır)
+        load_timeout: Model yükleme timeout'u
+    """
+    key = id(client.router)
+    with _warmups_lock:
+        if key not in _warmups:
+            _warmups[key] = ModelWarmup(client, keep_alive, load_timeout=load_timeout)
+        return _warmups[key]
@@ -3,10 +3,15 @@ OCR servisi - PDF ve görsel belgelerden metin çıkarma
 """
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
 import warnings
 import pypdf
 
+from app.config import settings
+from app.models.extraction_profiles import ExtractionProfile
+from app.models.ocr_result import OCRPage, summarize_pages
+from app.services.image_preprocessor import ImagePreprocessor, PreprocessOptions
+
 # PyPDF/PyMuPDF uyarılarını bastır (hatalı PDF formatları için)
 warnings.filterwarnings("ignore", message="Multiple definitions in dictionary")
 warnings.filterwarnings("ignore", category=pypdf.errors.PdfReadWarning)
@@ -20,12 +25,13 @@ class OCRService:
     def __init__(self):
         self.supported_formats = {'.pdf', '.docx', '.doc', '.jpg', '.jpeg', '.png'}
 
-    def extract_text_from_pdf(self, file_path: Path) -> str:
+    def extract_text_from_pdf(self, file_path: Path, profile: Optional[ExtractionProfile] = None) -> str:
         """
         PDF'den metin çıkar
 
         Args:
             file_path: PDF dosya yolu
+            profile: Belge tipi çıkarma profili (sayfa sınırı, erken durma)
 
         Returns:
             Çıkarılan metin
@@ -40,6 +46,11 @@ class OCRService:
                 logger.info(f"PDF okunuyor: {num_pages} sayfa")
 
                 for page_num in range(num_pages):
+                    # Profil sayfa sınırı
+                    if profile and not profile.page_allowed(page_num + 1):
+                        logger.info(f"📄 Profil sayfa sınırı: {page_num}/{num_pages} sayfa okundu")
+                        break
+
                     page = pdf_reader.pages[page_num]
                     text = page.extract_text()
 
@@ -47,6 +58,11 @@ class OCRService:
                         text_content.append(f"\n=== Sayfa {page_num + 1} ===\n")
                         text_content.append(text)
 
+                    # Erken durma: gerekli anchor'lar bulundu
+                    if profile and profile.anchors_found('\n'.join(text_content)):
+                        logger.info(f"🎯 Anchor'lar bulundu, sayfa {page_num + 1}/{num_pages} sonrası okunmayacak")
+                        break
+
             full_text = '\n'.join(text_content)
             logger.info(f"PDF'den {len(full_text)} karakter metin çıkarıldı")
 
@@ -95,12 +111,38 @@ class OCRService:
             logger.warning("python-docx bulunamadı, boş metin dönüyorum")
             return ""
 
-    def extract_text(self, file_path: Path) -> str:
+    def extract_document(self, file_path: Path, profile: Optional[ExtractionProfile] = None) -> Dict[str, Any]:
+        """
+        Metni yapılandırılmış OCR sonuçlarıyla birlikte çıkar
+
+        Args:
+            file_path: Dosya yolu
+            profile: Belge tipi çıkarma profili (sadece PDF için)
+
+        Returns:
+            {
+                'text': str,
+                'pages': List[OCRPage] (sadece görsel OCR'da dolu),
+                'ocr_stats': Dict veya None (summarize_pages çıktısı)
+            }
+        """
+        if file_path.suffix.lower() in ['.jpg', '.jpeg', '.png', '.bmp']:
+            pages = self.extract_pages_from_image(file_path)
+            return {
+                'text': '\n'.join(page.text for page in pages),
+                'pages': pages,
+                'ocr_stats': summarize_pages(pages),
+            }
+
+        return {'text': self.extract_text(file_path, profile=profile), 'pages': [], 'ocr_stats': None}
+
+    def extract_text(self, file_path: Path, profile: Optional[ExtractionProfile] = None) -> str:
         """
         Dosya tipine göre metin çıkar
 
         Args:
             file_path: Dosya yolu
+            profile: Belge tipi çıkarma profili (sadece PDF için)
 
         Returns:
             Çıkarılan metin
@@ -108,7 +150,7 @@ class OCRService:
         extension = file_path.suffix.lower()
 
         if extension == '.pdf':
-            return self.extract_text_from_pdf(file_path)
+            return self.extract_text_from_pdf(file_path, profile=profile)
         elif extension in ['.docx', '.doc']:
             return self.extract_text_from_docx(file_path)
         elif extension in ['.jpg', '.jpeg', '.png', '.bmp']:
@@ -124,30 +166,65 @@ class OCRService:
 
         Not: EasyOCR kurulumu gerekiyor
         """
+        pages = self.extract_pages_from_image(file_path)
+        return '\n'.join(page.text for page in pages)
+
+    @staticmethod
+    def _get_reader():
+        """EasyOCR reader (singleton - model yükleme pahalı)"""
+        import easyocr
+
+        if not hasattr(OCRService, '_reader'):
+            OCRService._reader = easyocr.Reader(settings.OCR_LANGUAGES, gpu=settings.OCR_GPU)
+        return OCRService._reader
+
+    @staticmethod
+    def _prepare_ocr_input(file_path: Path):
+        """
+        Görseli OCR için ön işle (kapalıysa / hata olursa ham görsel)
+
+        Returns:
+            np.ndarray veya dosya yolu: readtext'e verilecek girdi
+        """
+        if not settings.OCR_PREPROCESS_ENABLED:
+            return str(file_path)
+
         try:
-            import easyocr
+            from PIL import Image
 
-            reader = easyocr.Reader(['tr', 'en'], gpu=False)
-            logger.info(f"OCR başlatılıyor: {file_path}")
+            with Image.open(file_path) as image:
+                return ImagePreprocessor.preprocess(
+                    image.convert('RGB'),
+                    PreprocessOptions(binarize=settings.OCR_PREPROCESS_BINARIZE)
+                )
+        except Exception as e:
+            logger.warning(f"Görsel ön işleme hatası, ham görsel kullanılacak: {e}")
+            return str(file_path)
 
-            result = reader.readtext(str(file_path))
+    def extract_pages_from_image(self, file_path: Path) -> List[OCRPage]:
+        """
+        Görsel dosyadan OCR ile satır, kutu ve güven skorlarını çıkar
 
-            text_content = []
-            for detection in result:
-                text = detection[1]
-                text_content.append(text)
+        Returns:
+            Tek elemanlı OCRPage listesi (OCR yapılamazsa boş liste)
+        """
+        try:
+            reader = self._get_reader()
+            logger.info(f"OCR başlatılıyor: {file_path}")
 
-            full_text = '\n'.join(text_content)
-            logger.info(f"OCR'den {len(full_text)} karakter metin çıkarıldı")
+            result = reader.readtext(self._prepare_ocr_input(file_path))
+            page = OCRPage.from_detections(1, result, source='ocr')
 
-            return full_text
+            logger.info(f"OCR'den {len(page.text)} karakter metin çıkarıldı (güven: {page.mean_confidence:.2f})")
+
+            return [page]
 
         except ImportError:
             logger.warning("EasyOCR kurulu değil, görsel OCR yapılamıyor")
-            return ""
+            return []
         except Exception as e:
             logger.error(f"OCR hatası: {str(e)}")
-            return ""
+            return []
 
     def clean_text(self, text: str) -> str:
         """
@@ -0,0 +1,497 @@
+"""
+Ortak Ollama HTTP istemcisi
+
+CLI (services/ollama_service.py) ve API (app/services/ollama_service.py)
+servisleri Ollama'ya bu sınıf üzerinden gider; bağlantı havuzu, retry
+politikası, stream/erken sonlandırma ve yanıt cache'i tek yerde tutulur.
+
+Bağlantı havuzu: süreç genelinde tek requests.Session, HTTPAdapter havuz
+boyutu eşzamanlılığa göre ayarlanır. Tüm OllamaService / analyzer
+instance'ları aynı keep-alive bağlantılarını kullanır; her chunk'ta TCP/TLS
+kurulumu ödenmez.
+
+Birden fazla backend verilirse istekler OllamaRouter ile en az yüklü
+sağlıklı backend'e dağıtılır; hata veren backend'de retry başka bir
+backend'e gider.
+
+Ollama tamamen erişilemezse süreç geneli devre kesici açılır ve çağrılar
+LLMUnavailableError ile hemen düşer; retry'lar ayrıca trafiğe oranlı bir
+bütçeyle sınırlıdır (bkz. circuit_breaker.py).
+
+Zamanlayıcı verilirse her deneme önce öncelik sınıfına göre bir slot
+bekler (interactive / deadline / backfill, bkz. llm_scheduler.py); cache
+isabetleri sıraya girmez.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+from app.services.circuit_breaker import (
+    CircuitBreaker,
+    LLMUnavailableError,
+    get_circuit_breaker,
+    get_retry_budget,
+)
+from app.services.llm_cache import LLMResponseCache
+from app.services.llm_scheduler import LLMScheduler
+from app.services.ollama_router import get_ollama_router
+from app.services.ollama_stream import stream_generate
+
+# verify=False kullanan proxy kurulumları için uyarıları sustur
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+logger = logging.getLogger(__name__)
+
+
+def extract_usage(result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Ollama yanıtındaki token / süre sayaçları (süreler ns → sn)
+
+    Cache'ten gelen yanıtta sayaçlar ilk çağrıya aittir, model bu çağrıda
+    çalışmadı; erken kesilen stream'de Ollama sayaç göndermez: None döner.
+    Yanıtta olmayan sayaç (ör. prompt tamamen KV cache'ten geldiğinde
+    prompt_eval_count) 0 değil None kalır.
+
+    Returns:
+        Dict: prompt_tokens, eval_tokens, prompt_s, eval_s, load_s, total_s
+    """
+    if not result or result.get("cached"):
+        return None
+    if result.get("eval_count") is None and result.get("prompt_eval_count") is None:
+        return None
+
+    def seconds(name: str) -> Optional[float]:
+        value = result.get(name)
+        return value / 1e9 if value is not None else None
+
+    return {
+        "prompt_tokens": result.get("prompt_eval_count"),
+        "eval_tokens": result.get("eval_count"),
+        "prompt_s": seconds("prompt_eval_duration"),
+        "eval_s": seconds("eval_duration"),
+        "load_s": seconds("load_duration"),
+        "total_s": seconds("total_duration"),
+    }
+
+
+def usage_breakdown(
+    prompt_tokens: int,
+    eval_tokens: int,
+    prompt_s: float,
+    eval_s: float,
+    load_s: float
+) -> Dict[str, Any]:
+    """
+    Toplam sayaçlardan token/sn ve prompt-üretim süre payları
+
+    Ayar yaparken darboğazı gösterir: prompt_share yüksekse prompt-bound
+    (chunk boyutu / prefix cache), düşükse generation-bound (çıktı şeması,
+    num_predict).
+    """
+    prompt_s = prompt_s or 0.0
+    eval_s = eval_s or 0.0
+    load_s = load_s or 0.0
+    model_s = prompt_s + eval_s + load_s
+    return {
+        "prompt_tokens": prompt_tokens or 0,
+        "eval_tokens": eval_tokens or 0,
+        "prompt_seconds": round(prompt_s, 3),
+        "eval_seconds": round(eval_s, 3),
+        "load_seconds": round(load_s, 3),
+        "prompt_tokens_per_sec": round((prompt_tokens or 0) / prompt_s, 1) if prompt_s else None,
+        "eval_tokens_per_sec": round((eval_tokens or 0) / eval_s, 1) if eval_s else None,
+        "prompt_share": round(prompt_s / model_s, 3) if model_s else None,
+        "eval_share": round(eval_s / model_s, 3) if model_s else None,
+        "load_share": round(load_s / model_s, 3) if model_s else None,
+        "bound": ("prompt" if prompt_s >= eval_s else "generation") if model_s else None,
+    }
+
+
+class LLMCallStats:
+    """
+    Süreç geneli LLM çağrı sayaçları
+
+    Structured output / prompt değişikliklerinin etkisini toplu
+    çalıştırmalar arasında karşılaştırmak için: çağrı, retry, hata,
+    JSON parse hatası, devre kesicinin reddettiği çağrı ve token sayıları.
+    Son `window` çağrının token / süre sayaçları ayrıca kayan pencerede
+    tutulur (anlık token/sn).
+    """
+
+    def __init__(self, window: int = 200):
+        self._lock = threading.Lock()
+        self._window: deque = deque(maxlen=window)
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.cache_hits = 0
+        self.retries = 0
+        self.failures = 0
+        self.parse_failures = 0
+        self.rejected = 0
+        self.output_tokens = 0
+        self.prompt_tokens = 0
+        self.prompt_seconds = 0.0
+        self.eval_seconds = 0.0
+        self.load_seconds = 0.0
+        self.structured_calls = 0
+        self._window.clear()
+
+    def add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def add_usage(self, usage: Optional[Dict[str, Any]]):
+        """Tek çağrının token / süre sayaçlarını topla ve pencereye ekle"""
+        if not usage:
+            return
+        with self._lock:
+            self.prompt_tokens += usage["prompt_tokens"] or 0
+            self.prompt_seconds += usage["prompt_s"] or 0.0
+            self.eval_seconds += usage["eval_s"] or 0.0
+            self.load_seconds += usage["load_s"] or 0.0
+            self._window.append(usage)
+
+    def rolling(self) -> Dict[str, Any]:
+        """Son çağrılar penceresinde token/sn ve prompt-üretim payları"""
+        with self._lock:
+            window = list(self._window)
+        breakdown = usage_breakdown(
+            sum(u["prompt_tokens"] or 0 for u in window),
+            sum(u["eval_tokens"] or 0 for u in window),
+            sum(u["prompt_s"] or 0.0 for u in window),
+            sum(u["eval_s"] or 0.0 for u in window),
+            sum(u["load_s"] or 0.0 for u in window),
+        )
+        breakdown["window_calls"] = len(window)
+        return breakdown
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            totals = {
+                'calls': self.calls,
+                'cache_hits': self.cache_hits,
+                'retries': self.retries,
+                'failures': self.failures,
+                'parse_failures': self.parse_failures,
+                'parse_failure_rate': self.parse_failures / self.calls if self.calls else 0.0,
+                'rejected': self.rejected,
+                'output_tokens': self.output_tokens,
+                'avg_output_tokens': self.output_tokens / self.calls if self.calls else 0.0,
+                'prompt_tokens': self.prompt_tokens,
+                'avg_prompt_tokens': self.prompt_tokens / self.calls if self.calls else 0.0,
+                'structured_calls': self.structured_calls,
+                'usage': usage_breakdown(
+                    self.prompt_tokens, self.output_tokens,
+                    self.prompt_seconds, self.eval_seconds, self.load_seconds
+                ),
+            }
+        totals['rolling'] = self.rolling()
+        return totals
+
+
+llm_stats = LLMCallStats()
+
+
+_session: Optional[requests.Session] = None
+_session_pool_size = 0
+_session_lock = threading.Lock()
+
+
+_session_pool_hosts = 0
+
+
+def get_http_session(pool_size: int = 10, pool_hosts: int = 4) -> requests.Session:
+    """
+    Paylaşılan HTTP session'ı döndür
+
+    Daha büyük havuz isteyen ilk çağrıda adapter yeniden mount edilir;
+    mevcut bağlantılar bozulmaz.
+
+    Args:
+        pool_size: Host başına maksimum açık bağlantı
+        pool_hosts: Bağlantıları saklanan host sayısı (backend sayısı)
+    """
+    global _session, _session_pool_size, _session_pool_hosts
+
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+
+        if pool_size > _session_pool_size or pool_hosts > _session_pool_hosts:
+            pool_size = max(pool_size, _session_pool_size)
+            pool_hosts = max(pool_hosts, _session_pool_hosts)
+            adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_size, pool_block=False)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+            _session_pool_size = pool_size
+            _session_pool_hosts = pool_hosts
+            logger.debug(f"Ollama HTTP havuzu: {pool_size} bağlantı")
+
+        return _session
+
+
+class OllamaClient:
+    """Ollama /api/generate ve /api/tags için ortak istemci"""
+
+    # Bu HTTP kodlarında tekrar denenir (proxy / yük dengeleyici hataları)
+    RETRYABLE_STATUS = {502, 503, 504}
+
+    # Yanıtı etkilemeyen istek alanları (cache anahtarına girmez)
+    TRANSPORT_FIELDS = ("stream", "keep_alive")
+
+    def __init__(
+        self,
+        base_url: Union[str, List[str]],
+        timeout: float,
+        max_retries: int = 3,
+        retry_delay: float = 2.0,
+        verify: bool = True,
+        pool_size: int = 10,
+        stream: bool = True,
+        cache: Optional[LLMResponseCache] = None,
+        health_interval: float = 30.0,
+        breaker_threshold: int = 5,
+        breaker_reset_seconds: float = 60.0,
+        retry_budget_ratio: float = 0.2,
+        retry_budget_min: int = 3,
+        scheduler: Optional[LLMScheduler] = None
+    ):
+        """
+        Args:
+            base_url: Ollama adresi (http://host:11434) veya backend listesi
+            timeout: İstek timeout'u (sn)
+            max_retries: Toplam deneme sayısı
+            retry_delay: Exponential backoff taban süresi (sn)
+            verify: SSL sertifika doğrulaması
+            pool_size: Paylaşılan bağlantı havuzu boyutu
+            stream: Stream + JSON tamamlanınca erken sonlandırma
+            cache: Yanıt cache'i (None = cache yok)
+            health_interval: Backend sağlık kontrolü aralığı (sn)
+            breaker_threshold: Devreyi açan üst üste başarısız deneme sayısı
+            breaker_reset_seconds: Açık devrenin deneme isteğine izin vermesi için süre
+            retry_budget_ratio: Retry / istek oranı üst sınırı (kayan pencere)
+            retry_budget_min: Düşük trafikte pencere başına izin verilen retry
+            scheduler: Öncelikli istek zamanlayıcı (None = sırasız, eskisi gibi)
+        """
+        urls = [base_url] if isinstance(base_url, str) else list(base_url)
+        self.base_url = urls[0].rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max(1, max_retries)
+        self.retry_delay = retry_delay
+        self.verify = verify
+        self.stream = stream
+        self.cache = cache
+        self.session = get_http_session(pool_size, pool_hosts=max(4, len(urls)))
+        self.router = get_ollama_router(
+            urls, self.session, health_interval=health_interval, verify=verify
+        )
+        # Half-open'da bekleyen çağrılar en fazla deneme isteğinin süresi kadar bekler
+        self.breaker = get_circuit_breaker(
+            urls, failure_threshold=breaker_threshold, reset_timeout=breaker_reset_seconds,
+            probe_timeout=timeout * 2
+        )
+        self.retry_budget = get_retry_budget(
+            urls, ratio=retry_budget_ratio, min_retries=retry_budget_min
+        )
+        self.scheduler = scheduler
+
+    def generate(
+        self,
+        payload: Dict[str, Any],
+        use_cache: bool = True,
+        max_retries: Optional[int] = None,
+        cache_if: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> Dict[str, Any]:
+        """
+        /api/generate çağrısı (cache → stream/normal istek → retry)
+
+        Args:
+            payload: model, prompt, system, options, format, images
+            use_cache: False ise cache okunmaz (yanıt yine yazılır)
+            max_retries: Bu çağrı için deneme sayısı (None = varsayılan)
+            cache_if: Yanıt cache'e yazılmadan önce çağrılır, False dönerse
+                yazılmaz (ör. JSON ayrıştırılamayan / kesik çıktı TTL boyunca
+                tekrar oynatılmasın). None = her başarılı yanıt yazılır
+
+        Returns:
+            Ollama yanıtı + 'duration', stream'de 'ttft' / 'early_stop',
+            cache'ten geldiyse 'cached': True
+
+        Raises:
+            LLMUnavailableError: Devre açık, istek gönderilmedi
+            requests.RequestException: Tüm denemeler başarısız / retry bütçesi tükendi
+        """
+        start_time = time.time()
+
+        # Cache kontrolü (stream / keep_alive gibi taşıma alanları anahtara dahil değil)
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(
+                {k: v for k, v in payload.items() if k not in self.TRANSPORT_FIELDS}
+            )
+            if use_cache:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    duration = time.time() - start_time
+                    logger.info(f"⚡ Ollama cache hit: {payload.get('model')} ({duration * 1000:.1f}ms)")
+                    llm_stats.add(cache_hits=1)
+                    return {**cached, "duration": duration, "cached": True}
+
+        try:
+            self.breaker.before_call()
+        except LLMUnavailableError:
+            llm_stats.add(rejected=1)
+            raise
+        self.retry_budget.record_request()
+
+        attempts = max(1, max_retries or self.max_retries)
+
+        # Aynı model + sistem promptu mümkünse aynı backend'e (KV cache'te prefix'i var)
+        affinity = f"{payload.get('model')}|{hash(payload.get('system', ''))}"
+
+        for attempt in range(attempts):
+            try:
+                # Slot her denemede ayrı alınır: backoff beklemesi slotu tutmaz
+                with self.scheduler.slot() if self.scheduler else nullcontext(), \
+                        self.router.acquire(payload.get("model"), affinity=affinity) as backend:
+                    try:
+                        result = self._post_generate(backend.url, payload)
+                    except (requests.Timeout, requests.ConnectionError) as e:
+                        self.router.report_failure(backend, type(e).__name__)
+                        raise
+                    except requests.HTTPError as e:
+                        if e.response is not None and e.response.status_code in self.RETRYABLE_STATUS:
+                            self.router.report_failure(backend, f"HTTP {e.response.status_code}")
+                        raise
+                self.breaker.record_success()
+                result["backend"] = backend.url
+                result["duration"] = time.time() - start_time
+                llm_stats.add(
+                    calls=1,
+                    # Erken kesilen stream'de Ollama sayacı yok: alınan token satırları
+                    output_tokens=result.get("eval_count") or result.get("stream_tokens") or 0,
+                    structured_calls=1 if isinstance(payload.get("format"), dict) else 0
+                )
+                llm_stats.add_usage(extract_usage(result))
+
+                # Context token listesi büyük ve tekrar kullanılmıyor, cache'e yazılmaz
+                if cache_key is not None and self._cacheable(result, cache_if):
+                    self.cache.set(
+                        cache_key,
+                        {k: v for k, v in result.items() if k not in ("context", "duration", "backend")},
+                        model=result.get("model")
+                    )
+                return result
+
+            except (requests.Timeout, requests.ConnectionError) as e:
+                logger.error(
+                    f"Ollama bağlantı hatası ({type(e).__name__}, {backend.url}) - deneme {attempt + 1}/{attempts}"
+                )
+                error = e
+
+            except requests.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                if status not in self.RETRYABLE_STATUS:
+                    # Ollama yanıt verdi: hata isteğe ait, devreyi etkilemez
+                    self.breaker.record_success()
+                    logger.error(f"Ollama HTTP error: {status}")
+                    if e.response is not None:
+                        logger.error(f"Response: {e.response.text[:500]}")
+                    llm_stats.add(failures=1)
+                    raise
+                logger.warning(f"Ollama HTTP {status} ({backend.url}) - deneme {attempt + 1}/{attempts}")
+                error = e
+
+            except Exception:
+                # Beklenmeyen hata (yanıt ayrıştırma vb.): half-open denemesini serbest bırak
+                self.breaker.release_probe()
+                raise
+
+            self.breaker.record_failure()
+
+            if attempt == attempts - 1:
+                llm_stats.add(failures=1)
+                raise error
+
+            if self.breaker.state != CircuitBreaker.CLOSED:
+                # Bu veya başka bir thread'in hataları devreyi açtı: retry anlamsız
+                llm_stats.add(failures=1)
+                raise error
+
+            if not self.retry_budget.try_acquire():
+                logger.warning(
+                    f"⚠️ Ollama retry bütçesi tükendi, tekrar denenmeyecek "
+                    f"(son {self.retry_budget.window_seconds:.0f}s: {self.retry_budget.to_dict()['window_retries']} retry)"
+                )
+                llm_stats.add(failures=1)
+                raise error
+
+            # Exponential backoff
+            llm_stats.add(retries=1)
+            time.sleep(min(self.retry_delay * (2 ** attempt), 30))
+
+    @staticmethod
+    def _cacheable(result: Dict[str, Any], cache_if: Optional[Callable[[Dict[str, Any]], bool]]) -> bool:
+        """Yanıt cache'e yazılabilir mi? (doğrulayıcı hata verirse yazılmaz)"""
+        if cache_if is None:
+            return True
+        try:
+            if cache_if(result):
+                return True
+        except Exception:
+            pass
+        logger.debug(f"Yanıt doğrulanamadı, cache'e yazılmadı ({result.get('model')})")
+        return False
+
+    def _post_generate(self, backend_url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Tek HTTP denemesi"""
+        generate_url = f"{backend_url}/api/generate"
+
+        if self.stream:
+            # JSON kapanınca bağlantı kapatılır, kalan üretim beklenmez
+            return stream_generate(
+                self.session, generate_url, payload, self.timeout, verify=self.verify
+            )
+
+        response = self.session.post(
+            generate_url,
+            json={**payload, "stream": False},
+            timeout=self.timeout,
+            verify=self.verify
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def tags(self, timeout: float = 10) -> Dict[str, Any]:
+        """
+        /api/tags - yüklü modeller (en az yüklü sağlıklı backend'den)
+
+        Raises:
+            requests.RequestException: Erişilemezse
+        """
+        with self.router.acquire() as backend:
+            try:
+                response = self.session.get(f"{backend.url}/api/tags", timeout=timeout, verify=self.verify)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                self.router.report_failure(backend, type(e).__name__)
+                raise
+            return response.json()
+
+    def backend_status(self) -> List[Dict[str, Any]]:
+        """Backend sağlık / yük durumları"""
+        return self.router.status()
+
+    def breaker_status(self) -> Dict[str, Any]:
+        """Devre kesici ve retry bütçesi durumu"""
+        return {**self.breaker.to_dict(), 'retry_budget': self.retry_budget.to_dict()}
@@ -0,0 +1,245 @@
+"""
+Çoklu Ollama backend yönlendirici
+
+Birden fazla Ollama makinesi tek bir havuz gibi kullanılır:
+
+- Her istek, istenen modeli /api/tags'te listeleyen sağlıklı backend'ler
+  arasında o anda en az işteki (in-flight) backend'e gider
+- /api/tags periyodik olarak sorgulanır (istek yolunda, en fazla bir thread)
+- Üst üste bağlantı hatası veren backend havuzdan çıkarılır; sonraki
+  sağlık kontrolünde cevap verirse otomatik olarak geri alınır
+- Aynı prompt prefix'ine sahip istekler (affinity), yükü en az olandan
+  en fazla bir fazla olduğu sürece aynı backend'e gider; prefix o
+  backend'in KV cache'inde hazırdır
+
+Tek backend tanımlıysa davranış eskisiyle aynıdır (her istek ona gider).
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OllamaBackend:
+    """Tek Ollama sunucusunun durumu"""
+    url: str
+    healthy: bool = True
+    in_flight: int = 0
+    failures: int = 0  # Üst üste başarısız istek / sağlık kontrolü
+    models: Set[str] = field(default_factory=set)
+    last_check: float = 0.0
+    total_requests: int = 0
+
+    def has_model(self, model: Optional[str]) -> bool:
+        """Model bu backend'de var mı? (model listesi henüz bilinmiyorsa True)"""
+        if not model or not self.models:
+            return True
+        return model in self.models or f"{model}:latest" in self.models
+
+    def to_dict(self) -> Dict:
+        return {
+            'url': self.url,
+            'healthy': self.healthy,
+            'in_flight': self.in_flight,
+            'failures': self.failures,
+            'models': sorted(self.models),
+            'total_requests': self.total_requests,
+        }
+
+
+class OllamaRouter:
+    """En az yüklü backend seçimi + sağlık kontrolü"""
+
+    # Bu kadar üst üste hatada backend havuzdan çıkarılır
+    EJECT_AFTER_FAILURES = 2
+
+    # Hatırlanan affinity anahtarı sayısı
+    MAX_AFFINITY_KEYS = 256
+
+    def __init__(
+        self,
+        urls: List[str],
+        session: requests.Session,
+        health_interval: float = 30.0,
+        verify: bool = True,
+        health_timeout: float = 5.0
+    ):
+        """
+        Args:
+            urls: Backend adresleri (http://host:11434)
+            session: Paylaşılan HTTP session
+            health_interval: /api/tags kontrol aralığı (sn)
+            verify: SSL sertifika doğrulaması
+            health_timeout: Sağlık kontrolü timeout'u (sn)
+        """
+        if not urls:
+            raise ValueError("En az bir Ollama backend tanımlanmalı")
+
+        self.backends = [OllamaBackend(url=url.rstrip('/')) for url in urls]
+        self.session = session
+        self.health_interval = health_interval
+        self.verify = verify
+        self.health_timeout = health_timeout
+
+        self._affinity: "OrderedDict[str, OllamaBackend]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._health_lock = threading.Lock()
+        self._last_health_check = 0.0
+
+    # ------------------------------------------------------------------
+    # Seçim
+    # ------------------------------------------------------------------
+
+    def _select(self, model: Optional[str], affinity: Optional[str] = None) -> OllamaBackend:
+        """En az in-flight isteği olan uygun backend (lock altında)"""
+        candidates = [b for b in self.backends if b.healthy and b.has_model(model)]
+
+        if not candidates:
+            # Model hiçbir sağlıklı backend'de listelenmiyor: Ollama isteği
+            # yine karşılayabilir (pull / yeni yüklenmiş model)
+            candidates = [b for b in self.backends if b.healthy]
+
+        if not candidates:
+            # Hepsi çıkarılmış: sağlık kontrolü beklenmeden hepsi denenir
+            candidates = self.backends
+
+        # Eşitlikte daha az istek almış olan (round-robin etkisi)
+        best = min(candidates, key=lambda b: (b.in_flight, b.total_requests))
+
+        if affinity is None or len(self.backends) == 1:
+            return best
+
+        preferred = self._affinity.get(affinity)
+        if preferred in candidates and preferred.in_flight <= best.in_flight + 1:
+            self._affinity.move_to_end(affinity)
+            return preferred
+
+        if preferred is None or preferred not in candidates:
+            self._affinity[affinity] = best
+            if len(self._affinity) > self.MAX_AFFINITY_KEYS:
+                self._affinity.popitem(last=False)
+        return best
+
+    @contextmanager
+    def acquire(self, model: Optional[str] = None, affinity: Optional[str] = None) -> Iterator[OllamaBackend]:
+        """
+        İstek süresince bir backend ayır
+
+        Kullanım:
+            with router.acquire(model) as backend:
+                session.post(f"{backend.url}/api/generate", ...)
+
+        Bağlantı hataları ve 5xx yanıtlarda report_failure çağrılmalı;
+        blok hatasız biterse backend'in hata sayacı sıfırlanır.
+
+        Args:
+            model: İstenen model (bu modeli listeleyen backend'ler tercih edilir)
+            affinity: Prompt prefix anahtarı (aynı anahtar aynı backend'e)
+        """
+        self.maybe_check_health()
+
+        with self._lock:
+            backend = self._select(model, affinity)
+            backend.in_flight += 1
+            backend.total_requests += 1
+
+        ok = False
+        try:
+            yield backend
+            ok = True
+        finally:
+            with self._lock:
+                backend.in_flight -= 1
+                if ok:
+                    backend.failures = 0
+
+    def report_failure(self, backend: OllamaBackend, reason: str = ""):
+        """İstek hatası bildir, eşik aşılırsa backend'i havuzdan çıkar"""
+        with self._lock:
+            backend.failures += 1
+            if backend.healthy and backend.failures >= self.EJECT_AFTER_FAILURES:
+                backend.healthy = False
+                logger.warning(f"⛔ Ollama backend havuzdan çıkarıldı: {backend.url} ({reason})")
+
+    # ------------------------------------------------------------------
+    # Sağlık kontrolü
+    # ------------------------------------------------------------------
+
+    def maybe_check_health(self):
+        """Aralık dolduysa sağlık kontrolü yap (aynı anda tek thread)"""
+        if time.time() - self._last_health_check < self.health_interval:
+            return
+        if not self._health_lock.acquire(blocking=False):
+            return
+        try:
+            self._check_all()
+        finally:
+            self._health_lock.release()
+
+    def check_health(self) -> List[Dict]:
+        """Tüm backend'leri hemen kontrol et"""
+        with self._health_lock:
+            self._check_all()
+        return self.status()
+
+    def _check_all(self):
+        for backend in self.backends:
+            self._check_backend(backend)
+        self._last_health_check = time.time()
+
+    def _check_backend(self, backend: OllamaBackend):
+        """/api/tags ile model listesini güncelle, ejection / re-admission"""
+        try:
+            response = self.session.get(
+                f"{backend.url}/api/tags", timeout=self.health_timeout, verify=self.verify
+            )
+            response.raise_for_status()
+            models = {m.get('name') for m in response.json().get('models', []) if m.get('name')}
+        except Exception as e:
+            self.report_failure(backend, f"sağlık kontrolü: {type(e).__name__}")
+            backend.last_check = time.time()
+            return
+
+        with self._lock:
+            if not backend.healthy:
+                logger.info(f"✅ Ollama backend havuza geri alındı: {backend.url}")
+            backend.healthy = True
+            backend.failures = 0
+            backend.models = models
+            backend.last_check = time.time()
+
+    def status(self) -> List[Dict]:
+        """Backend durumları (log / stats için)"""
+        with self._lock:
+            return [b.to_dict() for b in self.backends]
+
+
+# Backend listesi → router (aynı süreçteki tüm istemciler in-flight sayacını paylaşır)
+_routers: Dict[Tuple[str, ...], OllamaRouter] = {}
+_routers_lock = threading.Lock()
+
+
+def get_ollama_router(urls: List[str], session: requests.Session, **kwargs) -> OllamaRouter:
+    """
+    Paylaşılan router instance'ını döndür
+
+    Args:
+        urls: Backend adresleri
+        session: Paylaşılan HTTP session
+        **kwargs: OllamaRouter parametreleri (sadece ilk oluşturmada kullanılır)
+    """
+    key = tuple(url.rstrip('/') for url in urls)
+    with _routers_lock:
+        if key not in _routers:
+            _routers[key] = OllamaRouter(list(key), session, **kwargs)
+            if len(key) > 1:
+                logger.info(f"Ollama router: {len(key)} backend ({', '.join(key)})")
+        return _routers[key]
@@ -1,15 +1,18 @@
 """
 Ollama LLM servisi
 """
-import requests
 import json
 import logging
-import urllib3
-from typing import Dict, Optional, List
+from typing import Any, Dict, Optional, List, Union
 from app.config import settings
-
-# SSL uyarılarını sustur
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from app.services.llm_cache import get_llm_cache
+from app.services.llm_log_sink import get_llm_log_sink
+from app.services.llm_scheduler import get_llm_scheduler
+from app.services.ollama_client import OllamaClient, extract_usage, llm_stats
+from app.models.json_schema import get_output_format
+from app.services.model_warmup import get_model_warmup
+from app.services.token_counter import get_token_counter
+from app.prompts.batch_prompt import batch_key, build_batch_prompt, build_batch_schema, build_batch_section
 
 logger = logging.getLogger(__name__)
 
@@ -26,16 +29,61 @@ class OllamaService:
         self.base_url = (base_url or settings.OLLAMA_BASE_URL).rstrip('/')
         self.model = model or settings.OLLAMA_MODEL
         self.timeout = timeout or settings.OLLAMA_TIMEOUT
+        self.cache = get_llm_cache(
+            settings.LLM_CACHE_PATH,
+            ttl_seconds=settings.LLM_CACHE_TTL_HOURS * 3600,
+            max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+            max_bytes=settings.LLM_CACHE_MAX_MB * 1024 * 1024,
+            enabled=settings.LLM_CACHE_ENABLED
+        )
+        # Bağlantı havuzu, retry, stream ve cache CLI ile ortak istemcide
+        # base_url açıkça verilmediyse ayarlardaki backend listesi kullanılır
+        backends = settings.OLLAMA_BACKENDS if (base_url is None and settings.OLLAMA_BACKENDS) else [self.base_url]
+        self.client = OllamaClient(
+            backends,
+            timeout=self.timeout,
+            max_retries=settings.OLLAMA_MAX_RETRIES,
+            retry_delay=settings.OLLAMA_RETRY_DELAY,
+            verify=settings.OLLAMA_VERIFY_SSL,
+            pool_size=settings.OLLAMA_POOL_SIZE,
+            stream=settings.OLLAMA_STREAM,
+            cache=self.cache,
+            health_interval=settings.OLLAMA_HEALTH_INTERVAL,
+            breaker_threshold=settings.OLLAMA_BREAKER_THRESHOLD,
+            breaker_reset_seconds=settings.OLLAMA_BREAKER_RESET_SECONDS,
+            retry_budget_ratio=settings.OLLAMA_RETRY_BUDGET_RATIO,
+            retry_budget_min=settings.OLLAMA_RETRY_BUDGET_MIN,
+            scheduler=get_llm_scheduler(
+                backends,
+                shared_path=settings.LLM_SCHEDULER_SHARED_PATH or None,
+                lease_seconds=settings.LLM_SCHEDULER_LEASE_SECONDS,
+                slots=settings.LLM_SCHEDULER_SLOTS,
+                weights=settings.LLM_SCHEDULER_WEIGHTS,
+                caps=settings.LLM_SCHEDULER_CAPS
+            ) if settings.LLM_SCHEDULER_ENABLED else None
+        )
 
-        logger.info(f"Ollama initialized: {self.base_url} | Model: {self.model}")
+        self.token_counter = get_token_counter(self.model, client=self.client)
+        self.log_sink = get_llm_log_sink(
+            settings.LLM_LOG_DIR,
+            compress=settings.LLM_LOG_COMPRESS,
+            retention_days=settings.LLM_LOG_RETENTION_DAYS,
+            max_bytes=settings.LLM_LOG_MAX_MB * 1024 * 1024,
+            queue_size=settings.LLM_LOG_QUEUE_SIZE,
+            enabled=settings.LLM_LOG_ENABLED
+        )
+
+        logger.info(f"Ollama initialized: {', '.join(backends)} | Model: {self.model}")
 
     def generate(
         self,
         prompt: str,
         system: Optional[str] = None,
         temperature: float = 0.1,
-        format: str = "json",
-        max_retries: int = 2
+        format: Union[str, Dict[str, Any], None] = "json",
+        max_retries: int = None,
+        use_cache: bool = True,
+        options: Optional[Dict[str, Any]] = None
     ) -> Dict:
         """
         Ollama'dan yanıt al (retry mekanizması ile)
@@ -44,68 +92,71 @@ class OllamaService:
             prompt: User prompt
             system: System prompt
             temperature: 0.0-1.0 (düşük = deterministik)
-            format: "json" veya None
-            max_retries: Maksimum deneme sayısı
+            format: "json", JSON Schema (structured output) veya None
+            max_retries: Maksimum deneme sayısı (None = OLLAMA_MAX_RETRIES)
+            use_cache: False ise cache okunmaz (yanıt yine yazılır)
+            options: Ek Ollama seçenekleri (num_ctx, num_predict ...)
+
+        JSON istenen çağrılarda yanıt ancak extract_json ile ayrıştırılabiliyorsa
+        cache'e yazılır; bozuk / kesik çıktı TTL boyunca tekrar oynatılmaz.
 
         Returns:
             Dict with 'response' key
         """
-        url = f"{self.base_url}/api/generate"
-
         payload = {
             "model": self.model,
             "prompt": prompt,
-            "stream": False,
             "options": {
                 "temperature": temperature,
+                **(options or {}),
             }
         }
 
         if system:
             payload["system"] = system
 
-        if format == "json":
-            payload["format"] = "json"
+        if format == "json" or isinstance(format, dict):
+            payload["format"] = format
+
+        if settings.OLLAMA_KEEP_ALIVE:
+            payload["keep_alive"] = settings.OLLAMA_KEEP_ALIVE
 
         logger.info(f"Ollama request: {self.model}")
         logger.debug(f"Prompt length: {len(prompt)} chars")
 
-        # Retry loop
-        for attempt in range(max_retries):
-            try:
-                response = requests.post(
-                    url,
-                    json=payload,
-                    timeout=self.timeout,
-                    verify=False  # SSL doğrulamasını devre dışı bırak
+        try:
+            result = self.client.generate(
+                payload, use_cache=use_cache, max_retries=max_retries,
+                cache_if=self._is_json_response if "format" in payload else None
+            )
+        except Exception as e:
+            logger.error(f"Ollama error: {str(e)}")
+            raise
+
+        if not result.get("cached"):
+            if result.get("ttft") is not None:
+                logger.info(
+                    f"Ollama response received (ilk token: {result['ttft']:.2f}s"
+                    f"{', erken sonlandırıldı' if result.get('early_stop') else ''})"
                 )
-                response.raise_for_status()
-
-                result = response.json()
+            else:
                 logger.info(f"Ollama response received")
-                return result
 
-            except requests.Timeout:
-                logger.error(f"Ollama timeout ({self.timeout}s) - attempt {attempt + 1}/{max_retries}")
-                if attempt == max_retries - 1:
-                    raise
-                continue
+            if result.get("prompt_eval_duration") is not None:
+                logger.info(
+                    f"Prompt eval: {result.get('prompt_eval_count', 0)} token, "
+                    f"{result['prompt_eval_duration'] / 1e9:.2f}s"
+                )
 
-            except requests.HTTPError as e:
-                # 504 Gateway Timeout - retry
-                if e.response.status_code == 504:
-                    logger.warning(f"504 Gateway Timeout - attempt {attempt + 1}/{max_retries}")
-                    if attempt == max_retries - 1:
-                        raise
-                    continue
-                else:
-                    logger.error(f"Ollama HTTP error: {e.response.status_code}")
-                    logger.error(f"Response: {e.response.text[:500]}")
-                    raise
-
-            except Exception as e:
-                logger.error(f"Ollama error: {str(e)}")
-                raise
+        return result
+
+    def _is_json_response(self, result: Dict[str, Any]) -> bool:
+        """Yanıt extract_json ile ayrıştırılabiliyor mu?"""
+        try:
+            self.extract_json(result.get("response", ""))
+            return True
+        except ValueError:
+            return False
 
     def extract_json(self, response_text: str) -> Dict:
         """Yanıttan JSON çıkar"""
@@ -151,8 +202,6 @@ class OllamaService:
             Çıkarılan veriler
         """
         from app.prompts import PromptFactory
-        import os
-        from datetime import datetime
 
         # Factory'den uygun prompt al (başvuru türü ile)
         prompt_template = PromptFactory.create_prompt(document_type, basvuru_turu)
@@ -160,7 +209,8 @@ class OllamaService:
         if prompt_template:
             # Özelleştirilmiş prompt kullan
             system_prompt = prompt_template.get_system_prompt()
-            user_prompt = prompt_template.get_user_prompt(text, schema)
+            # Statik kısım (şema + talimatlar) önde: chunk'lar arası KV cache prefix'i
+            user_prompt = prompt_template.get_prefix_first_prompt(text, schema)
         else:
             # Fallback: Generic prompt
             logger.warning(f"Özel prompt bulunamadı: {document_type}, generic kullanılıyor")
@@ -171,9 +221,6 @@ Eğer bir bilgi belgede yoksa, null döndür."""
 
             user_prompt = f"""Aşağıdaki {document_type} belgesinden bilgileri çıkar ve verilen JSON şemasına göre döndür.
 
-BELGE METNİ:
-{text}
-
 JSON ŞEMA:
 {json.dumps(schema, indent=2, ensure_ascii=False)}
 
@@ -183,72 +230,188 @@ JSON ŞEMA:
 - Boş alanlar için null kullan
 - Türkçe karakterleri koru
 
+BELGE METNİ:
+{text}
+
 Yanıtını sadece JSON olarak ver, başka açıklama ekleme:"""
 
-        # LLM çağrısı
+        # LLM çağrısı: şema Ollama'ya format olarak verilir, çıktı şemaya göre sınırlanır
+        output_format = get_output_format(schema) if settings.OLLAMA_STRUCTURED_OUTPUT else "json"
         response = self.generate(
             prompt=user_prompt,
             system=system_prompt,
             temperature=0.1,
-            format="json"
+            format=output_format
         )
 
         # JSON çıkar
         response_text = response.get('response', '{}')
-        extracted_data = self.extract_json(response_text)
+        try:
+            extracted_data = self.extract_json(response_text)
+        except ValueError:
+            llm_stats.add(parse_failures=1)
+            raise
+
+        self._save_llm_log(
+            basvuru_id, document_type, basvuru_turu, system_prompt, user_prompt,
+            text, response_text, extracted_data, usage=extract_usage(response)
+        )
 
-        # ===== LOGLAMA SİSTEMİ =====
-        # llm_logs/{takip_no}/ klasörüne kaydet
+        return extracted_data
+
+    def extract_structured_batch(
+        self,
+        documents: List[Dict[str, Any]],
+        basvuru_turu: str = None,
+        basvuru_id: int = None
+    ) -> Dict[Any, Dict]:
+        """
+        Birden fazla küçük belgeden tek istekte yapılandırılmış veri çıkar
+
+        Birleşik şema belge_<id> anahtarlarından oluşur; yanıt bu
+        anahtarlara göre bölünür. Yanıtta olmayan / nesne olmayan belgeler
+        sonuçta yer almaz, çağıran bunları tek tek işlemelidir.
+
+        Args:
+            documents: belge_id, text, document_type, schema içeren liste
+            basvuru_turu: Başvuru türü (prompt seçimi için)
+            basvuru_id: Başvuru ID (loglama için)
+
+        Returns:
+            Dict: belge_id → çıkarılan veri
+
+        Raises:
+            ValueError: Yanıt JSON olarak ayrıştırılamadı
+        """
+        from app.prompts import PromptFactory
+
+        prepared = []
+        for doc in documents:
+            template = PromptFactory.create_prompt(doc["document_type"], basvuru_turu)
+            if template is None:
+                continue
+            prepared.append({**doc, "template": template})
+
+        if not prepared:
+            return {}
+
+        system_prompt, user_prompt = build_batch_prompt(prepared)
+        batch_schema = build_batch_schema(prepared)
+        output_format = get_output_format(batch_schema) if settings.OLLAMA_STRUCTURED_OUTPUT else "json"
+
+        response = self.generate(
+            prompt=user_prompt,
+            system=system_prompt,
+            temperature=0.1,
+            format=output_format,
+            options={"num_ctx": settings.LLM_BATCH_NUM_CTX}
+        )
+
+        response_text = response.get('response', '{}')
         try:
-            if basvuru_id:
-                log_dir = f"llm_logs/{basvuru_id}"
-            else:
-                log_dir = "llm_logs/genel"
-            os.makedirs(log_dir, exist_ok=True)
-
-            # Dosya adından / karakterini kaldır (özgeçmiş/cv → ozgecmis_cv)
-            safe_document_type = document_type.replace("/", "_").replace("\\", "_")
-
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-            log_filename = f"{log_dir}/{safe_document_type}_{timestamp}.json"
-
-            log_data = {
-                "timestamp": datetime.now().isoformat(),
-                "basvuru_id": basvuru_id,
-                "document_type": document_type,
-                "basvuru_turu": basvuru_turu,
-                "model": self.model,
-                "request": {
-                    "system_prompt": system_prompt,
-                    "user_prompt": user_prompt,
-                    "text_length": len(text),
-                    "text_preview": text[:500]  # İlk 500 karakter
-                },
-                "response": {
-                    "raw_text": response_text,
-                    "extracted_data": extracted_data,
-                    "response_length": len(response_text)
-                }
-            }
+            combined = self.extract_json(response_text)
+        except ValueError:
+            llm_stats.add(parse_failures=1)
+            raise
+
+        results = {}
+        for doc in prepared:
+            data = combined.get(batch_key(doc["belge_id"])) if isinstance(combined, dict) else None
+            if isinstance(data, dict):
+                results[doc["belge_id"]] = data
+
+        logger.info(
+            f"📦 Toplu çıkarım: {len(results)}/{len(prepared)} belge tek istekte "
+            f"({', '.join(doc['document_type'] for doc in prepared)})"
+        )
 
-            with open(log_filename, 'w', encoding='utf-8') as f:
-                json.dump(log_data, f, ensure_ascii=False, indent=2)
+        self._save_llm_log(
+            basvuru_id, "toplu", basvuru_turu, system_prompt, user_prompt,
+            "\n\n".join(doc["text"] for doc in prepared), response_text, combined,
+            usage=extract_usage(response)
+        )
 
-            logger.debug(f"LLM log kaydedildi: {log_filename}")
-        except Exception as e:
-            logger.warning(f"LLM log kaydedilemedi: {str(e)}")
-        # ===========================
+        return results
 
-        return extracted_data
+    def estimate_batch_tokens(self, belge_id: Any, document_type: str, text: str,
+                              schema: Dict, basvuru_turu: str = None) -> Optional[int]:
+        """
+        Belgenin toplu prompt'taki bölümünün tahmini token sayısı
+
+        Returns:
+            int: Token sayısı, belge tipinin prompt'u yoksa None
+        """
+        from app.prompts import PromptFactory
+
+        template = PromptFactory.create_prompt(document_type, basvuru_turu)
+        if template is None:
+            return None
+        return self.token_counter.count(build_batch_section(belge_id, document_type, text, template, schema))
+
+    def _save_llm_log(
+        self,
+        basvuru_id: Optional[int],
+        document_type: str,
+        basvuru_turu: Optional[str],
+        system_prompt: str,
+        user_prompt: str,
+        text: str,
+        response_text: str,
+        extracted_data: Any,
+        usage: Optional[Dict[str, Any]] = None
+    ):
+        """İstek / yanıt kaydını arka plan log sink'ine gönder (bloklamaz)"""
+        from datetime import datetime
+
+        self.log_sink.write({
+            "timestamp": datetime.now().isoformat(),
+            "basvuru_id": basvuru_id,
+            "document_type": document_type,
+            "basvuru_turu": basvuru_turu,
+            "model": self.model,
+            "request": {
+                "system_prompt": system_prompt,
+                "user_prompt": user_prompt,
+                "text_length": len(text),
+                "text_preview": text[:500]  # İlk 500 karakter
+            },
+            "response": {
+                "raw_text": response_text,
+                "extracted_data": extracted_data,
+                "response_length": len(response_text)
+            },
+            "usage": usage
+        })
+
+    def warm_up(self, force: bool = False) -> bool:
+        """
+        Modeli her backend'de yükle ve bağlantıyı doğrula
+
+        Toplu çalıştırma başında çağrılır; ilk belge model yükleme
+        süresini beklemez.
+
+        Returns:
+            bool: Ollama hazır mı?
+        """
+        if settings.OLLAMA_WARMUP:
+            warmup = get_model_warmup(self.client, settings.OLLAMA_KEEP_ALIVE, load_timeout=self.timeout)
+            if not all(warmup.warm_up([self.model], force=force).values()):
+                logger.error(f"❌ Model yüklenemedi: {self.model}")
+                return False
+
+        return self.test_connection()
+
+    def cool_down(self) -> int:
+        """Kuyruk boşaldığında modeli OLLAMA_IDLE_KEEP_ALIVE ile bırak"""
+        if settings.OLLAMA_IDLE_KEEP_ALIVE == "":
+            return 0
+        warmup = get_model_warmup(self.client, settings.OLLAMA_KEEP_ALIVE, load_timeout=self.timeout)
+        return warmup.cool_down([self.model], settings.OLLAMA_IDLE_KEEP_ALIVE)
 
     def test_connection(self) -> bool:
         """Ollama bağlantısını test et"""
         try:
-            url = f"{self.base_url}/api/tags"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-
-            models = response.json().get('models', [])
+            models = self.client.tags().get('models', [])
             logger.info(f"✅ Ollama bağlantısı başarılı: {len(models)} model")
 
             # Seçili model var mı kontrol et
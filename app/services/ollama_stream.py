@@ -0,0 +1,172 @@
+"""
+Ollama streaming generate (NDJSON) + erken sonlandırma
+
+"stream": true ile Ollama her token için bir JSON satırı gönderir. Yanıt
+metni biriktirilirken en üst seviye JSON nesnesi/dizisi kapandığında
+metin kesinleşir. Ollama'nın sayaçları (prompt_eval_count, süreler) sadece
+son "done" satırında gelir; bu yüzden kapanıştan sonra boşluk / EOS
+token'ları okunmaya devam edilir. JSON'dan sonra anlamlı metin üretilirse
+ya da boşluk üretimi TRAILING_TOKEN_LIMIT'i aşarsa bağlantı kapatılır:
+küçük modellerin kapanış parantezinden sonra num_predict sınırına kadar
+devam eden gereksiz üretimi beklenmez (bu çağrıda sayaçlar gelmez).
+
+Ayrıca ilk token süresi (time-to-first-token) ölçülür.
+"""
+import json
+import logging
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# JSON kapandıktan sonra "done" için beklenecek en fazla boşluk token'ı
+TRAILING_TOKEN_LIMIT = 16
+
+
+class JSONCompletionTracker:
+    """
+    Parça parça gelen metinde en üst seviye JSON değerinin bittiği yeri bulur
+
+    String içindeki parantezler ve kaçış karakterleri dikkate alınır. İlk
+    '{' veya '[' öncesindeki metin (```json gibi) yok sayılır.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.complete = False
+        self.in_string = False
+        self.escape = False
+        self.start_offset = None  # İlk '{' / '[' offset'i
+        self.end_offset = None  # Tamamlandığı karakterden sonraki offset
+        self._consumed = 0
+
+    def feed(self, text: str) -> bool:
+        """
+        Yeni metin parçasını işle
+
+        Returns:
+            True: en üst seviye JSON değeri tamamlandı
+        """
+        if self.complete:
+            return True
+
+        for i, char in enumerate(text):
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif char == '\\':
+                    self.escape = True
+                elif char == '"':
+                    self.in_string = False
+                continue
+
+            if char == '"' and self.started:
+                self.in_string = True
+            elif char in '{[':
+                if not self.started:
+                    self.started = True
+                    self.start_offset = self._consumed + i
+                self.depth += 1
+            elif char in '}]' and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.complete = True
+                    self.end_offset = self._consumed + i + 1
+                    return True
+
+        self._consumed += len(text)
+        return False
+
+
+def stream_generate(
+    http,
+    url: str,
+    payload: Dict[str, Any],
+    timeout: float,
+    early_stop: bool = True,
+    **request_kwargs
+) -> Dict[str, Any]:
+    """
+    Ollama /api/generate isteğini stream modunda çalıştır
+
+    Args:
+        http: requests modülü veya requests.Session (post metodu olan nesne)
+        url: /api/generate URL'i
+        payload: İstek gövdesi ("stream" alanı True yapılır)
+        timeout: Saniye cinsinden timeout
+        early_stop: JSON tamamlandıktan sonra anlamlı üretim / uzun boşluk gelirse bağlantıyı kapat
+        **request_kwargs: post'a iletilecek ek parametreler (verify vb.)
+
+    Returns:
+        Stream kapatılmadan dönen Ollama yanıtıyla aynı alanlar + şunlar:
+            'ttft': ilk token süresi (sn)
+            'early_stop': erken sonlandırıldı mı? (True ise Ollama sayaçları yok)
+            'stream_tokens': alınan token satırı sayısı
+    """
+    payload = {**payload, "stream": True}
+    start_time = time.time()
+    ttft: Optional[float] = None
+    tracker = JSONCompletionTracker()
+    parts = []
+    token_chunks = 0
+    trailing = 0
+    final: Dict[str, Any] = {}
+    stopped_early = False
+
+    response = http.post(url, json=payload, timeout=timeout, stream=True, **request_kwargs)
+    try:
+        response.raise_for_status()
+
+        for line in response.iter_lines():
+            if not line:
+                continue
+
+            chunk = json.loads(line)
+
+            if chunk.get("error"):
+                raise RuntimeError(f"Ollama stream hatası: {chunk['error']}")
+
+            token = chunk.get("response", "")
+            if token:
+                if ttft is None:
+                    ttft = time.time() - start_time
+                token_chunks += 1
+
+                if early_stop and tracker.complete:
+                    # JSON bitti: sayaçlar için "done" beklenir, anlamlı üretim beklenmez
+                    trailing += 1
+                    if token.strip() or trailing > TRAILING_TOKEN_LIMIT:
+                        stopped_early = True
+                        break
+                else:
+                    parts.append(token)
+                    if early_stop:
+                        tracker.feed(token)
+
+            if chunk.get("done"):
+                final = chunk
+                break
+    finally:
+        # Erken çıkışta bağlantıyı kapatmak Ollama'da üretimi de durdurur
+        response.close()
+
+    text = "".join(parts)
+    if tracker.complete:
+        # Sadece JSON değeri (öncesindeki ```json ve kapanmamış fence atılır)
+        text = text[tracker.start_offset:tracker.end_offset]
+
+    result = {k: v for k, v in final.items() if k != "response"}
+    result.update({
+        "model": final.get("model", payload.get("model")),
+        "response": text,
+        "done": True,
+        "ttft": ttft,
+        "early_stop": stopped_early,
+        "stream_tokens": token_chunks,
+    })
+    if stopped_early:
+        result["done_reason"] = "json_complete"
+        logger.debug(f"Stream erken sonlandırıldı ({len(text)} karakter, ttft={ttft:.2f}s)")
+
+    return result
@@ -0,0 +1,272 @@
+"""
+Token sayacı
+
+Chunk boyutları karakter yerine modelin gerçek token sayısına göre
+belirlenir. Türkçe metin "4 karakter = 1 token" varsayımından belirgin
+şekilde sapar; karakter bazlı chunk'lar ya context'i boşa harcar ya da
+num_ctx'i taşırır.
+
+Modlar:
+- tokenizer: Yerel HuggingFace tokenizer.json (tokenizers paketi) - kesin
+- ollama: Ollama /api/embed prompt_eval_count - kesin, ama her sayım bir istek
+- heuristic: Karakter / token oranı; ilk kullanımda /api/embed ile bir kez
+  kalibre edilir. generate yanıtlarındaki prompt_eval_count kullanılmaz:
+  KV cache'ten gelen prompt prefix'i sayılmadığı için oran yukarı kayar,
+  bütçeler num_ctx'i taşırır
+- auto: tokenizer kullanılabiliyorsa tokenizer, yoksa heuristic
+
+Sayımlar metin hash'ine göre LRU cache'te tutulur.
+"""
+import hashlib
+import logging
+import math
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from tokenizers import Tokenizer
+    TOKENIZERS_AVAILABLE = True
+except ImportError:
+    TOKENIZERS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class TokenCounter:
+    """Model bazlı token sayacı (cache'li)"""
+
+    # Kalibrasyonda kabul edilen karakter/token oranı aralığı
+    MIN_CHARS_PER_TOKEN = 1.5
+    MAX_CHARS_PER_TOKEN = 8.0
+
+    # Yeni gözlemin orana etkisi (üstel hareketli ortalama)
+    CALIBRATION_WEIGHT = 0.2
+
+    def __init__(
+        self,
+        model: str,
+        mode: str = "auto",
+        tokenizer_path: Optional[str] = None,
+        client=None,
+        chars_per_token: float = 4.0,
+        cache_size: int = 4096
+    ):
+        """
+        Args:
+            model: Ollama model adı
+            mode: auto, tokenizer, ollama veya heuristic
+            tokenizer_path: tokenizer.json yolu (tokenizer modu)
+            client: OllamaClient (ollama modu)
+            chars_per_token: Heuristic başlangıç oranı
+            cache_size: Cache'lenen sayım sayısı
+        """
+        self.model = model
+        self.client = client
+        self.chars_per_token = float(chars_per_token)
+        self.cache_size = cache_size
+        self.calibration_samples = 0
+        self._calibration_attempted = False
+
+        self._tokenizer = None
+        self._cache: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.mode = self._resolve_mode(mode, tokenizer_path)
+        logger.info(f"Token sayacı: {self.mode} ({model})")
+
+    def _resolve_mode(self, mode: str, tokenizer_path: Optional[str]) -> str:
+        """İstenen modu kullanılabilir olana indir"""
+        mode = (mode or "auto").lower()
+
+        if mode in ("auto", "tokenizer") and tokenizer_path:
+            if not TOKENIZERS_AVAILABLE:
+                logger.warning("tokenizers paketi yüklü değil, heuristic token sayımı kullanılacak")
+            else:
+                try:
+                    self._tokenizer = Tokenizer.from_file(str(tokenizer_path))
+                    return "tokenizer"
+                except Exception as e:
+                    logger.warning(f"Tokenizer yüklenemedi ({tokenizer_path}): {e}")
+
+        if mode == "ollama" and self.client is not None:
+            return "ollama"
+
+        return "heuristic"
+
+    @property
+    def exact(self) -> bool:
+        """Sayımlar kesin mi? (heuristic değil)"""
+        return self.mode != "heuristic"
+
+    # ------------------------------------------------------------------
+    # Sayım
+    # ------------------------------------------------------------------
+
+    def count(self, text: str) -> int:
+        """
+        Metnin token sayısı
+
+        Args:
+            text: Metin
+
+        Returns:
+            int: Token sayısı (heuristic modda tahmin)
+        """
+        if not text:
+            return 0
+
+        if self.mode == "heuristic":
+            return self._estimate(len(text))
+
+        key = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        try:
+            if self.mode == "tokenizer":
+                tokens = len(self._tokenizer.encode(text, add_special_tokens=False).ids)
+            else:
+                tokens = self._count_with_ollama(text)
+        except Exception as e:
+            logger.warning(f"Token sayımı başarısız, tahmin kullanılıyor: {e}")
+            return self._estimate(len(text))
+
+        with self._lock:
+            self._cache[key] = tokens
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return tokens
+
+    def count_segments(self, segments: List[str]) -> List[int]:
+        """
+        Ardışık metin parçalarının token sayıları
+
+        tokenizer modunda her parça kesin sayılır. ollama modunda parça
+        başına istek atmamak için birleşik metin bir kez sayılır ve
+        karakter oranıyla parçalara dağıtılır.
+
+        Args:
+            segments: Metin parçaları
+
+        Returns:
+            List[int]: Parça başına token sayısı
+        """
+        if not segments:
+            return []
+
+        if self.mode == "tokenizer":
+            try:
+                encodings = self._tokenizer.encode_batch(segments, add_special_tokens=False)
+                return [len(e.ids) for e in encodings]
+            except Exception as e:
+                logger.warning(f"Toplu token sayımı başarısız, tahmin kullanılıyor: {e}")
+                return [self._estimate(len(s)) for s in segments]
+
+        if self.mode == "ollama":
+            joined = "".join(segments)
+            total = self.count(joined)
+            ratio = total / len(joined) if joined else 0.0
+            return [max(1, math.ceil(len(s) * ratio)) if s else 0 for s in segments]
+
+        return [self._estimate(len(s)) for s in segments]
+
+    def _estimate(self, chars: int) -> int:
+        return max(1, math.ceil(chars / self.chars_per_token)) if chars else 0
+
+    def _count_with_ollama(self, text: str) -> int:
+        """/api/embed ile prompt token sayısı"""
+        with self.client.router.acquire(self.model) as backend:
+            response = self.client.session.post(
+                f"{backend.url}/api/embed",
+                json={"model": self.model, "input": text, "truncate": False},
+                timeout=self.client.timeout,
+                verify=self.client.verify
+            )
+            response.raise_for_status()
+            data = response.json()
+
+        tokens = data.get("prompt_eval_count")
+        if tokens is None:
+            raise ValueError("Ollama yanıtında prompt_eval_count yok")
+        return int(tokens)
+
+    # ------------------------------------------------------------------
+    # Kalibrasyon
+    # ------------------------------------------------------------------
+
+    def observe(self, chars: int, prompt_tokens: Optional[int]):
+        """
+        Kesin bir sayımın karakter / token sayısıyla oranı güncelle
+
+        Args:
+            chars: Sayılan metnin karakter sayısı
+            prompt_tokens: Metnin tamamının token sayısı (/api/embed; KV cache'li
+                generate yanıtının prompt_eval_count'u değil)
+        """
+        if self.mode != "heuristic" or not prompt_tokens or chars < 200:
+            return
+
+        observed = chars / prompt_tokens
+        if not self.MIN_CHARS_PER_TOKEN <= observed <= self.MAX_CHARS_PER_TOKEN:
+            return
+
+        with self._lock:
+            if self.calibration_samples == 0:
+                self.chars_per_token = observed
+            else:
+                self.chars_per_token += self.CALIBRATION_WEIGHT * (observed - self.chars_per_token)
+            self.calibration_samples += 1
+
+        logger.debug(f"Token oranı kalibre edildi: {self.chars_per_token:.2f} karakter/token")
+
+    def calibrate(self, sample: str):
+        """
+        Heuristic oranını örnek metnin kesin sayımıyla bir kez başlat
+
+        generate yanıtlarındaki prompt_eval_count KV cache'teki prefix'i
+        içermez; bu yüzden heuristic modda ilk bütçe hesabından önce örnek
+        metin (ör. prompt şablonu) /api/embed ile bir kez, cache'siz sayılır.
+        Başarısızsa başlangıç oranı kalır.
+        """
+        if self.mode != "heuristic" or self.client is None or self._calibration_attempted:
+            return
+        self._calibration_attempted = True
+
+        try:
+            self.observe(len(sample), self._count_with_ollama(sample))
+        except Exception as e:
+            logger.info(f"Token oranı kalibre edilemedi, {self.chars_per_token:.1f} karakter/token kullanılacak: {e}")
+
+    def stats(self) -> Dict:
+        """Sayaç durumu"""
+        return {
+            'mode': self.mode,
+            'model': self.model,
+            'chars_per_token': round(self.chars_per_token, 3),
+            'calibration_samples': self.calibration_samples,
+            'cached_counts': len(self._cache),
+        }
+
+
+# (model, mod) → sayaç (aynı süreçteki tüm servisler kalibrasyonu paylaşır)
+_counters: Dict[Tuple[str, str], TokenCounter] = {}
+_counters_lock = threading.Lock()
+
+
+def get_token_counter(model: str, mode: str = "auto", **kwargs) -> TokenCounter:
+    """
+    Paylaşılan token sayacını döndür
+
+    Args:
+        model: Ollama model adı
+        mode: Sayım modu
+        **kwargs: TokenCounter parametreleri (sadece ilk oluşturmada kullanılır)
+    """
+    key = (model, mode)
+    with _counters_lock:
+        if key not in _counters:
+            _counters[key] = TokenCounter(model, mode=mode, **kwargs)
+        return _counters[key]
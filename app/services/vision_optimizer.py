@@ -0,0 +1,270 @@
+"""
+Vision model girdisi optimizasyonu
+
+Vision modelde CPU çıkarım süresi görsel token sayısıyla (piksel
+sayısıyla) büyür. Ham tarama / render 2000 px'e kadar küçültülüp q85
+JPEG olarak gönderiliyordu; kenar boşlukları ve boş sayfalar da dahil.
+
+Zincir:
+    içerik bounding box'ına kırp → modelin doğal çözünürlüğüne küçült → JPEG
+
+Çok sayfalı taramalarda sayfalar küçük önizleme üzerinden puanlanır
+(mürekkep oranı): boş sayfalar atlanır, ilk sayfa + en dolu sayfalar
+(max_pages) seçilir ve tek görselde yan yana döşenir (tile). Döşenmiş
+görsel de max_side'a küçültülür.
+
+Kodlanmış payload içerik hash'iyle bellekte cache'lenir: aynı belgenin
+tekrar denemesi / aynı görselin başka analyzer'ı yeniden render etmez.
+"""
+import base64
+import hashlib
+import io
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from PIL import Image
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+
+try:
+    import pdfplumber
+    PDFPLUMBER_AVAILABLE = True
+except ImportError:
+    PDFPLUMBER_AVAILABLE = False
+
+from app.services.image_preprocessor import ImagePreprocessor
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class VisionInputOptions:
+    """Vision girdisi parametreleri"""
+
+    # Uzun kenar (px) - modelin doğal girdi çözünürlüğü (gemma3: 896)
+    max_side: int = 896
+
+    # JPEG kalitesi
+    jpeg_quality: int = 80
+
+    # İçerik bounding box'ına kırp (kenar payı px, küçültülmüş görselde)
+    crop: bool = True
+    crop_margin: int = 12
+
+    # Çok sayfalı PDF: taranacak ilk N sayfa, seçilecek en fazla sayfa
+    scan_pages: int = 4
+    max_pages: int = 2
+
+    # Seçilen sayfaları tek görselde yan yana döşe (False: sadece en iyi sayfa)
+    tile: bool = True
+
+    # Bu mürekkep oranının altındaki sayfalar boş sayılır
+    blank_ink_ratio: float = 0.002
+
+    # Sayfa render çözünürlüğü
+    render_dpi: int = 120
+
+
+class VisionInputOptimizer:
+    """Kırpma + küçültme + sayfa seçimi + payload cache"""
+
+    def __init__(self, options: VisionInputOptions = None, cache_size: int = 64):
+        """
+        Args:
+            options: Girdi parametreleri
+            cache_size: Bellekte tutulacak payload sayısı (LRU)
+        """
+        self.options = options or VisionInputOptions()
+        self.cache_size = cache_size
+
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # ========== CACHE ==========
+
+    def _cache_key(self, data: bytes, kind: str) -> str:
+        digest = hashlib.blake2b(data, digest_size=20)
+        digest.update(f"{kind}|{self.options!r}".encode())
+        return digest.hexdigest()
+
+    def _cached(self, key: str, build) -> Optional[str]:
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            self.misses += 1
+
+        encoded = build()
+        if encoded:
+            with self._lock:
+                self._cache[key] = encoded
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return encoded
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._cache)}
+
+    # ========== GİRİŞ NOKTALARI ==========
+
+    def optimize_image(self, image_bytes: bytes) -> Optional[str]:
+        """
+        Görsel dosyasını vision girdisine çevir
+
+        Returns:
+            str: Base64 JPEG, başarısızsa None
+        """
+        if not PILLOW_AVAILABLE:
+            logger.error("Pillow yüklü değil")
+            return None
+
+        def build():
+            image = Image.open(io.BytesIO(image_bytes))
+            return self._encode(self._prepare(image))
+
+        return self._cached(self._cache_key(image_bytes, "image"), build)
+
+    def optimize_pdf(self, pdf_bytes: bytes) -> Optional[str]:
+        """
+        PDF'in içerik taşıyan sayfalarını seçip tek vision girdisine çevir
+
+        Returns:
+            str: Base64 JPEG (seçilen sayfalar döşenmiş), başarısızsa None
+        """
+        if not (PILLOW_AVAILABLE and PDFPLUMBER_AVAILABLE):
+            logger.error("Pillow / pdfplumber yüklü değil")
+            return None
+
+        def build():
+            pages = self._select_pages(self._render_pages(pdf_bytes))
+            if not pages:
+                return None
+            return self._encode(self._tile(pages) if len(pages) > 1 else pages[0])
+
+        return self._cached(self._cache_key(pdf_bytes, "pdf"), build)
+
+    # ========== İŞLEME ==========
+
+    def _render_pages(self, pdf_bytes: bytes) -> List["Image.Image"]:
+        with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+            return [
+                page.to_image(resolution=self.options.render_dpi).original.convert('RGB')
+                for page in pdf.pages[:self.options.scan_pages]
+            ]
+
+    def _prepare(self, image: "Image.Image") -> "Image.Image":
+        """RGB'ye çevir, küçült, içerik kutusuna kırp"""
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+
+        # Önce küçült: kırpma maskesi daha az pikselde hesaplanır
+        image = self._downscale(image, self.options.max_side * 2)
+
+        if self.options.crop:
+            top, bottom, left, right = self._content_box(image)
+            if (bottom - top) * (right - left) < image.size[0] * image.size[1]:
+                image = image.crop((left, top, right, bottom))
+
+        return self._downscale(image, self.options.max_side)
+
+    def _content_box(self, image: "Image.Image") -> Tuple[int, int, int, int]:
+        """Arka plandan belirgin koyu pikseller (mürekkep) etrafındaki kutu"""
+        gray = ImagePreprocessor.to_grayscale(np.asarray(image))
+        return ImagePreprocessor.ink_bounding_box(self._ink_mask(gray), margin=self.options.crop_margin)
+
+    @staticmethod
+    def _ink_mask(gray: np.ndarray) -> np.ndarray:
+        """Arka plan medyanının belirgin altındaki pikseller"""
+        background = float(np.median(gray))
+        return gray < min(200.0, background - 40.0)
+
+    @staticmethod
+    def _downscale(image: "Image.Image", max_side: int) -> "Image.Image":
+        if max(image.size) <= max_side:
+            return image
+        ratio = max_side / max(image.size)
+        new_size = (max(1, int(image.size[0] * ratio)), max(1, int(image.size[1] * ratio)))
+        return image.resize(new_size, Image.Resampling.LANCZOS)
+
+    def _select_pages(self, pages: List["Image.Image"]) -> List["Image.Image"]:
+        """Boş sayfaları at; ilk dolu sayfa + en yüksek mürekkep oranlılar (belge sırasıyla)"""
+        prepared = [self._prepare(page) for page in pages]
+        ink_ratios = [
+            float(self._ink_mask(ImagePreprocessor.to_grayscale(np.asarray(page))).mean())
+            for page in prepared
+        ]
+
+        candidates = [i for i, ratio in enumerate(ink_ratios) if ratio >= self.options.blank_ink_ratio]
+        if not candidates:
+            return prepared[:1]
+
+        limit = self.options.max_pages if self.options.tile else 1
+        selected = {candidates[0]}
+        for i in sorted(candidates[1:], key=lambda i: ink_ratios[i], reverse=True):
+            if len(selected) >= limit:
+                break
+            selected.add(i)
+
+        if len(pages) > 1:
+            logger.info(
+                f"👁️ Vision sayfa seçimi: {len(pages)} sayfadan {sorted(i + 1 for i in selected)} "
+                f"(mürekkep: {', '.join(f'{r:.1%}' for r in ink_ratios)})"
+            )
+        return [prepared[i] for i in sorted(selected)]
+
+    def _tile(self, pages: List["Image.Image"]) -> "Image.Image":
+        """Sayfaları ortak yükseklikte yan yana birleştir (sonuç max_side'a küçültülür)"""
+        height = min(page.size[1] for page in pages)
+        scaled = [
+            page if page.size[1] == height
+            else page.resize((max(1, int(page.size[0] * height / page.size[1])), height), Image.Resampling.LANCZOS)
+            for page in pages
+        ]
+
+        gap = 8
+        canvas = Image.new('RGB', (sum(p.size[0] for p in scaled) + gap * (len(scaled) - 1), height), 'white')
+        x = 0
+        for page in scaled:
+            canvas.paste(page, (x, 0))
+            x += page.size[0] + gap
+
+        # Yan yana sayfalar tek sayfadan geniş: modelin doğal çözünürlüğüne indir
+        return self._downscale(canvas, self.options.max_side)
+
+    def _encode(self, image: "Image.Image") -> str:
+        buffer = io.BytesIO()
+        image.save(buffer, format='JPEG', quality=self.options.jpeg_quality, optimize=True)
+        encoded = base64.b64encode(buffer.getvalue()).decode('utf-8')
+        logger.info(f"Vision girdisi: {image.size[0]}x{image.size[1]} -> Base64 ({len(encoded)} karakter)")
+        return encoded
+
+
+# Parametreler → optimizer (aynı süreçteki tüm analyzer'lar cache'i paylaşır)
+_optimizers: Dict[VisionInputOptions, VisionInputOptimizer] = {}
+_optimizers_lock = threading.Lock()
+
+
+def get_vision_optimizer(options: VisionInputOptions = None, cache_size: int = 64) -> VisionInputOptimizer:
+    """
+    Paylaşılan vision girdi optimizer'ını döndür
+
+    Args:
+        options: Girdi parametreleri
+        cache_size: Payload cache boyutu (sadece ilk oluşturmada kullanılır)
+    """
+    options = options or VisionInputOptions()
+    with _optimizers_lock:
+        if options not in _optimizers:
+            _optimizers[options] = VisionInputOptimizer(options, cache_size=cache_size)
+        return _optimizers[options]
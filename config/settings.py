@@ -47,10 +47,51 @@ SQLITE_PRAGMAS = {
 # =============================================================================
 OLLAMA_BASE_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
 OLLAMA_API_URL = f"{OLLAMA_BASE_URL}/api/generate"
+# Birden fazla Ollama makinesi: virgülle ayrılmış liste (boş = sadece OLLAMA_URL)
+# İstekler modeli yüklü, sağlıklı ve en az işteki backend'e gider
+OLLAMA_BACKENDS = [
+    url.strip().rstrip("/")
+    for url in os.getenv("OLLAMA_BACKENDS", "").split(",")
+    if url.strip()
+] or [OLLAMA_BASE_URL]
+OLLAMA_HEALTH_INTERVAL = int(os.getenv("OLLAMA_HEALTH_INTERVAL", "30"))  # saniye (/api/tags)
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "gemma3:4b")
 OLLAMA_TIMEOUT = int(os.getenv("OLLAMA_TIMEOUT", "180"))  # saniye
+# Stream modu: JSON tamamlandıktan sonra sadece sayaçlı "done" satırını bekle
+# (anlamlı üretim devam ederse bağlantıyı kapat), ilk token süresini ölç
+OLLAMA_STREAM = os.getenv("OLLAMA_STREAM", "true").lower() == "true"
+# Belge analizlerinde Ollama JSON modu (format "json"): çıktı her zaman geçerli JSON
+# (false = serbest metin, A/B karşılaştırması için; bkz. scripts/benchmark_structured_output.py)
+OLLAMA_JSON_FORMAT = os.getenv("OLLAMA_JSON_FORMAT", "true").lower() == "true"
 OLLAMA_MAX_RETRIES = int(os.getenv("OLLAMA_MAX_RETRIES", "3"))
-OLLAMA_RETRY_DELAY = int(os.getenv("OLLAMA_RETRY_DELAY", "5"))  # saniye
+# Exponential backoff tabanı (sn); app/config.py OLLAMA_RETRY_DELAY ile aynı (ortak OllamaClient politikası)
+OLLAMA_RETRY_DELAY = float(os.getenv("OLLAMA_RETRY_DELAY", "2.0"))
+# Devre kesici: üst üste bu kadar başarısız çağrıda Ollama'ya istek gönderilmez,
+# analizler hemen LLMUnavailableError alır; reset süresinden sonra tek deneme
+OLLAMA_BREAKER_THRESHOLD = int(os.getenv("OLLAMA_BREAKER_THRESHOLD", "5"))
+OLLAMA_BREAKER_RESET_SECONDS = int(os.getenv("OLLAMA_BREAKER_RESET_SECONDS", "60"))
+# Retry bütçesi: son 60 sn'deki retry sayısı istek sayısının bu oranını aşamaz
+OLLAMA_RETRY_BUDGET_RATIO = float(os.getenv("OLLAMA_RETRY_BUDGET_RATIO", "0.2"))
+OLLAMA_RETRY_BUDGET_MIN = int(os.getenv("OLLAMA_RETRY_BUDGET_MIN", "3"))  # düşük trafikte izin verilen retry
+# Paylaşılan HTTP bağlantı havuzu (eşzamanlı chunk sayısından küçük olmamalı)
+OLLAMA_POOL_SIZE = int(os.getenv("OLLAMA_POOL_SIZE", "10"))
+OLLAMA_VERIFY_SSL = os.getenv("OLLAMA_VERIFY_SSL", "true").lower() == "true"
+# Model (ve KV cache'teki prompt prefix'i) istekler arasında bellekte kalsın
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")  # "-1" = süresiz
+# Görsel belgeler için model (varsayılan: metin modeli, gemma3 çok modlu)
+OLLAMA_VISION_MODEL = os.getenv("OLLAMA_VISION_MODEL", OLLAMA_MODEL)
+# Toplu çalıştırma başında modelleri yükle ve check_health ile hazır olduğunu doğrula
+OLLAMA_WARMUP = os.getenv("OLLAMA_WARMUP", "true").lower() == "true"
+# Kuyruk boşalınca uygulanacak keep_alive ("0" = modeli hemen bırak, boş = dokunma)
+OLLAMA_IDLE_KEEP_ALIVE = os.getenv("OLLAMA_IDLE_KEEP_ALIVE", "0")
+
+# İki kademeli model: önce küçük model, sonuç validasyon / üst yazı çapraz
+# doğrulama / tamlık kontrolüne takılırsa büyük model (services/model_cascade.py)
+OLLAMA_CASCADE_ENABLED = os.getenv("OLLAMA_CASCADE_ENABLED", "false").lower() == "true"
+OLLAMA_CASCADE_SMALL_MODEL = os.getenv("OLLAMA_CASCADE_SMALL_MODEL", OLLAMA_MODEL)
+OLLAMA_CASCADE_LARGE_MODEL = os.getenv("OLLAMA_CASCADE_LARGE_MODEL", "gemma3:27b")
+# Dolu alan oranı bunun altındaysa yükselt (analyzer CASCADE_MIN_COMPLETENESS ile ezebilir)
+OLLAMA_CASCADE_MIN_COMPLETENESS = float(os.getenv("OLLAMA_CASCADE_MIN_COMPLETENESS", "0.5"))
 
 # Ollama request parametreleri
 OLLAMA_OPTIONS = {
@@ -72,6 +113,26 @@ MAX_CHUNK_SIZE = 8000  # Maximum chunk boyutu
 # Token tahmini (yaklaşık)
 CHARS_PER_TOKEN = 4  # İngilizce için ~4, Türkçe için ~3-4
 
+# Token bütçeli chunk'lama: chunk = num_ctx - num_predict - (prompt + şema) - pay
+# Kapalıysa CHUNK_SIZE karakterlik chunk'lar kullanılır
+CHUNK_BY_TOKENS = os.getenv("CHUNK_BY_TOKENS", "true").lower() == "true"
+CHUNK_TOKEN_MARGIN = int(os.getenv("CHUNK_TOKEN_MARGIN", "256"))  # Güvenlik payı (token)
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "64"))
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "0"))  # 0 = sadece bütçe sınırı
+
+# Token sayımı: auto (TOKENIZER_PATH varsa yerel tokenizer, yoksa kalibre edilen tahmin),
+# tokenizer, ollama (/api/embed ile kesin sayım), heuristic
+TOKEN_COUNTER = os.getenv("TOKEN_COUNTER", "auto")
+TOKENIZER_PATH = os.getenv("TOKENIZER_PATH", "")  # Modelin tokenizer.json dosyası
+
+# Chunk ilgililik filtresi: şema alanlarına ait anchor'ı olmayan chunk'lar (kaynakça,
+# kalıp metin) LLM'e gönderilmez (bkz. app/models/relevance_profiles.py)
+CHUNK_RELEVANCE_FILTER = os.getenv("CHUNK_RELEVANCE_FILTER", "true").lower() == "true"
+
+# Aynı metinli chunk (ortak SGK başlıkları, aynı CV şablonu, tekrar yüklenen dosya) daha önce
+# aynı prompt ve modelle analiz edildiyse chunk_sonuclari'ndaki sonuç kullanılır (migration 006)
+CHUNK_DEDUP_ENABLED = os.getenv("CHUNK_DEDUP_ENABLED", "true").lower() == "true"
+
 # =============================================================================
 # HİZMET TİPLERİ VE BELGE MATRİSİ
 # =============================================================================
@@ -172,6 +233,50 @@ BASE64_DECODE_BUFFER_SIZE = 1024 * 1024  # 1MB
 # Maximum dosya boyutu (bytes)
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
 
+# =============================================================================
+# OCR ÖN İŞLEME AYARLARI
+# =============================================================================
+# EasyOCR öncesi grayscale + binarization + deskew + kenar/boşluk kırpma
+OCR_PREPROCESS_ENABLED = os.getenv("OCR_PREPROCESS_ENABLED", "true").lower() == "true"
+
+# false: geometrik düzeltmeler uygulanır ama OCR'a gri görsel verilir
+OCR_PREPROCESS_BINARIZE = os.getenv("OCR_PREPROCESS_BINARIZE", "true").lower() == "true"
+
+# =============================================================================
+# OCR KALİTE KARARLARI
+# =============================================================================
+# Sayfa render çözünürlüğü ve düşük güvende tekrar denenecek çözünürlük
+OCR_DPI = int(os.getenv("OCR_DPI", "300"))
+OCR_RETRY_DPI = int(os.getenv("OCR_RETRY_DPI", "400"))
+
+# Ortalama OCR güveni bunun altındaysa: önce yüksek DPI, sonra vision
+OCR_MIN_CONFIDENCE = float(os.getenv("OCR_MIN_CONFIDENCE", "0.5"))
+
+# Tekrar denemeden sonra bunun altında kalırsa ve vision yoksa LLM'e gönderme
+OCR_SKIP_CONFIDENCE = float(os.getenv("OCR_SKIP_CONFIDENCE", "0.2"))
+
+# Düşük güvenli taranmış belgeleri vision modele yönlendir
+OCR_VISION_FALLBACK = os.getenv("OCR_VISION_FALLBACK", "true").lower() == "true"
+
+# =============================================================================
+# VISION GİRDİSİ AYARLARI
+# =============================================================================
+# Vision modele giden görsel: içerik kutusuna kırpılır ve uzun kenarı bu
+# değere küçültülür (modelin doğal çözünürlüğü, gemma3: 896)
+VISION_MAX_SIDE = int(os.getenv("VISION_MAX_SIDE", "896"))
+VISION_JPEG_QUALITY = int(os.getenv("VISION_JPEG_QUALITY", "80"))
+VISION_CROP = os.getenv("VISION_CROP", "true").lower() == "true"
+
+# Çok sayfalı taramalar: ilk N sayfa puanlanır, boşlar atlanır, en fazla
+# VISION_MAX_PAGES sayfa yan yana tek görselde gönderilir
+# (sabit girdi boyutlu modellerde 1 önerilir)
+VISION_SCAN_PAGES = int(os.getenv("VISION_SCAN_PAGES", "4"))
+VISION_MAX_PAGES = int(os.getenv("VISION_MAX_PAGES", "2"))
+VISION_RENDER_DPI = int(os.getenv("VISION_RENDER_DPI", "120"))
+
+# Kodlanmış görsel cache'i (içerik hash'i, bellekte)
+VISION_CACHE_SIZE = int(os.getenv("VISION_CACHE_SIZE", "64"))
+
 # =============================================================================
 # LOGLAMA AYARLARI
 # =============================================================================
@@ -193,9 +298,40 @@ LOG_BACKUP_COUNT = 5
 # =============================================================================
 # İŞLEM AYARLARI
 # =============================================================================
-# Paralel işlem
+# Paralel işlem: main.py --analyze başvuruları MAX_WORKERS süreçle işler
+# (sistem_config'teki parallel_processing / max_workers bu değerleri ezer, --workers hepsini)
 ENABLE_PARALLEL = os.getenv("ENABLE_PARALLEL", "false").lower() == "true"
 MAX_WORKERS = int(os.getenv("MAX_WORKERS", "4"))
+# Worker'ın başvuru kirası; çalışırken kira süresinin 1/3'ünde bir uzatılır,
+# çöken worker'ın başvurusu bu süre dolunca başka worker'a geçer
+BASVURU_LEASE_SECONDS = int(os.getenv("BASVURU_LEASE_SECONDS", "600"))
+
+# Bir başvurunun belgeleri (üst yazıdan sonra) eşzamanlı analiz edilir; 1 = seri.
+# Toplam LLM isteği yine LLM_SCHEDULER_SLOTS ile sınırlıdır
+DOCUMENT_MAX_CONCURRENCY = int(os.getenv("DOCUMENT_MAX_CONCURRENCY", "4"))
+
+# Bir belgenin chunk'ları için eşzamanlı Ollama isteği sayısı
+# (Ollama tarafındaki OLLAMA_NUM_PARALLEL ile uyumlu tutun, 1 = seri)
+CHUNK_MAX_CONCURRENCY = int(os.getenv("CHUNK_MAX_CONCURRENCY", "4"))
+
+# Öncelikli LLM istek zamanlayıcı (interactive > deadline > backfill, weighted fair queuing)
+# Slot sayısı tüm backend'lerdeki toplam eşzamanlı istek (OLLAMA_NUM_PARALLEL x backend)
+LLM_SCHEDULER_ENABLED = os.getenv("LLM_SCHEDULER_ENABLED", "true").lower() == "true"
+LLM_SCHEDULER_SLOTS = int(os.getenv("LLM_SCHEDULER_SLOTS", str(CHUNK_MAX_CONCURRENCY)))
+LLM_SCHEDULER_WEIGHTS = {
+    "interactive": float(os.getenv("LLM_SCHEDULER_WEIGHT_INTERACTIVE", "100")),
+    "deadline": float(os.getenv("LLM_SCHEDULER_WEIGHT_DEADLINE", "10")),
+    "backfill": float(os.getenv("LLM_SCHEDULER_WEIGHT_BACKFILL", "1")),
+}
+# Sınıf başına eşzamanlı istek; backfill varsayılan olarak bir slotu etkileşimli isteklere bırakır
+LLM_SCHEDULER_CAPS = {
+    "interactive": int(os.getenv("LLM_SCHEDULER_CAP_INTERACTIVE", str(LLM_SCHEDULER_SLOTS))),
+    "deadline": int(os.getenv("LLM_SCHEDULER_CAP_DEADLINE", str(LLM_SCHEDULER_SLOTS))),
+    "backfill": int(os.getenv("LLM_SCHEDULER_CAP_BACKFILL", str(max(1, LLM_SCHEDULER_SLOTS - 1)))),
+}
+# Worker süreçleri / API aynı slotları paylaşsın (SQLite kiraları, boş = sadece bu süreç)
+LLM_SCHEDULER_SHARED_PATH = os.getenv("LLM_SCHEDULER_SHARED_PATH", str(DATABASE_DIR / "llm_scheduler.db"))
+LLM_SCHEDULER_LEASE_SECONDS = int(os.getenv("LLM_SCHEDULER_LEASE_SECONDS", "900"))  # çöken sürecin slotu bu sürede düşer
 
 # Batch processing
 BATCH_SIZE = int(os.getenv("BATCH_SIZE", "10"))
@@ -262,6 +398,13 @@ VERBOSE_LOGGING = DEBUG
 ENABLE_CACHE = True
 CACHE_SIZE = 100  # LRU cache size
 
+# LLM yanıt cache'i (SQLite, TTL + LRU) - aynı istek Ollama'ya tekrar gitmez
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_PATH = Path(os.getenv("LLM_CACHE_PATH", str(DATABASE_DIR / "llm_cache.db")))
+LLM_CACHE_TTL_HOURS = int(os.getenv("LLM_CACHE_TTL_HOURS", "168"))  # 7 gün
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "200"))
+
 # Database connection pool
 DB_POOL_SIZE = 5
 DB_MAX_OVERFLOW = 10
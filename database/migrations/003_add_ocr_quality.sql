@@ -0,0 +1,10 @@
+-- Migration 003: belge_analiz_log tablosuna OCR kalite özetleri ekle
+-- Tarih: 2026-10-19
+-- Amaç: EasyOCR güven skorlarına göre verilen kararı (LLM / yüksek DPI / vision / atla) izlemek
+
+ALTER TABLE belge_analiz_log ADD COLUMN ocr_sayfa_sayisi INTEGER;
+ALTER TABLE belge_analiz_log ADD COLUMN ocr_ortalama_guven REAL;     -- Karakter ağırlıklı ortalama (0-1)
+ALTER TABLE belge_analiz_log ADD COLUMN ocr_min_guven REAL;
+ALTER TABLE belge_analiz_log ADD COLUMN ocr_dusuk_guven_orani REAL;  -- Güveni < 0.5 olan karakter oranı
+ALTER TABLE belge_analiz_log ADD COLUMN ocr_dpi INTEGER;
+ALTER TABLE belge_analiz_log ADD COLUMN ocr_karar TEXT;              -- llm, retry_ocr, vision, skip
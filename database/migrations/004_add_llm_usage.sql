@@ -0,0 +1,20 @@
+-- Migration 004: Ollama token / süre sayaçlarını chunk ve belge bazında sakla
+-- Tarih: 2026-10-19
+-- Amaç: Ayar yaparken prompt-bound mu generation-bound mu olduğunu görmek
+--       (Ollama: prompt_eval_count/duration, eval_count/duration, load_duration, total_duration)
+-- Cache'ten gelen chunk'larda model çalışmadığı için bu alanlar NULL kalır.
+
+ALTER TABLE chunk_sonuclari ADD COLUMN prompt_token INTEGER;          -- prompt_eval_count
+ALTER TABLE chunk_sonuclari ADD COLUMN cevap_token INTEGER;           -- eval_count
+ALTER TABLE chunk_sonuclari ADD COLUMN prompt_suresi_sn REAL;         -- prompt_eval_duration
+ALTER TABLE chunk_sonuclari ADD COLUMN uretim_suresi_sn REAL;         -- eval_duration
+ALTER TABLE chunk_sonuclari ADD COLUMN yukleme_suresi_sn REAL;        -- load_duration (model yükleme)
+ALTER TABLE chunk_sonuclari ADD COLUMN toplam_suresi_sn REAL;         -- total_duration (sunucu tarafı)
+
+ALTER TABLE belge_analiz_log ADD COLUMN prompt_token_toplam INTEGER;
+ALTER TABLE belge_analiz_log ADD COLUMN cevap_token_toplam INTEGER;
+ALTER TABLE belge_analiz_log ADD COLUMN prompt_suresi_sn REAL;
+ALTER TABLE belge_analiz_log ADD COLUMN uretim_suresi_sn REAL;
+ALTER TABLE belge_analiz_log ADD COLUMN yukleme_suresi_sn REAL;
+
+CREATE INDEX IF NOT EXISTS idx_chunk_created ON chunk_sonuclari(created_at);
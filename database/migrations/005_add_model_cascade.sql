@@ -0,0 +1,7 @@
+-- Migration 005: İki kademeli model (cascade) kararını belge bazında sakla
+-- Tarih: 2026-10-19
+-- Amaç: Belge tipi bazlı büyük modele yükseltme oranlarını izlemek
+--       (cascade kapalıyken NULL kalır)
+
+ALTER TABLE belge_analiz_log ADD COLUMN model_kademesi INTEGER;   -- 1 = küçük model, 2 = büyük model
+ALTER TABLE belge_analiz_log ADD COLUMN yukseltme_nedeni TEXT;    -- sonuc_yok, validasyon, capraz_dogrulama, eksik_alan (virgülle)
@@ -0,0 +1,9 @@
+-- Migration 006: Aynı metinli chunk'ların önceki sonucunu yeniden kullan
+-- Tarih: 2026-10-19
+-- Amaç: chunk_text_hash artık dolduruluyor; sonuç ancak aynı prompt (sistem
+--       promptu + belge tipi + şablon) ve aynı modelle üretildiyse yeniden
+--       kullanılır. prompt_hash şablon değişince eski sonuçları devre dışı bırakır.
+
+ALTER TABLE chunk_sonuclari ADD COLUMN prompt_hash TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_chunk_hash ON chunk_sonuclari(chunk_text_hash, prompt_hash);
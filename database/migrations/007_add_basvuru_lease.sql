@@ -0,0 +1,10 @@
+-- Migration 007: Paralel analiz worker'ları için başvuru kirası (lease)
+-- Tarih: 2026-10-19
+-- Amaç: python main.py --analyze --workers N ile aynı anda çalışan worker'lar
+--       başvuruları tek UPDATE ile kiralar; iki worker aynı başvuruyu almaz.
+--       Çöken worker'ın kirası kilit_bitis dolunca başka worker'a geçer.
+
+ALTER TABLE basvurular ADD COLUMN islem_sahibi TEXT;   -- Kiralayan worker (host:pid:...)
+ALTER TABLE basvurular ADD COLUMN kilit_bitis TEXT;    -- Kira bitişi (UTC, datetime('now') biçimi)
+
+CREATE INDEX IF NOT EXISTS idx_basvurular_kilit ON basvurular(islendiMi, kilit_bitis);
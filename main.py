@@ -4,6 +4,8 @@ Ana uygulama entry point.
 Kullanım:
     python main.py --import json_file.json
     python main.py --analyze --limit 10
+    python main.py --analyze --basvuru-id 123   (tek başvuruyu öncelikli yeniden analiz)
+    python main.py --analyze --workers 4        (4 worker süreciyle paralel analiz)
     python main.py --validate --basvuru-id 123
 """
 
@@ -26,6 +28,8 @@ from services import JSONParser
 from models import Basvuru, Belge
 from analyzers import CVAnalyzer, DiplomaAnalyzer, SGKAnalyzer, AdliSicilAnalyzer, ProjeAnalyzer
 from services.validation_service import ValidationService
+from services.basvuru_worker import configured_workers, print_run_stats, process_basvuru, run_worker_pool
+from app.services.llm_scheduler import BACKFILL, INTERACTIVE, PRIORITIES, llm_priority
 
 # Logging yapılandırması
 logging.basicConfig(
@@ -63,36 +67,57 @@ def import_json(file_path: str):
             print(f"[HATA] Başvuru kaydedilemedi: {item.get('takipNo')}")
 
 
-def analyze_basvuru(limit: int = None):
-    """İşlenmemiş başvuruları analiz et - YENİ GELİŞMİŞ İŞ AKIŞI"""
-    print(f"[INFO] İşlenmemiş başvurular analiz ediliyor (Gelişmiş İş Akışı)...")
+def analyze_basvuru(limit: int = None, basvuru_id: int = None):
+    """
+    İşlenmemiş başvuruları analiz et - YENİ GELİŞMİŞ İŞ AKIŞI
 
-    from services.analysis_orchestrator import AnalysisOrchestrator
+    basvuru_id verilirse sadece o başvuru (işlenmiş olsa da) yeniden analiz edilir.
+    """
+    from services.ollama_service import OllamaService
 
-    basvurular = Basvuru.get_unprocessed(limit=limit)
+    ollama = OllamaService()
+    if basvuru_id is not None:
+        print(f"[INFO] Başvuru {basvuru_id} yeniden analiz ediliyor...")
+        basvuru = Basvuru.get_by_id(basvuru_id, id_column='basvuruId')
+        basvurular = [basvuru] if basvuru else []
+    else:
+        print(f"[INFO] İşlenmemiş başvurular analiz ediliyor (Gelişmiş İş Akışı)...")
+        basvurular = Basvuru.get_unprocessed(limit=limit)
     print(f"[INFO] {len(basvurular)} başvuru bulundu")
 
+    if not basvurular:
+        ollama.cool_down()
+        return
+
+    # Modelleri yükle: ilk belge model yükleme süresini (ve timeout'u) beklemesin
+    print(f"[INFO] Ollama modelleri yükleniyor...")
+    if not ollama.warm_up():
+        print(f"[HATA] Ollama hazır değil, analiz başlatılmadı")
+        return
+
     for i, basvuru in enumerate(basvurular, 1):
-        print(f"\n{'='*80}")
-        print(f"[{i}/{len(basvurular)}] Başvuru {basvuru['takipNo']} işleniyor...")
-        print(f"{'='*80}")
+        process_basvuru(basvuru, f"[{i}/{len(basvurular)}]")
+
+    print_run_stats()
 
-        try:
-            # Gelişmiş orchestrator ile analiz
-            orchestrator = AnalysisOrchestrator(basvuru['basvuruId'])
-            success = orchestrator.run()
+    # Kuyruk boşaldı: modelleri bırak
+    ollama.cool_down()
 
-            if success:
-                print(f"\n✓✓✓ Başvuru başarıyla işlendi: {basvuru['takipNo']}")
-            else:
-                print(f"\n✗✗✗ Başvuru işlenemedi: {basvuru['takipNo']}")
 
-        except Exception as e:
-            logger.error(f"Başvuru işleme hatası: {e}", exc_info=True)
-            print(f"\n✗✗✗ Kritik hata: {e}")
+def analyze_parallel(workers: int, limit: int = None, priority: str = None):
+    """
+    İşlenmemiş başvuruları N worker süreciyle analiz et
 
-            # Hata durumunda başvuru durumunu güncelle
-            Basvuru.mark_as_processed(basvuru['basvuruId'], success=False, error_msg=str(e))
+    Worker'lar başvuruları kiralayarak alır (bkz. services/basvuru_worker.py).
+    """
+    from services.ollama_service import OllamaService
+
+    print(f"[INFO] İşlenmemiş başvurular {workers} worker ile analiz ediliyor...")
+    dispatched = run_worker_pool(workers, limit=limit, priority=priority)
+    print(f"\n[INFO] {dispatched} başvuru worker'lara dağıtıldı")
+
+    # Kuyruk boşaldı: modelleri bırak
+    OllamaService().cool_down()
 
 
 def validate_basvuru(basvuru_id: int):
@@ -134,14 +159,30 @@ def main():
     parser.add_argument('--validate', action='store_true', help='Başvuruyu validate et')
     parser.add_argument('--limit', type=int, help='İşlenecek başvuru sayısı')
     parser.add_argument('--basvuru-id', type=int, help='Başvuru ID')
+    parser.add_argument('--no-cache', action='store_true', help='LLM yanıt cache\'ini okuma (yanıtlar yine yazılır)')
+    parser.add_argument('--workers', type=int,
+                        help='Paralel analiz worker sayısı (default: sistem_config parallel_processing / max_workers)')
+    parser.add_argument('--priority', choices=PRIORITIES,
+                        help='LLM öncelik sınıfı (default: --basvuru-id ile interactive, toplu çalıştırmada backfill)')
     
     args = parser.parse_args()
+
+    if args.no_cache:
+        from services.ollama_service import get_response_cache
+        get_response_cache().bypass = True
     
     if args.import_file:
         import_json(args.import_file)
     
     elif args.analyze:
-        analyze_basvuru(limit=args.limit)
+        # Tek başvurunun yeniden analizi toplu işin önüne geçer
+        priority = args.priority or (INTERACTIVE if args.basvuru_id else BACKFILL)
+        workers = 1 if args.basvuru_id else (args.workers or configured_workers())
+        if workers > 1:
+            analyze_parallel(workers, limit=args.limit, priority=priority)
+        else:
+            with llm_priority(priority):
+                analyze_basvuru(limit=args.limit, basvuru_id=args.basvuru_id)
     
     elif args.validate:
         if not args.basvuru_id:
@@ -7,7 +7,7 @@ from datetime import datetime
 import json
 import logging
 
-from .database import BaseModel, db
+from .database import BaseModel, DatabaseManager, db
 
 logger = logging.getLogger(__name__)
 
@@ -77,9 +77,11 @@ class Basvuru(BaseModel):
         Returns:
             List[Dict]: Başvuru listesi
         """
+        # Başka bir worker'ın kiraladığı (işlemekte olduğu) başvurular hariç
         query = f"""
             SELECT * FROM {cls.table_name}
             WHERE islendiMi = 0
+              AND (kilit_bitis IS NULL OR kilit_bitis < datetime('now'))
             ORDER BY basvuruTarihi DESC
         """
 
@@ -88,6 +90,130 @@ class Basvuru(BaseModel):
 
         return db.fetchall(query)
 
+    @classmethod
+    def claim_next(cls, worker_id: str, lease_seconds: int, not_finished_since: str) -> Optional[Dict]:
+        """
+        Sıradaki işlenmemiş başvuruyu worker adına kirala.
+
+        Seçim ve kiralama tek UPDATE ile yapılır (SQLite yazma kilidi):
+        aynı anda çalışan iki worker aynı başvuruyu alamaz. Kirası dolmuş
+        (çökmüş worker'ın) başvurular tekrar alınabilir.
+
+        Args:
+            worker_id: Worker kimliği (host:pid:...)
+            lease_seconds: Kira süresi (renew_lease ile uzatılır)
+            not_finished_since: Bu zamandan sonra bitirilmiş (hata / bekletme)
+                başvurular atlanır; aynı çalıştırmada tekrar denenmez
+
+        Returns:
+            Dict or None: Kiralanan başvuru, kuyruk boşsa None
+        """
+        query = f"""
+            UPDATE {cls.table_name}
+            SET islem_sahibi = ?, kilit_bitis = datetime('now', ?)
+            WHERE basvuruId = (
+                SELECT basvuruId FROM {cls.table_name}
+                WHERE islendiMi = 0
+                  AND (kilit_bitis IS NULL OR kilit_bitis < datetime('now'))
+                  AND (islenme_bitis IS NULL OR islenme_bitis < ?)
+                ORDER BY basvuruTarihi DESC
+                LIMIT 1
+            )
+        """
+        with db.get_cursor() as cursor:
+            cursor.execute(query, (worker_id, f"+{lease_seconds} seconds", not_finished_since))
+            if cursor.rowcount == 0:
+                return None
+
+        query = f"SELECT * FROM {cls.table_name} WHERE islem_sahibi = ? AND islendiMi = 0"
+        return db.fetchone(query, (worker_id,))
+
+    @classmethod
+    def renew_lease(
+        cls,
+        basvuru_id: int,
+        worker_id: str,
+        lease_seconds: int,
+        database: Optional[DatabaseManager] = None
+    ) -> bool:
+        """
+        Kirayı uzat (heartbeat).
+
+        Args:
+            basvuru_id: Başvuru ID
+            worker_id: Worker kimliği
+            lease_seconds: Yeni kira süresi (şimdiden itibaren)
+            database: Bağlantı (heartbeat thread'i kendi bağlantısını verir)
+
+        Returns:
+            bool: Kira hâlâ bu worker'daysa True
+        """
+        query = f"""
+            UPDATE {cls.table_name}
+            SET kilit_bitis = datetime('now', ?)
+            WHERE basvuruId = ? AND islem_sahibi = ?
+        """
+        with (database or db).get_cursor() as cursor:
+            cursor.execute(query, (f"+{lease_seconds} seconds", basvuru_id, worker_id))
+            return cursor.rowcount > 0
+
+    @classmethod
+    def release_lease(cls, basvuru_id: int, worker_id: str) -> bool:
+        """
+        Kirayı bırak (başvuru işlendi, hata aldı ya da bekletildi).
+
+        Returns:
+            bool: Kira bu worker'daysa True
+        """
+        query = f"""
+            UPDATE {cls.table_name}
+            SET islem_sahibi = NULL, kilit_bitis = NULL
+            WHERE basvuruId = ? AND islem_sahibi = ?
+        """
+        with db.get_cursor() as cursor:
+            cursor.execute(query, (basvuru_id, worker_id))
+            return cursor.rowcount > 0
+
+    @classmethod
+    def release_leases(cls, owner_prefix: str) -> int:
+        """
+        Kimliği owner_prefix ile başlayan worker'ların tüm kiralarını bırak
+        (zorla sonlandırılan worker havuzu).
+
+        Returns:
+            int: Bırakılan kira sayısı
+        """
+        query = f"""
+            UPDATE {cls.table_name}
+            SET islem_sahibi = NULL, kilit_bitis = NULL
+            WHERE substr(islem_sahibi, 1, ?) = ?
+        """
+        with db.get_cursor() as cursor:
+            cursor.execute(query, (len(owner_prefix), owner_prefix))
+            return cursor.rowcount
+
+    @classmethod
+    def recover_stale_leases(cls) -> List[Dict]:
+        """
+        Kirası dolmuş (çöken / öldürülen worker'dan kalan) kiraları temizle.
+
+        Returns:
+            List[Dict]: Serbest bırakılan başvurular (basvuruId, takipNo, islem_sahibi)
+        """
+        query = f"""
+            SELECT basvuruId, takipNo, islem_sahibi FROM {cls.table_name}
+            WHERE kilit_bitis IS NOT NULL AND kilit_bitis < datetime('now')
+        """
+        stale = db.fetchall(query)
+        if stale:
+            query = f"""
+                UPDATE {cls.table_name}
+                SET islem_sahibi = NULL, kilit_bitis = NULL
+                WHERE kilit_bitis IS NOT NULL AND kilit_bitis < datetime('now')
+            """
+            db.execute(query)
+        return stale
+
     @classmethod
     def mark_as_processing(cls, basvuru_id: int) -> bool:
         """
@@ -4,6 +4,7 @@ SQLite veritabanı yönetimi ve base model sınıfı.
 
 import sqlite3
 import json
+import threading
 from pathlib import Path
 from typing import Optional, List, Dict, Any, Tuple
 from contextlib import contextmanager
@@ -28,6 +29,9 @@ class DatabaseManager:
         """
         self.db_path = db_path
         self._connection: Optional[sqlite3.Connection] = None
+        # Bağlantı thread'ler arasında paylaşılır: işlemler (cursor → commit / rollback)
+        # birbirine karışmasın diye sırayla çalışır
+        self._lock = threading.RLock()
 
     def connect(self) -> sqlite3.Connection:
         """
@@ -36,31 +40,33 @@ class DatabaseManager:
         Returns:
             sqlite3.Connection: Veritabanı bağlantısı
         """
-        if self._connection is None:
-            logger.info(f"Veritabanına bağlanılıyor: {self.db_path}")
-            self._connection = sqlite3.connect(
-                str(self.db_path),
-                check_same_thread=False,
-                timeout=30.0
-            )
+        with self._lock:
+            if self._connection is None:
+                logger.info(f"Veritabanına bağlanılıyor: {self.db_path}")
+                self._connection = sqlite3.connect(
+                    str(self.db_path),
+                    check_same_thread=False,
+                    timeout=30.0
+                )
 
-            # Row factory ayarla (dict gibi erişim için)
-            self._connection.row_factory = sqlite3.Row
+                # Row factory ayarla (dict gibi erişim için)
+                self._connection.row_factory = sqlite3.Row
 
-            # Pragmaları ayarla
-            for pragma, value in SQLITE_PRAGMAS.items():
-                self._connection.execute(f"PRAGMA {pragma} = {value}")
+                # Pragmaları ayarla
+                for pragma, value in SQLITE_PRAGMAS.items():
+                    self._connection.execute(f"PRAGMA {pragma} = {value}")
 
-            logger.info("Veritabanı bağlantısı başarılı")
+                logger.info("Veritabanı bağlantısı başarılı")
 
-        return self._connection
+            return self._connection
 
     def close(self):
         """Veritabanı bağlantısını kapat"""
-        if self._connection:
-            self._connection.close()
-            self._connection = None
-            logger.info("Veritabanı bağlantısı kapatıldı")
+        with self._lock:
+            if self._connection:
+                self._connection.close()
+                self._connection = None
+                logger.info("Veritabanı bağlantısı kapatıldı")
 
     @contextmanager
     def get_cursor(self):
@@ -74,17 +80,18 @@ class DatabaseManager:
             with db.get_cursor() as cursor:
                 cursor.execute("SELECT * FROM basvurular")
         """
-        conn = self.connect()
-        cursor = conn.cursor()
-        try:
-            yield cursor
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"Veritabanı işlem hatası: {e}")
-            raise
-        finally:
-            cursor.close()
+        with self._lock:
+            conn = self.connect()
+            cursor = conn.cursor()
+            try:
+                yield cursor
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Veritabanı işlem hatası: {e}")
+                raise
+            finally:
+                cursor.close()
 
     def execute(self, query: str, params: Optional[tuple] = None) -> sqlite3.Cursor:
         """
@@ -24,6 +24,9 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from app.core.document_processor import DocumentProcessor
 from app.config import settings
+from app.services.circuit_breaker import LLMUnavailableError
+from app.services.ollama_client import llm_stats
+from app.services.llm_scheduler import BACKFILL, PRIORITIES, llm_priority
 
 DB_PATH = Path("data/basvurular.db")
 TEMP_DIR = Path("temp/analiz")
@@ -237,8 +240,17 @@ def analiz_kaydet(takip_no: str, master_json: Dict, durum: str):
 async def main():
     parser = argparse.ArgumentParser(description='Veritabanındaki başvuruları analiz et')
     parser.add_argument('--limit', type=int, default=10, help='Kaç başvuru analiz edilecek (default: 10)')
+    parser.add_argument('--no-cache', action='store_true', help='LLM yanıt cache\'ini okuma (yanıtlar yine yazılır)')
+    parser.add_argument('--priority', choices=PRIORITIES, default=BACKFILL,
+                        help='LLM öncelik sınıfı (default: backfill, etkileşimli isteklere slot bırakır)')
     args = parser.parse_args()
 
+    with llm_priority(args.priority):
+        await analiz_calistir(args)
+
+
+async def analiz_calistir(args):
+    """Analiz edilmemiş başvuruları sırayla işle"""
     print("=" * 80)
     print("🚀 BAŞVURU ANALİZİ")
     print(f"Tarih: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -251,6 +263,7 @@ async def main():
     print(f"\n🔗 Ollama: {settings.OLLAMA_BASE_URL}")
     print(f"🤖 Model: {settings.OLLAMA_MODEL}")
     processor = DocumentProcessor()
+    processor.ollama_service.cache.bypass = args.no_cache
 
     # Analiz edilmemiş başvuruları al
     print(f"\n📥 Analiz edilmemiş başvurular alınıyor (limit: {args.limit})...")
@@ -259,11 +272,19 @@ async def main():
 
     if not basvurular:
         print("\n⚠️  Analiz edilecek başvuru yok!")
+        processor.ollama_service.cool_down()
+        return
+
+    # Modeli yükle: ilk belge model yükleme süresini (ve timeout'u) beklemesin
+    print(f"\n🔥 Model yükleniyor...")
+    if not processor.ollama_service.warm_up():
+        print("❌ Ollama hazır değil, analiz başlatılmadı")
         return
 
     # Her başvuruyu analiz et
     basarili = 0
     hatali = 0
+    bekletilen = 0
 
     for idx, basvuru in enumerate(basvurular, 1):
         try:
@@ -272,17 +293,49 @@ async def main():
             print(f"  ✅ BAŞARILI\n")
             basarili += 1
 
+        except LLMUnavailableError as e:
+            # Kayıt yazılmaz: başvuru analiz edilmemiş sayılır, sonraki çalıştırmada tekrar alınır
+            print(f"  ⏸️  BEKLETİLDİ (LLM erişilemiyor): {str(e)}\n")
+            bekletilen += 1
+
         except Exception as e:
             print(f"  ❌ HATA: {str(e)}\n")
             error_json = {"error": str(e), "timestamp": datetime.now().isoformat()}
             analiz_kaydet(basvuru["takip_no"], error_json, "hata")
             hatali += 1
 
+    # Kuyruk boşaldı: modeli bırak
+    processor.ollama_service.cool_down()
+
     print("\n" + "=" * 80)
     print(f"✅ ANALİZ TAMAMLANDI")
     print(f"   Başarılı: {basarili}")
     print(f"   Hatalı: {hatali}")
-    print(f"   Toplam: {basarili + hatali}")
+    print(f"   Bekletilen: {bekletilen}")
+    print(f"   Toplam: {basarili + hatali + bekletilen}")
+    cache_stats = processor.ollama_service.cache.stats()
+    print(f"   LLM cache: {cache_stats['hits']} hit / {cache_stats['misses']} miss ({cache_stats['entries']} kayıt)")
+    call_stats = llm_stats.to_dict()
+    print(
+        f"   LLM çağrı: {call_stats['calls']} | retry: {call_stats['retries']} | "
+        f"reddedilen (devre açık): {call_stats['rejected']} | "
+        f"JSON hatası: {call_stats['parse_failures']} | "
+        f"ort. çıktı: {call_stats['avg_output_tokens']:.0f} token"
+        f"{' (structured output)' if settings.OLLAMA_STRUCTURED_OUTPUT else ''}"
+    )
+    usage = call_stats['usage']
+    if usage['bound']:
+        print(
+            f"   LLM süre: prompt {usage['prompt_seconds']:.1f}s ({usage['prompt_tokens_per_sec'] or 0:.0f} tok/s) | "
+            f"üretim {usage['eval_seconds']:.1f}s ({usage['eval_tokens_per_sec'] or 0:.0f} tok/s) | "
+            f"yükleme {usage['load_seconds']:.1f}s -> "
+            f"{'prompt-bound' if usage['bound'] == 'prompt' else 'generation-bound'} "
+            f"(prompt payı: {usage['prompt_share']:.0%})"
+        )
+    processor.ollama_service.log_sink.flush()
+    log_stats = processor.ollama_service.log_sink.stats()
+    if log_stats['enabled']:
+        print(f"   LLM log: {log_stats['written']} kayıt ({log_stats['dropped']} düşürüldü) -> {settings.LLM_LOG_DIR}")
     print("=" * 80)
 
 
@@ -0,0 +1,165 @@
+"""
+Chunker benchmark'ı ve regresyon kontrolü
+
+ChunkManager'ın karakter bazlı chunk'lamasını eski uygulamayla (her chunk
+için ±200 karakterlik pencerede re.finditer + min) karşılaştırır:
+- iki uygulamanın ürettiği chunk'lar (index, start, end, text) birebir aynı mı
+- tüm metin ve sadece ilk chunk için süre (iki tarafta da chunk hash'i
+  dahil; hash'siz sınır arama süresi ayrıca verilir)
+
+Metin verilmezse cümle / satır / uzun kelime karışımı sentetik metinler
+(varsayılan 1 MB) üretilir.
+
+Kullanım:
+    python scripts/benchmark_chunker.py
+    python scripts/benchmark_chunker.py --size 1000000 --texts 5 --repeat 3
+    python scripts/benchmark_chunker.py belge.txt --chunk-size 2000 --overlap 100
+"""
+import sys
+import os
+import re
+import time
+import random
+import argparse
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.settings import CHUNK_SIZE, CHUNK_OVERLAP
+from services.chunk_manager import ChunkManager, chunk_hash
+
+WORDS = (
+    "başvuru belge sigortalı hizmet dökümü işyeri sicil numarası gün prim tarih mühendis "
+    "diploma üniversite fakülte mezuniyet proje enerji verimliliği etüt rapor firma ünvan"
+).split()
+
+
+def legacy_chunks(text: str, chunk_size: int, overlap: int) -> List[Tuple[int, int, int, str]]:
+    """Eski karakter bazlı chunk'lama (referans, max_chunks'sız)"""
+    chunks = []
+    start = 0
+    index = 0
+
+    while start < len(text):
+        target_end = start + chunk_size
+
+        if target_end >= len(text):
+            target_end = len(text)
+            chunk_text = text[start:target_end]
+        else:
+            search_range = 200
+            search_start = max(start, target_end - search_range)
+            search_end = min(len(text), target_end + search_range)
+            search_text = text[search_start:search_end]
+
+            sentence_endings = list(re.finditer(r'[.!?]\s+', search_text))
+
+            if sentence_endings:
+                best_match = min(sentence_endings,
+                                 key=lambda m: abs((search_start + m.end()) - target_end))
+                actual_end = search_start + best_match.end()
+                chunk_text = text[start:actual_end]
+            else:
+                space_pos = text.rfind(' ', target_end - 100, target_end + 100)
+                if space_pos != -1:
+                    chunk_text = text[start:space_pos]
+                else:
+                    chunk_text = text[start:target_end]
+
+        chunks.append((index, start, start + len(chunk_text), chunk_text.strip()))
+
+        if start + len(chunk_text) >= len(text):
+            break
+
+        start = start + len(chunk_text) - overlap
+        index += 1
+
+    return chunks
+
+
+def synthetic_text(size: int, seed: int) -> str:
+    """Cümle sonları, boşluk öbekleri, satırlar ve noktalamasız uzun bloklar içeren metin"""
+    rng = random.Random(seed)
+    parts = []
+    total = 0
+    while total < size:
+        kind = rng.random()
+        if kind < 0.05:
+            # Noktalamasız / boşluksuz blok (kelime sınırı fallback'i)
+            part = "X" * rng.randint(50, 600)
+        elif kind < 0.15:
+            # Noktalamasız uzun paragraf (cümle sonu bulunamayan pencere)
+            part = " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 120)))
+        else:
+            words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 25)))
+            part = words + rng.choice(".!?") + rng.choice([" ", "  ", "\n", " \n\n", "\t ", "", "."])
+        parts.append(part)
+        total += len(part) + 1
+    return " ".join(parts)[:size]
+
+
+def timed(fn, repeat: int) -> Tuple[float, object]:
+    """En iyi süre (sn) ve son sonuç"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunker benchmark'ı ve regresyon kontrolü")
+    parser.add_argument('files', nargs='*', help='Metin dosyaları (verilmezse sentetik metin)')
+    parser.add_argument('--size', type=int, default=1_000_000, help='Sentetik metin boyutu (karakter)')
+    parser.add_argument('--texts', type=int, default=3, help='Sentetik metin sayısı')
+    parser.add_argument('--repeat', type=int, default=3, help='Ölçüm tekrarı (en iyisi alınır)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--overlap', type=int, default=CHUNK_OVERLAP)
+    args = parser.parse_args()
+
+    if args.files:
+        sources = [(Path(f).name, Path(f).read_text(encoding='utf-8', errors='replace')) for f in args.files]
+    else:
+        sources = [(f"sentetik-{i} ({args.size} kr)", synthetic_text(args.size, seed=i)) for i in range(args.texts)]
+
+    manager = ChunkManager(chunk_size=args.chunk_size, overlap=args.overlap)
+
+    print("=" * 112)
+    print(
+        f"{'Metin':<28} {'Chunk':>6} {'Eski sn':>9} {'Yeni sn':>9} {'Hızlanma':>9} "
+        f"{'Sınır (eski/yeni)':>18} {'İlk chunk sn':>13} {'Aynı':>6}"
+    )
+    print("=" * 112)
+
+    mismatches = 0
+    for name, text in sources:
+        bound_old_sec, old = timed(lambda: legacy_chunks(text, args.chunk_size, args.overlap), args.repeat)
+        hash_sec, _ = timed(lambda: [chunk_hash(c[3]) for c in old], args.repeat)
+        old_sec = bound_old_sec + hash_sec
+        new_sec, new = timed(lambda: manager.create_chunks(text), args.repeat)
+        bound_new_sec = max(0.0, new_sec - hash_sec)
+        first_sec, _ = timed(lambda: next(manager.iter_chunks(text)), args.repeat)
+
+        same = old == [(c.index, c.start, c.end, c.text) for c in new]
+        if not same:
+            mismatches += 1
+
+        bound_col = f"{bound_old_sec:.4f}/{bound_new_sec:.4f}"
+        print(
+            f"{name[:28]:<28} {len(new):>6} {old_sec:>9.4f} {new_sec:>9.4f} "
+            f"{old_sec / new_sec if new_sec else 0:>8.1f}x {bound_col:>18} {first_sec:>13.6f} "
+            f"{'evet' if same else 'HAYIR':>6}"
+        )
+
+    print("=" * 112)
+    if mismatches:
+        print(f"[HATA] {mismatches} metinde çıktı eski chunker'dan farklı")
+        sys.exit(1)
+    print("Tüm metinlerde çıktı eski chunker ile birebir aynı")
+
+
+if __name__ == "__main__":
+    main()
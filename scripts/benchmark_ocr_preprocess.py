@@ -0,0 +1,151 @@
+"""
+OCR ön işleme benchmark'ı
+
+Ham sayfa görseli ile ön işlenmiş görseli (grayscale + binarization + deskew +
+kenar/boşluk kırpma) EasyOCR üzerinde karşılaştırır:
+- ön işleme süresi
+- OCR süresi
+- piksel sayısı
+- OCR karakter sayısı
+
+Kullanım:
+    python scripts/benchmark_ocr_preprocess.py belge1.pdf tarama.jpg --pages 2
+    python scripts/benchmark_ocr_preprocess.py --from-db 20 --pages 1
+    python scripts/benchmark_ocr_preprocess.py belge.pdf --no-ocr   # sadece ön işleme
+"""
+import sys
+import os
+import io
+import time
+import base64
+import sqlite3
+import argparse
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pdfplumber
+from PIL import Image
+
+from app.services.image_preprocessor import ImagePreprocessor, PreprocessOptions
+
+DB_PATH = Path("data/basvurular.db")
+
+
+def load_pages(name: str, data: bytes, max_pages: int, dpi: int) -> List[Tuple[str, Image.Image]]:
+    """PDF veya görsel bytes'ını sayfa görsellerine çevir"""
+    if data.startswith(b'%PDF'):
+        pages = []
+        with pdfplumber.open(io.BytesIO(data)) as pdf:
+            for page_num, page in enumerate(pdf.pages[:max_pages], 1):
+                pages.append((f"{name}#s{page_num}", page.to_image(resolution=dpi).original.convert('RGB')))
+        return pages
+
+    return [(name, Image.open(io.BytesIO(data)).convert('RGB'))]
+
+
+def load_from_db(limit: int) -> List[Tuple[str, bytes]]:
+    """Veritabanından taranmış olabilecek belgeleri al"""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT id, belgeTipi, belgeIcerik FROM belgeler WHERE belgeIcerik IS NOT NULL LIMIT ?",
+        (limit,)
+    )
+    rows = cursor.fetchall()
+    conn.close()
+    return [(f"belge_{row[0]} ({row[1]})", base64.b64decode(row[2])) for row in rows]
+
+
+def run_ocr(reader, image_input) -> Tuple[float, int]:
+    """OCR çalıştır, (süre, karakter sayısı) döndür"""
+    start = time.perf_counter()
+    result = reader.readtext(image_input)
+    duration = time.perf_counter() - start
+    return duration, sum(len(detection[1]) for detection in result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR ön işleme benchmark'ı")
+    parser.add_argument('files', nargs='*', help='PDF veya görsel dosyaları')
+    parser.add_argument('--from-db', type=int, default=0, help='Veritabanından N belge al')
+    parser.add_argument('--pages', type=int, default=2, help='PDF başına maksimum sayfa')
+    parser.add_argument('--dpi', type=int, default=300, help='PDF render çözünürlüğü')
+    parser.add_argument('--no-binarize', action='store_true', help='OCR\'a gri görsel ver')
+    parser.add_argument('--no-ocr', action='store_true', help='Sadece ön işleme süresini ölç')
+    args = parser.parse_args()
+
+    sources = [(Path(f).name, Path(f).read_bytes()) for f in args.files]
+    if args.from_db:
+        sources.extend(load_from_db(args.from_db))
+
+    if not sources:
+        parser.error("Dosya veya --from-db belirtilmeli")
+
+    reader = None
+    if not args.no_ocr:
+        try:
+            import easyocr
+            print("EasyOCR reader başlatılıyor...")
+            reader = easyocr.Reader(['tr', 'en'], gpu=False)
+        except ImportError:
+            print("[UYARI] easyocr yüklü değil, sadece ön işleme ölçülecek")
+
+    options = PreprocessOptions(binarize=not args.no_binarize)
+
+    print("=" * 100)
+    print(f"{'Sayfa':<40} {'Piksel (ham→işl.)':>20} {'Ön işl. sn':>10} {'OCR sn (ham/işl.)':>18} {'Karakter (ham/işl.)':>20}")
+    print("=" * 100)
+
+    totals = {'raw_px': 0, 'pre_px': 0, 'pre_sec': 0.0, 'raw_ocr': 0.0, 'pre_ocr': 0.0, 'raw_chars': 0, 'pre_chars': 0}
+
+    for name, data in sources:
+        try:
+            pages = load_pages(name, data, args.pages, args.dpi)
+        except Exception as e:
+            print(f"[SKIP] {name}: {e}")
+            continue
+
+        for page_name, image in pages:
+            raw = np.array(image)
+
+            start = time.perf_counter()
+            processed = ImagePreprocessor.preprocess(image, options)
+            pre_sec = time.perf_counter() - start
+
+            raw_px = raw.shape[0] * raw.shape[1]
+            pre_px = processed.shape[0] * processed.shape[1]
+
+            totals['raw_px'] += raw_px
+            totals['pre_px'] += pre_px
+            totals['pre_sec'] += pre_sec
+
+            ocr_col = char_col = "-"
+            if reader:
+                raw_ocr, raw_chars = run_ocr(reader, raw)
+                pre_ocr, pre_chars = run_ocr(reader, processed)
+                totals['raw_ocr'] += raw_ocr
+                totals['pre_ocr'] += pre_ocr
+                totals['raw_chars'] += raw_chars
+                totals['pre_chars'] += pre_chars
+                ocr_col = f"{raw_ocr:.1f}/{pre_ocr:.1f}"
+                char_col = f"{raw_chars}/{pre_chars}"
+
+            px_col = f"{raw_px / 1e6:.1f}M→{pre_px / 1e6:.1f}M"
+            print(f"{page_name[:40]:<40} {px_col:>20} {pre_sec:>10.2f} {ocr_col:>18} {char_col:>20}")
+
+    print("=" * 100)
+    if totals['raw_px']:
+        print(f"Piksel azalması     : %{100 * (1 - totals['pre_px'] / totals['raw_px']):.1f}")
+    print(f"Toplam ön işleme    : {totals['pre_sec']:.2f} sn")
+    if reader and totals['pre_ocr']:
+        total_pre = totals['pre_ocr'] + totals['pre_sec']
+        print(f"OCR süresi          : ham {totals['raw_ocr']:.1f} sn → ön işlemeli {total_pre:.1f} sn "
+              f"(x{totals['raw_ocr'] / total_pre:.2f})")
+        print(f"OCR karakter sayısı : ham {totals['raw_chars']} → ön işlemeli {totals['pre_chars']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Prompt prefix tekrar kullanımı benchmark'ı
+
+Aynı belgenin chunk'larını iki prompt düzeniyle Ollama'ya gönderir ve
+prompt_eval_count / prompt_eval_duration değerlerini karşılaştırır:
+- eski: giriş + belge metni + şema + talimatlar (get_user_prompt)
+- yeni: giriş + şema + talimatlar + belge metni (get_prefix_first_prompt)
+
+Ollama KV cache'ten gelen prefix token'larını prompt_eval_count'a dahil
+etmez; yeni düzende ikinci chunk'tan itibaren sayının ve sürenin düşmesi
+beklenir. Ölçüm için stream kapalı ve cache devre dışıdır.
+
+Kullanım:
+    python scripts/benchmark_prompt_prefix.py ozgecmis.pdf --type "özgeçmiş/cv"
+    python scripts/benchmark_prompt_prefix.py sgk.txt --type "sgk hizmet dökümü" --chunks 4
+"""
+import sys
+import os
+import argparse
+import statistics
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import settings
+from app.models.schemas import DOCUMENT_SCHEMAS
+from app.prompts import PromptFactory
+from app.services.ollama_client import OllamaClient
+from services.chunk_manager import ChunkManager
+from services.document_processor import DocumentProcessor
+
+
+def load_text(path: Path) -> str:
+    """PDF (metin katmanı) veya düz metin dosyası oku"""
+    data = path.read_bytes()
+    if data.startswith(b'%PDF'):
+        return DocumentProcessor.extract_text_from_pdf(data, use_ocr=False) or ""
+    return data.decode('utf-8', errors='replace')
+
+
+def run_layout(client: OllamaClient, system_prompt: str, prompts: List[str], num_predict: int) -> List[Dict]:
+    """Prompt'ları sırayla gönder, Ollama zamanlama alanlarını topla"""
+    rows = []
+    for prompt in prompts:
+        payload = {
+            "model": settings.OLLAMA_MODEL,
+            "prompt": prompt,
+            "system": system_prompt,
+            "format": "json",
+            "options": {"temperature": 0.1, "num_predict": num_predict},
+            "keep_alive": settings.OLLAMA_KEEP_ALIVE,
+        }
+        result = client.generate(payload, use_cache=False)
+        rows.append({
+            'prompt_eval_count': result.get('prompt_eval_count', 0),
+            'prompt_eval_s': result.get('prompt_eval_duration', 0) / 1e9,
+            'total_s': result.get('duration', 0.0),
+        })
+    return rows
+
+
+def print_rows(name: str, rows: List[Dict]):
+    print(f"\n{name}")
+    print(f"  {'#':>3} {'prompt token':>13} {'prompt eval':>12} {'toplam':>9}")
+    for i, row in enumerate(rows, 1):
+        print(f"  {i:>3} {row['prompt_eval_count']:>13} {row['prompt_eval_s']:>11.2f}s {row['total_s']:>8.2f}s")
+
+    # İlk istek cache'i doldurur; kararlı durum ikinci istekten itibaren
+    steady = rows[1:] or rows
+    print(
+        f"  ort. (2+): {statistics.mean(r['prompt_eval_count'] for r in steady):.0f} token, "
+        f"{statistics.mean(r['prompt_eval_s'] for r in steady):.2f}s prompt eval, "
+        f"{statistics.mean(r['total_s'] for r in steady):.2f}s toplam"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt prefix tekrar kullanımı benchmark'ı")
+    parser.add_argument('file', help='PDF veya metin dosyası')
+    parser.add_argument('--type', required=True, help='Belge tipi (DOCUMENT_SCHEMAS anahtarı)')
+    parser.add_argument('--basvuru-turu', default=None, help='Başvuru türü (prompt seçimi için)')
+    parser.add_argument('--chunks', type=int, default=4, help='Gönderilecek chunk sayısı')
+    parser.add_argument('--num-predict', type=int, default=16, help='Çıktı token sınırı (prompt eval odaklı)')
+    args = parser.parse_args()
+
+    schema = DOCUMENT_SCHEMAS.get(args.type)
+    template = PromptFactory.create_prompt(args.type, args.basvuru_turu)
+    if schema is None or template is None:
+        print(f"Bilinmeyen belge tipi: {args.type}")
+        print(f"Geçerli tipler: {', '.join(DOCUMENT_SCHEMAS)}")
+        sys.exit(1)
+
+    text = load_text(Path(args.file))
+    chunks = ChunkManager().create_chunks(text, max_chunks=args.chunks)
+    if len(chunks) < 2:
+        print("Uyarı: belge tek chunk, prefix tekrar kullanımı ölçülemez")
+
+    client = OllamaClient(
+        settings.OLLAMA_BACKENDS or [settings.OLLAMA_BASE_URL],
+        timeout=settings.OLLAMA_TIMEOUT,
+        verify=settings.OLLAMA_VERIFY_SSL,
+        stream=False
+    )
+    system_prompt = template.get_system_prompt()
+
+    print(f"Model: {settings.OLLAMA_MODEL} | Belge: {args.file} | {len(chunks)} chunk")
+
+    old_rows = run_layout(
+        client, system_prompt, [template.get_user_prompt(c.text, schema) for c in chunks], args.num_predict
+    )
+    new_rows = run_layout(
+        client, system_prompt, [template.get_prefix_first_prompt(c.text, schema) for c in chunks], args.num_predict
+    )
+
+    print_rows("ESKİ DÜZEN (metin ortada)", old_rows)
+    print_rows("YENİ DÜZEN (statik prefix önde)", new_rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Çıktı formatı benchmark'ı (serbest metin / JSON modu / JSON Schema)
+
+Aynı belgenin chunk'larını üç `format` değeriyle Ollama'ya gönderir ve
+karşılaştırır:
+- serbest: format yok (CLI analyzer'larının OLLAMA_JSON_FORMAT=false davranışı)
+- json: format "json" (CLI analyzer'ları, OLLAMA_STRUCTURED_OUTPUT=false API)
+- şema: DOCUMENT_SCHEMAS'tan derlenen JSON Schema (API varsayılanı)
+
+Her chunk yanıtı ayrıştırılır; ayrıştırılamazsa aynı istek --retries kez
+tekrar gönderilir. Raporlanan: ilk denemede JSON hatası, retry sayısı,
+tüm denemelerden sonra kalan hata, çıktı token'ı (eval_count) ve süre.
+Ölçüm için stream kapalı ve cache devre dışıdır.
+
+Kullanım:
+    python scripts/benchmark_structured_output.py ozgecmis.pdf --type "özgeçmiş/cv"
+    python scripts/benchmark_structured_output.py sgk.txt --type "sgk hizmet dökümü" --chunks 8 --repeat 3
+"""
+import sys
+import os
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import settings
+from app.models.json_schema import get_output_format
+from app.models.schemas import DOCUMENT_SCHEMAS
+from app.prompts import PromptFactory
+from app.services.ollama_client import OllamaClient
+from services.chunk_manager import ChunkManager
+from services.document_processor import DocumentProcessor
+from services.ollama_service import parse_json_response
+
+
+def load_text(path: Path) -> str:
+    """PDF (metin katmanı) veya düz metin dosyası oku"""
+    data = path.read_bytes()
+    if data.startswith(b'%PDF'):
+        return DocumentProcessor.extract_text_from_pdf(data, use_ocr=False) or ""
+    return data.decode('utf-8', errors='replace')
+
+
+def run_mode(client: OllamaClient, system_prompt: str, prompts: List[str],
+             output_format: Any, retries: int) -> Dict[str, Any]:
+    """Prompt'ları verilen format ile gönder, ayrıştırma / retry / token sayaçlarını topla"""
+    row = {'chunks': len(prompts), 'calls': 0, 'parse_failures': 0, 'retries': 0,
+           'failed': 0, 'output_tokens': 0, 'seconds': 0.0}
+
+    for prompt in prompts:
+        payload = {
+            "model": settings.OLLAMA_MODEL,
+            "prompt": prompt,
+            "system": system_prompt,
+            "options": {"temperature": 0.1},
+            "keep_alive": settings.OLLAMA_KEEP_ALIVE,
+        }
+        if output_format is not None:
+            payload["format"] = output_format
+
+        for attempt in range(retries + 1):
+            result = client.generate(payload, use_cache=False)
+            row['calls'] += 1
+            row['output_tokens'] += result.get('eval_count') or 0
+            row['seconds'] += result.get('duration', 0.0)
+            try:
+                parse_json_response(result.get('response', ''))
+                break
+            except ValueError:
+                if attempt == 0:
+                    row['parse_failures'] += 1
+                if attempt == retries:
+                    row['failed'] += 1
+                else:
+                    row['retries'] += 1
+
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Çıktı formatı (serbest / json / şema) benchmark'ı")
+    parser.add_argument('file', help='PDF veya metin dosyası')
+    parser.add_argument('--type', required=True, help='Belge tipi (DOCUMENT_SCHEMAS anahtarı)')
+    parser.add_argument('--basvuru-turu', default=None, help='Başvuru türü (prompt seçimi için)')
+    parser.add_argument('--chunks', type=int, default=8, help='Gönderilecek chunk sayısı')
+    parser.add_argument('--repeat', type=int, default=1, help='Chunk listesinin tekrar sayısı')
+    parser.add_argument('--retries', type=int, default=2, help='JSON hatasında tekrar deneme sayısı')
+    args = parser.parse_args()
+
+    schema = DOCUMENT_SCHEMAS.get(args.type)
+    template = PromptFactory.create_prompt(args.type, args.basvuru_turu)
+    if schema is None or template is None:
+        print(f"Bilinmeyen belge tipi: {args.type}")
+        print(f"Geçerli tipler: {', '.join(DOCUMENT_SCHEMAS)}")
+        sys.exit(1)
+
+    text = load_text(Path(args.file))
+    chunks = ChunkManager().create_chunks(text, max_chunks=args.chunks)
+    prompts = [template.get_prefix_first_prompt(c.text, schema) for c in chunks] * args.repeat
+
+    client = OllamaClient(
+        settings.OLLAMA_BACKENDS or [settings.OLLAMA_BASE_URL],
+        timeout=settings.OLLAMA_TIMEOUT,
+        verify=settings.OLLAMA_VERIFY_SSL,
+        stream=False
+    )
+    system_prompt = template.get_system_prompt()
+
+    print(f"Model: {settings.OLLAMA_MODEL} | Belge: {args.file} | {len(prompts)} istek / format")
+
+    modes = [("serbest", None), ("json", "json"), ("şema", get_output_format(schema))]
+    rows = [(name, run_mode(client, system_prompt, prompts, fmt, args.retries)) for name, fmt in modes]
+
+    print("=" * 96)
+    print(
+        f"{'Format':<9} {'Çağrı':>6} {'JSON hatası':>12} {'Retry':>6} {'Kalan hata':>11} "
+        f"{'Çıktı token':>12} {'Ort. token':>11} {'Süre sn':>9}"
+    )
+    print("=" * 96)
+    for name, row in rows:
+        print(
+            f"{name:<9} {row['calls']:>6} {row['parse_failures']:>5}/{row['chunks']:<6} {row['retries']:>6} "
+            f"{row['failed']:>11} {row['output_tokens']:>12} "
+            f"{row['output_tokens'] / row['calls'] if row['calls'] else 0:>11.0f} {row['seconds']:>9.1f}"
+        )
+    print("=" * 96)
+
+
+if __name__ == '__main__':
+    main()
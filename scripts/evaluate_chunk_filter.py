@@ -0,0 +1,178 @@
+"""
+Chunk ilgililik filtresi recall ölçümü
+
+Etiketli chunk örneği üzerinde RelevanceProfile'ın atladığı chunk oranını
+(skip rate) ve ilgili chunk'ları kaçırma oranını (recall) raporlar.
+
+Etiket dosyası (JSONL, satır başına bir chunk):
+    {"belge_id": 12, "document_type": "Özgeçmiş/CV", "chunk_index": 3,
+     "text": "...", "relevant": true}
+
+--export-db ile etiket taslağı veritabanından üretilir: filtre kapalıyken
+(CHUNK_RELEVANCE_FILTER=false) yapılmış analizlerin chunk_sonuclari
+kayıtları okunur, chunk metni belgeden yeniden çıkarılır ve LLM yanıtında
+en az bir dolu alan varsa chunk "relevant" etiketlenir. Taslak elle
+gözden geçirilip ölçümde kullanılır.
+
+Kullanım:
+    python scripts/evaluate_chunk_filter.py --export-db etiketler.jsonl --limit 50
+    python scripts/evaluate_chunk_filter.py etiketler.jsonl --min-recall 0.98
+"""
+import sys
+import os
+import json
+import argparse
+from collections import defaultdict
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.extraction_profiles import get_extraction_profile
+from app.models.relevance_profiles import get_relevance_profile
+
+
+def has_content(value: Any) -> bool:
+    """LLM yanıtında en az bir dolu alan var mı?"""
+    if isinstance(value, dict):
+        return any(has_content(v) for v in value.values())
+    if isinstance(value, list):
+        return any(has_content(v) for v in value)
+    return value not in (None, "", False)
+
+
+def export_from_db(output_path: str, limit: int) -> int:
+    """chunk_sonuclari kayıtlarından etiket taslağı üret"""
+    from models import Belge
+    from models.database import db
+    from services.document_processor import DocumentProcessor
+
+    rows = db.fetchall(
+        """
+        SELECT l.belgeId, l.belgeTipi, c.chunk_index, c.chunk_start, c.chunk_end, c.response_json
+        FROM chunk_sonuclari c
+        JOIN belge_analiz_log l ON c.log_id = l.id
+        WHERE l.id IN (SELECT id FROM belge_analiz_log WHERE chunk_sayisi > 1 ORDER BY id DESC LIMIT ?)
+        ORDER BY l.id, c.chunk_index
+        """,
+        (limit,)
+    )
+
+    texts: Dict[int, str] = {}
+    count = 0
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        for row in rows:
+            belge_id = row['belgeId']
+            if belge_id not in texts:
+                belge = Belge.get_by_id(belge_id) or {}
+                processed = DocumentProcessor.process_document(
+                    belge.get('belgeIcerik', ''),
+                    belge.get('belge_uzantisi'),
+                    profile=get_extraction_profile(row['belgeTipi'])
+                ) if belge.get('belgeIcerik') else {}
+                texts[belge_id] = processed.get('text') or ""
+
+            text = texts[belge_id][row['chunk_start']:row['chunk_end']]
+            if not text:
+                continue
+
+            try:
+                data = json.loads(row['response_json'])
+            except (TypeError, ValueError):
+                continue
+
+            f.write(json.dumps({
+                'belge_id': belge_id,
+                'document_type': row['belgeTipi'],
+                'chunk_index': row['chunk_index'],
+                'text': text,
+                'relevant': has_content(data),
+            }, ensure_ascii=False) + "\n")
+            count += 1
+
+    return count
+
+
+def evaluate(labels: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Belge bazında select() uygula, tip bazında recall / skip rate hesapla"""
+    documents: Dict[tuple, List[Dict]] = defaultdict(list)
+    for label in labels:
+        documents[(label['document_type'], label['belge_id'])].append(label)
+
+    report: Dict[str, Dict[str, Any]] = defaultdict(
+        lambda: {'chunks': 0, 'skipped': 0, 'relevant': 0, 'relevant_kept': 0, 'missed': []}
+    )
+
+    for (document_type, belge_id), chunks in documents.items():
+        profile = get_relevance_profile(document_type)
+        if profile is None:
+            continue
+
+        chunks.sort(key=lambda c: c['chunk_index'])
+        keep, scores = profile.select([c['text'] for c in chunks])
+
+        stats = report[document_type]
+        for i, chunk in enumerate(chunks):
+            kept = i in keep
+            stats['chunks'] += 1
+            stats['skipped'] += 0 if kept else 1
+            if chunk['relevant']:
+                stats['relevant'] += 1
+                if kept:
+                    stats['relevant_kept'] += 1
+                else:
+                    stats['missed'].append(
+                        f"belge {belge_id} chunk {chunk['chunk_index']} (puan {scores[i]['score']:.1f}): "
+                        f"{' '.join(chunk['text'].split())[:80]}"
+                    )
+
+    for stats in report.values():
+        stats['recall'] = stats['relevant_kept'] / stats['relevant'] if stats['relevant'] else 1.0
+        stats['skip_rate'] = stats['skipped'] / stats['chunks'] if stats['chunks'] else 0.0
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunk ilgililik filtresi recall ölçümü")
+    parser.add_argument('labels', nargs='?', help='Etiketli chunk dosyası (JSONL)')
+    parser.add_argument('--export-db', metavar='DOSYA', help='Veritabanından etiket taslağı üret')
+    parser.add_argument('--limit', type=int, default=50, help='Export edilecek belge analizi sayısı')
+    parser.add_argument('--min-recall', type=float, default=0.98, help='Bu değerin altında çıkış kodu 1')
+    args = parser.parse_args()
+
+    if args.export_db:
+        count = export_from_db(args.export_db, args.limit)
+        print(f"{count} chunk etiketlendi: {args.export_db} (gözden geçirip ölçümde kullanın)")
+        return
+
+    if not args.labels:
+        parser.error("Etiket dosyası veya --export-db gerekli")
+
+    with open(args.labels, encoding='utf-8') as f:
+        labels = [json.loads(line) for line in f if line.strip()]
+
+    report = evaluate(labels)
+    if not report:
+        print("Profili olan belge tipinde etiketli chunk yok")
+        return
+
+    failed = False
+    print(f"{'Belge tipi':<25} {'chunk':>6} {'atlanan':>8} {'atlama':>7} {'ilgili':>7} {'recall':>7}")
+    for document_type, stats in sorted(report.items()):
+        print(
+            f"{document_type:<25} {stats['chunks']:>6} {stats['skipped']:>8} {stats['skip_rate']:>6.0%} "
+            f"{stats['relevant']:>7} {stats['recall']:>6.1%}"
+        )
+        for missed in stats['missed']:
+            print(f"    kaçırılan: {missed}")
+        failed = failed or stats['recall'] < args.min_recall
+
+    if failed:
+        print(f"\n✗ Recall {args.min_recall:.0%} altında")
+        sys.exit(1)
+    print(f"\n✓ Recall ≥ {args.min_recall:.0%}")
+
+
+if __name__ == '__main__':
+    main()
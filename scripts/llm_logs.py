@@ -0,0 +1,67 @@
+"""
+LLM istek / yanıt log'larını başvuru bazında görüntüle
+
+Log'lar günlük NDJSON dosyalarında (llm_logs/YYYY-MM-DD.ndjson[.gz]) ve
+llm_logs/index.db başvuru indeksinde tutulur. Bu script eski
+llm_logs/<basvuru_id>/*.json görünümünü indeks üzerinden verir.
+
+Kullanım:
+    python scripts/llm_logs.py --basvuru 123
+    python scripts/llm_logs.py --basvuru 123 --full
+    python scripts/llm_logs.py --genel --limit 5
+    python scripts/llm_logs.py --basvuru 123 --export temp/llm_logs_123
+"""
+import sys
+import os
+import json
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import settings
+from app.services.llm_log_sink import read_llm_logs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Başvuru bazlı LLM log görüntüleme")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--basvuru', help='Başvuru ID')
+    group.add_argument('--genel', action='store_true', help='Başvurusuz kayıtlar')
+    parser.add_argument('--limit', type=int, help='Son N kayıt')
+    parser.add_argument('--full', action='store_true', help='Kayıtları tam (girintili JSON) yazdır')
+    parser.add_argument('--export', metavar='DİZİN', help='Her kaydı ayrı JSON dosyası olarak yaz')
+    parser.add_argument('--log-dir', default=settings.LLM_LOG_DIR, help='Log dizini')
+    args = parser.parse_args()
+
+    records = read_llm_logs(Path(args.log_dir), None if args.genel else args.basvuru, args.limit)
+    if not records:
+        print("Kayıt bulunamadı")
+        return
+
+    if args.export:
+        export_dir = Path(args.export)
+        export_dir.mkdir(parents=True, exist_ok=True)
+        for i, record in enumerate(records, 1):
+            safe_document_type = str(record.get('document_type', '')).replace("/", "_").replace("\\", "_")
+            path = export_dir / f"{i:04d}_{safe_document_type}.json"
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(record, f, ensure_ascii=False, indent=2)
+        print(f"{len(records)} kayıt yazıldı: {export_dir}")
+        return
+
+    for record in records:
+        if args.full:
+            print(json.dumps(record, ensure_ascii=False, indent=2))
+            continue
+        response = record.get('response', {})
+        print(
+            f"{record.get('timestamp', '')[:19]}  {record.get('document_type', ''):<25} "
+            f"{record.get('model', '')}  metin: {record.get('request', {}).get('text_length', 0)} kr  "
+            f"yanıt: {response.get('response_length', 0)} kr"
+        )
+    print(f"\n{len(records)} kayıt")
+
+
+if __name__ == '__main__':
+    main()
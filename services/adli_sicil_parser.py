@@ -0,0 +1,77 @@
+"""
+e-Devlet Adli Sicil Kaydı Parser
+"Adli sicil kaydı yoktur" kalıbını ve kişi / doğrulama bilgilerini
+çıkarır (AdliSicilAnalyzer prompt'unun var_mi / kod çıktısıyla aynı format).
+
+Kayıt içeren (mahkeme / karar satırlı) belgeler bilinçli olarak parse
+edilmez: suç türü yorumu LLM yolunda kalır.
+"""
+
+import re
+import logging
+from typing import Dict, Optional
+
+from services.template_parser import extract_pdf_text, find_labeled
+
+logger = logging.getLogger(__name__)
+
+
+class AdliSicilParser:
+    """
+    Adli sicil kaydı belgesini parse eder.
+    """
+
+    BELGE_BASLIGI = re.compile(r'ADL[İI]\s+S[İI]C[İI]L', re.IGNORECASE)
+
+    # Temiz kayıt kalıpları
+    KAYIT_YOK = re.compile(
+        r'(?:adl[iı]\s+sicil|sab[ıi]ka)\s+kayd[ıi]\s+(?:yoktur|bulunmamaktad[ıi]r)',
+        re.IGNORECASE
+    )
+
+    # Kayıt (veya yorum gerektiren) işaretleri → LLM'e bırak
+    KAYIT_VAR = re.compile(
+        r'kayd[ıi]\s+(?:vard[ıi]r|bulunmaktad[ıi]r)|mahk[uû]miyet|h[üu]km[üu]n\s+a[çc][ıi]klanmas[ıi]n[ıi]n'
+        r'|karar\s+tarihi|mahkemesi\s*:',
+        re.IGNORECASE
+    )
+
+    def parse_adli_sicil_document(self, pdf_bytes: bytes) -> Optional[Dict]:
+        """
+        Adli sicil belgesini parse et.
+
+        Returns:
+            Dict: var_mi, kod, kişi bilgileri veya None (şablon tanınmadı / kayıt var)
+        """
+        try:
+            text = extract_pdf_text(pdf_bytes)
+            return self.parse_text(text)
+        except Exception as e:
+            logger.error(f"Adli sicil parse hatası: {e}", exc_info=True)
+            return None
+
+    def parse_text(self, text: str) -> Optional[Dict]:
+        """Metinden adli sicil durumunu çıkar"""
+        if not text or not self.BELGE_BASLIGI.search(text):
+            logger.info("Adli sicil başlığı bulunamadı, şablon tanınmadı")
+            return None
+
+        if self.KAYIT_VAR.search(text):
+            logger.info("Adli sicil belgesinde kayıt işareti var, LLM değerlendirmesine bırakılıyor")
+            return None
+
+        if not self.KAYIT_YOK.search(text):
+            logger.info("Adli sicil durumu kalıbı bulunamadı")
+            return None
+
+        ad = find_labeled(text, r'Ad[ıi]', r"[A-ZÇĞİÖŞÜ][A-ZÇĞİÖŞÜ' ]*?")
+        soyad = find_labeled(text, r'Soyad[ıi]', r"[A-ZÇĞİÖŞÜ][A-ZÇĞİÖŞÜ' ]*?")
+
+        return {
+            'var_mi': False,
+            'kod': find_labeled(
+                text, r'Do[ğg]rulama\s+Kodu|Barkod(?:\s+No)?|Belge\s+No', r'[A-Za-z0-9-]{6,}', line_end=False
+            ),
+            'tc_kimlik_no': find_labeled(text, r'T\.?\s*C\.?\s*Kimlik\s*No(?:su)?', r'\d{11}', line_end=False),
+            'ad_soyad': f"{ad} {soyad}" if ad and soyad else None,
+        }
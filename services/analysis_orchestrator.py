@@ -15,18 +15,24 @@ PHASE 1 - KRİTİK ÖZELLİKLER:
 import logging
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple
 from collections import defaultdict
 
 from models.database import db
 from models import Basvuru, Belge
-from analyzers import CVAnalyzer, DiplomaAnalyzer, SGKAnalyzer, AdliSicilAnalyzer, ProjeAnalyzer
+from analyzers import CVAnalyzer, DiplomaAnalyzer, SGKAnalyzer, HitapAnalyzer, AdliSicilAnalyzer, ProjeAnalyzer
 from analyzers.sektor_belge_analyzer import SektorBelgeAnalyzer
 from services.ust_yazi_parser import UstYaziParser
 from services.cross_validator import CrossValidator
 from services.document_processor import DocumentProcessor
 from services.document_validator import DocumentValidator
+from services.ollama_service import OllamaService
+from app.services.circuit_breaker import LLMUnavailableError
+from app.services.llm_scheduler import propagate_priority
+from app.models.extraction_profiles import get_extraction_profile
+from config.settings import DOCUMENT_MAX_CONCURRENCY
 
 logger = logging.getLogger(__name__)
 
@@ -86,6 +92,8 @@ class AnalysisOrchestrator:
         self.ground_truth = None  # Üst yazıdan gelen bilgiler
         self.validator = None  # CrossValidator instance
         self.validation_report = None
+        # Ollama erişilemediği için bekletildi (islendiMi=0, sonraki çalıştırmada tekrar)
+        self.parked = False
 
     # ========== 0. BAŞVURU ÖN KONTROL ==========
 
@@ -234,9 +242,12 @@ class AnalysisOrchestrator:
         elif 'Diploma' in belge_tipi:
             return DiplomaAnalyzer()
 
-        elif 'SGK' in belge_tipi or 'Hitap' in belge_tipi:
+        elif 'SGK' in belge_tipi:
             return SGKAnalyzer()
 
+        elif 'Hitap' in belge_tipi:
+            return HitapAnalyzer()
+
         elif 'Adli Sicil' in belge_tipi:
             return AdliSicilAnalyzer()
 
@@ -271,10 +282,10 @@ class AnalysisOrchestrator:
                 self._parse_ust_yazi(belge)
                 break
 
-        # SONRA: Diğer belgeleri analiz et
+        # SONRA: Diğer belgeleri analiz et (birbirinden bağımsız: eşzamanlı)
+        tasks = []
         for belge in sorted_belgeler:
             belge_tipi = belge['belgeTipi_final']
-            belge_id = belge['belgeId']
 
             # Fotoğraf - varlık kontrolü yap
             if any(skip in belge_tipi for skip in ['Fotoğraf', 'vesikalık']):
@@ -293,9 +304,18 @@ class AnalysisOrchestrator:
                 logger.warning(f"Analyzer bulunamadı: {belge_tipi}")
                 continue
 
-            # Analiz et
-            logger.info(f"Analiz ediliyor: {belge_tipi} (belgeId={belge_id})")
-            result = analyzer.analyze(belge_id)
+            # Cascade: küçük model sonucu üst yazıyla çelişirse büyük modele yükseltilir
+            if self.ground_truth:
+                analyzer.cross_check = lambda r, tipi=belge_tipi: self._validate_analysis_result(
+                    tipi, r, validator=CrossValidator(self.ground_truth)
+                )
+
+            tasks.append((belge, analyzer))
+
+        # Sonuçlar öncelik sırasıyla işlenir: belge_analizleri ve doğrulama raporu
+        # seri çalıştırmadakiyle aynı sırada oluşur (merge deterministik kalsın)
+        for (belge, _), result in zip(tasks, self._run_analyzers(tasks)):
+            belge_tipi = belge['belgeTipi_final']
 
             if result:
                 # Cross-validate (eğer validator varsa)
@@ -306,7 +326,7 @@ class AnalysisOrchestrator:
                     self.belge_analizleri[belge_tipi] = []
 
                 self.belge_analizleri[belge_tipi].append({
-                    'belgeId': belge_id,
+                    'belgeId': belge['belgeId'],
                     'result': result,
                     'kaynak': belge_tipi
                 })
@@ -318,6 +338,38 @@ class AnalysisOrchestrator:
         # SONUNDA: Validation raporunu tamamla
         self._finalize_validation()
 
+    def _run_analyzers(self, tasks: List[Tuple[Dict, Any]]) -> List[Optional[Dict]]:
+        """
+        Belgeleri DOCUMENT_MAX_CONCURRENCY eşzamanlılıkla analiz et.
+
+        Başvuru süresi yaklaşık en yavaş belge kadar olur. LLMUnavailableError
+        (devre açık) bekleyen analizleri iptal edip başvuruyu bekletmeye düşürür.
+
+        Args:
+            tasks: (belge, analyzer) listesi
+
+        Returns:
+            list: tasks sırasıyla analiz sonuçları
+        """
+        def analyze(task):
+            belge, analyzer = task
+            logger.info(f"Analiz ediliyor: {belge['belgeTipi_final']} (belgeId={belge['belgeId']})")
+            return analyzer.analyze(belge['belgeId'])
+
+        workers = max(1, min(DOCUMENT_MAX_CONCURRENCY, len(tasks)))
+        if workers == 1:
+            return [analyze(task) for task in tasks]
+
+        logger.info(f"{len(tasks)} belge {workers} eşzamanlı analizle işleniyor")
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="belge")
+        try:
+            # Thread'ler çağıranın LLM öncelik sınıfını miras almaz
+            futures = [executor.submit(propagate_priority(analyze), task) for task in tasks]
+            return [future.result() for future in futures]
+        finally:
+            # Hata durumunda henüz başlamamış analizler çalıştırılmaz
+            executor.shutdown(wait=True, cancel_futures=True)
+
     # ========== 4. SONUÇLARI BİRLEŞTİR ==========
 
     def merge_same_type_results(self, belge_tipi: str, results: List[Dict]) -> Dict:
@@ -667,6 +719,20 @@ class AnalysisOrchestrator:
         db.execute(query, params)
         logger.info(f"Başvuru durumu güncellendi: {status} ({duration:.2f}s)")
 
+    def mark_processing_parked(self, reason: str):
+        """5.6. LLM erişilemiyor: başvuruyu hata saymadan kuyruğa geri bırak"""
+        query = """
+            UPDATE basvurular
+            SET islendiMi = 0,
+                islenme_bitis = ?,
+                basvuruDurum = 'Bekliyor',
+                hata_mesaji = ?
+            WHERE basvuruId = ?
+        """
+        db.execute(query, (datetime.now().isoformat(), f"LLM erişilemiyor: {reason}", self.basvuru_id))
+        self.parked = True
+        logger.warning(f"⏸️ Başvuru bekletildi (LLM erişilemiyor): {self.basvuru_id}")
+
     # ========== ANA İŞ AKIŞI ==========
 
     def run(self) -> bool:
@@ -689,6 +755,13 @@ class AnalysisOrchestrator:
             zorunlu_belgeler_tam, eksik_belgeler = self.check_belge_uyumluluk()
 
             # 3. BELGE ANALİZİ
+            ollama = OllamaService()
+            if not ollama.is_available():
+                # Devre açık: OCR / belge işleme yapmadan bekletilir
+                raise LLMUnavailableError("Ollama devre kesicisi açık")
+
+            # keep_alive dolduysa modelleri yeniden yükle (yüklüyse istek atılmaz)
+            ollama.warm_up(verify=False)
             self.analyze_all_belgeler()
 
             # 4. SONUÇLARI BİRLEŞTİR
@@ -706,6 +779,10 @@ class AnalysisOrchestrator:
 
             return True
 
+        except LLMUnavailableError as e:
+            self.mark_processing_parked(str(e))
+            return False
+
         except Exception as e:
             logger.error(f"Analiz hatası: {e}", exc_info=True)
             self.mark_processing_completed(success=False, error_msg=str(e))
@@ -730,7 +807,11 @@ class AnalysisOrchestrator:
             pdf_bytes = base64.b64decode(belge_row['belgeIcerik'])
 
             # Metin çıkar
-            text = DocumentProcessor.extract_text_from_pdf(pdf_bytes, use_ocr=False)
+            text = DocumentProcessor.extract_text_from_pdf(
+                pdf_bytes,
+                use_ocr=False,
+                profile=get_extraction_profile("ustyazi")
+            )
 
             if not text or len(text) < 100:
                 logger.warning(f"Üst yazı metni çok kısa: {len(text) if text else 0} karakter")
@@ -761,49 +842,64 @@ class AnalysisOrchestrator:
             self.ground_truth = None
             self.validator = None
 
-    def _validate_analysis_result(self, belge_tipi: str, result: Dict):
+    def _validate_analysis_result(self, belge_tipi: str, result: Dict,
+                                  validator: Optional[CrossValidator] = None) -> bool:
         """
         Analiz sonucunu cross-validate et.
+
+        Args:
+            belge_tipi: Belge tipi (kaynak)
+            result: Analiz sonucu
+            validator: Kullanılacak validator (None = başvurunun raporuna yazan self.validator;
+                cascade kontrolü rapora yazılmasın diye geçici validator verir)
+
+        Returns:
+            bool: Tüm alanlar üst yazıyla tutarlı mı?
         """
-        if not self.validator or not result:
-            return
+        validator = validator or self.validator
+        if not validator or not result:
+            return True
+
+        checks = []
 
         # TC Kimlik No (kritik)
         if 'tc_kimlik_no' in result and result['tc_kimlik_no']:
-            self.validator.validate_field(
+            checks.append(validator.validate_field(
                 'tc_kimlik_no',
                 result['tc_kimlik_no'],
                 belge_tipi,
                 severity='CRITICAL'
-            )
+            ))
 
         # Ad Soyad (uyarı - evlilik sonrası değişebilir)
         if 'ad_soyad' in result and result['ad_soyad']:
-            self.validator.validate_field(
+            checks.append(validator.validate_field(
                 'ad_soyad',
                 result['ad_soyad'],
                 belge_tipi,
                 severity='WARNING'
-            )
+            ))
 
         # Email
         if 'iletisim_email' in result and result['iletisim_email']:
-            self.validator.validate_field(
+            checks.append(validator.validate_field(
                 'email',
                 result['iletisim_email'],
                 belge_tipi,
                 ground_truth_key='email',
                 severity='WARNING'
-            )
+            ))
 
         # GSM
         if 'gsm' in result and result['gsm']:
-            self.validator.validate_field(
+            checks.append(validator.validate_field(
                 'gsm',
                 result['gsm'],
                 belge_tipi,
                 severity='WARNING'
-            )
+            ))
+
+        return all(checks)
 
     def _finalize_validation(self):
         """
@@ -0,0 +1,308 @@
+"""
+Başvuru analiz worker'ları (main.py --analyze --workers N)
+
+Her worker ayrı bir süreçtir: OCR CPU'yu kullanır, SQLite bağlantısı ve
+LLM istemcileri süreç başınadır. Worker:
+- başlarken modelleri ısıtır (warm_up)
+- başvuruları Basvuru.claim_next ile kiralar (tek UPDATE: iki worker aynı
+  başvuruyu alamaz), işlerken kirayı arka planda uzatır, bitince bırakır
+- durdurma isteğinde (Ctrl+C / SIGTERM) elindeki başvuruyu bitirip çıkar
+
+Çöken worker'ın kirası BASVURU_LEASE_SECONDS dolunca düşer; havuz
+başlarken süresi dolmuş kiralar temizlenir, zorla sonlandırılan
+worker'ların kiraları havuz kapanırken bırakılır. Worker'ların LLM
+istekleri süreçler arası paylaşılan zamanlayıcı slotlarıyla sınırlanır
+(LLM_SCHEDULER_SHARED_PATH).
+"""
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from config.settings import BASVURU_LEASE_SECONDS, ENABLE_PARALLEL, MAX_WORKERS
+from models import Basvuru
+from models.database import DatabaseManager, db
+
+logger = logging.getLogger(__name__)
+
+
+def configured_workers() -> int:
+    """
+    --workers verilmediğinde worker sayısı
+
+    sistem_config'teki parallel_processing / max_workers, kayıt yoksa
+    ENABLE_PARALLEL / MAX_WORKERS. Paralel işlem kapalıysa 1.
+    """
+    enabled, workers = ENABLE_PARALLEL, MAX_WORKERS
+    try:
+        rows = db.fetchall(
+            "SELECT key, value FROM sistem_config WHERE key IN ('parallel_processing', 'max_workers')"
+        )
+    except Exception as e:
+        logger.warning(f"sistem_config okunamadı, ENABLE_PARALLEL / MAX_WORKERS kullanılıyor: {e}")
+        rows = []
+
+    for row in rows:
+        if row['key'] == 'parallel_processing':
+            enabled = str(row['value']).lower() in ('true', '1')
+        elif row['key'] == 'max_workers' and str(row['value']).isdigit():
+            workers = int(row['value'])
+
+    return max(1, workers) if enabled else 1
+
+
+def process_basvuru(basvuru: Dict[str, Any], label: str) -> bool:
+    """
+    Tek başvuruyu orchestrator ile işle
+
+    Args:
+        basvuru: Başvuru satırı
+        label: Çıktı başlığı ("[3/10]", "[W2 #5]")
+
+    Returns:
+        bool: Başarılı ise True
+    """
+    from services.analysis_orchestrator import AnalysisOrchestrator
+
+    print(f"\n{'='*80}")
+    print(f"{label} Başvuru {basvuru['takipNo']} işleniyor...")
+    print(f"{'='*80}")
+
+    try:
+        # Gelişmiş orchestrator ile analiz
+        orchestrator = AnalysisOrchestrator(basvuru['basvuruId'])
+        success = orchestrator.run()
+
+        if success:
+            print(f"\n✓✓✓ Başvuru başarıyla işlendi: {basvuru['takipNo']}")
+        elif orchestrator.parked:
+            # Ollama erişilemiyor: başvuru sonraki çalıştırmada tekrar alınır
+            print(f"\n⏸️  Başvuru bekletildi (LLM erişilemiyor): {basvuru['takipNo']}")
+        else:
+            print(f"\n✗✗✗ Başvuru işlenemedi: {basvuru['takipNo']}")
+        return success
+
+    except Exception as e:
+        logger.error(f"Başvuru işleme hatası: {e}", exc_info=True)
+        print(f"\n✗✗✗ Kritik hata: {e}")
+
+        # Hata durumunda başvuru durumunu güncelle
+        Basvuru.mark_as_processed(basvuru['basvuruId'], success=False, error_msg=str(e))
+        return False
+
+
+def print_run_stats(prefix: str = ""):
+    """Çalıştırma sonu özetleri (süreç geneli sayaçlar; worker'larda worker başına)"""
+    prefix = f"{prefix} " if prefix else ""
+
+    # Şablon belgelerde LLM'siz parse isabet oranı
+    from services.template_parser import parse_stats
+    if parse_stats.to_dict():
+        print(f"\n{prefix}[INFO] Deterministik parse isabeti: {parse_stats.summary()}")
+
+    # Cascade: belge tipi bazlı büyük modele yükseltme oranı
+    from services.model_cascade import cascade_stats
+    if cascade_stats.to_dict():
+        print(f"{prefix}[INFO] Büyük modele yükseltme: {cascade_stats.summary()}")
+
+    # Aynı metinli chunk'larda önceki sonucun kullanılma oranı
+    from services.chunk_manager import chunk_dedup_stats
+    if chunk_dedup_stats.to_dict():
+        print(f"{prefix}[INFO] Önceki sonuçtan karşılanan chunk: {chunk_dedup_stats.summary()}")
+
+    from app.services.ollama_client import llm_stats
+    usage = llm_stats.to_dict()['usage']
+    if usage['bound']:
+        print(
+            f"{prefix}[INFO] LLM süre dağılımı: prompt %{usage['prompt_share'] * 100:.0f} "
+            f"({usage['prompt_tokens_per_sec'] or 0:.0f} tok/s), üretim %{usage['eval_share'] * 100:.0f} "
+            f"({usage['eval_tokens_per_sec'] or 0:.0f} tok/s), yükleme %{usage['load_share'] * 100:.0f}"
+        )
+
+
+class LeaseHeartbeat:
+    """
+    İşlenen başvurunun kirasını arka planda uzatır (context manager)
+
+    Kira süresinin 1/3'ünde bir uzatılır. Ayrı SQLite bağlantısı kullanır:
+    orchestrator'ın açık işlemine commit / rollback karışmaz.
+    """
+
+    def __init__(self, basvuru_id: int, worker_id: str, lease_seconds: int = BASVURU_LEASE_SECONDS):
+        self.basvuru_id = basvuru_id
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.lost = False
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, name="basvuru-lease", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join(timeout=5)
+        return False
+
+    def _run(self):
+        database = DatabaseManager(db.db_path)
+        try:
+            while not self._stop.wait(max(1.0, self.lease_seconds / 3)):
+                try:
+                    renewed = Basvuru.renew_lease(self.basvuru_id, self.worker_id, self.lease_seconds, database=database)
+                except Exception as e:
+                    logger.warning(f"Başvuru {self.basvuru_id} kirası uzatılamadı: {e}")
+                    continue
+                if not renewed:
+                    self.lost = True
+                    logger.warning(
+                        f"⚠️ Başvuru {self.basvuru_id} kirası kaybedildi "
+                        f"(süresi dolup başka worker'a geçmiş olabilir)"
+                    )
+                    return
+        finally:
+            database.close()
+
+
+def _reserve(claimed, limit: Optional[int]) -> Optional[int]:
+    """--limit sayacından bir başvuru ayır (sıra numarası, limit dolduysa None)"""
+    with claimed.get_lock():
+        if limit and claimed.value >= limit:
+            return None
+        claimed.value += 1
+        return claimed.value
+
+
+def _unreserve(claimed):
+    with claimed.get_lock():
+        claimed.value -= 1
+
+
+def analyze_worker(worker_no: int, pool_id: str, run_started: str, limit: Optional[int], priority: str, stop, claimed):
+    """
+    Worker süreci: kuyruk boşalana, limit dolana ya da durdurulana kadar
+    başvuru kirala ve işle
+
+    Args:
+        worker_no: Worker numarası (çıktı için)
+        pool_id: Havuz kimliği (host:pid); worker kimliği bunun altında
+        run_started: Havuzun başlangıç zamanı (bu çalıştırmada biten başvurular tekrar alınmaz)
+        limit: Toplam başvuru sınırı (tüm worker'lar, None = sınırsız)
+        priority: LLM öncelik sınıfı
+        stop: Durdurma olayı (multiprocessing.Event)
+        claimed: Ayrılan başvuru sayacı (multiprocessing.Value)
+    """
+    from app.services.llm_scheduler import llm_priority
+    from services.ollama_service import OllamaService
+
+    # Ctrl+C tüm süreç grubuna gider: worker'ı ana süreç durdurur, elindeki başvuru biter
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+
+    worker_id = f"{pool_id}:w{worker_no}"
+    prefix = f"[W{worker_no}]"
+
+    # Modelleri yükle: worker'ın ilk belgesi model yükleme süresini beklemesin
+    if not OllamaService().warm_up():
+        print(f"{prefix} [HATA] Ollama hazır değil, worker başlatılmadı")
+        return
+
+    processed = 0
+    with llm_priority(priority):
+        while not stop.is_set():
+            number = _reserve(claimed, limit)
+            if number is None:
+                break
+
+            basvuru = Basvuru.claim_next(worker_id, BASVURU_LEASE_SECONDS, run_started)
+            if basvuru is None:
+                _unreserve(claimed)
+                break
+
+            try:
+                with LeaseHeartbeat(basvuru['basvuruId'], worker_id):
+                    process_basvuru(basvuru, f"{prefix} #{number}")
+            finally:
+                Basvuru.release_lease(basvuru['basvuruId'], worker_id)
+            processed += 1
+
+    print(f"\n{prefix} [INFO] Worker bitti: {processed} başvuru işlendi")
+    print_run_stats(prefix)
+
+
+def run_worker_pool(workers: int, limit: Optional[int] = None, priority: Optional[str] = None) -> int:
+    """
+    İşlenmemiş başvuruları N worker süreciyle işle
+
+    İlk Ctrl+C / SIGTERM: worker'lar ellerindeki başvuruyu bitirip çıkar.
+    İkinci Ctrl+C: worker'lar hemen sonlandırılır (başvurular işlenmemiş
+    kalır, kiraları bırakılır).
+
+    Args:
+        workers: Worker süreci sayısı
+        limit: Toplam başvuru sınırı (None = kuyruk boşalana kadar)
+        priority: LLM öncelik sınıfı (None = backfill)
+
+    Returns:
+        int: Worker'lara dağıtılan başvuru sayısı
+    """
+    from app.services.llm_scheduler import BACKFILL
+
+    stale = Basvuru.recover_stale_leases()
+    if stale:
+        print(
+            f"[INFO] Süresi dolmuş {len(stale)} kira temizlendi: "
+            + ", ".join(f"{row['takipNo']} ({row['islem_sahibi']})" for row in stale)
+        )
+
+    # spawn: worker'lar ebeveynin SQLite bağlantısını / thread'lerini devralmaz
+    ctx = multiprocessing.get_context('spawn')
+    stop = ctx.Event()
+    claimed = ctx.Value('i', 0)
+    pool_id = f"{socket.gethostname()}:{os.getpid()}"
+    run_started = datetime.now().isoformat()
+
+    processes = [
+        ctx.Process(
+            target=analyze_worker,
+            args=(n, pool_id, run_started, limit, priority or BACKFILL, stop, claimed),
+            name=f"analiz-worker-{n}"
+        )
+        for n in range(1, workers + 1)
+    ]
+
+    def request_stop(signum, frame):
+        if stop.is_set():
+            print("\n[UYARI] Worker'lar sonlandırılıyor")
+            for process in processes:
+                if process.is_alive():
+                    process.kill()
+            return
+        print("\n[INFO] Durdurma isteği: worker'lar ellerindeki başvuruyu bitirip çıkacak (tekrar Ctrl+C: hemen sonlandır)")
+        stop.set()
+
+    previous = {sig: signal.signal(sig, request_stop) for sig in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        print(f"[INFO] {workers} worker başlatılıyor (havuz {pool_id})")
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+
+    # Öldürülen / çöken worker'ların kiraları: başvurular bir sonraki çalıştırmada hemen alınabilsin
+    failed = [process.name for process in processes if process.exitcode != 0]
+    if failed:
+        released = Basvuru.release_leases(f"{pool_id}:")
+        print(f"[UYARI] Düzgün kapanmayan worker: {', '.join(failed)} ({released} kira bırakıldı)")
+
+    return claimed.value
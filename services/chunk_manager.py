@@ -5,10 +5,21 @@ Büyük belgeleri chunk'lara böler ve yönetir.
 
 import hashlib
 import logging
-from typing import List, Dict, Any, Optional
+import re
+import threading
+from itertools import islice
+from typing import Iterator, List, Dict, Any, Optional
 from dataclasses import dataclass
 
-from config.settings import CHUNK_SIZE, CHUNK_OVERLAP, MIN_CHUNK_SIZE, CHARS_PER_TOKEN
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+from config.settings import (
+    CHUNK_SIZE, CHUNK_OVERLAP, MIN_CHUNK_SIZE, CHARS_PER_TOKEN, CHUNK_OVERLAP_TOKENS
+)
 
 logger = logging.getLogger(__name__)
 
@@ -20,70 +31,205 @@ class Chunk:
     text: str
     start: int
     end: int
-    hash: str
+    hash: str  # Metin hash'i (chunk_hash), aynı metinli chunk'ların önceki sonucunu bulmak için
+    token_count: int = 0  # Token bütçeli chunk'lamada parça token toplamı
+
+
+# Token bütçeli chunk'lamada bölme noktaları: cümle sonu veya satır sonu
+_SEGMENT_BOUNDARY = re.compile(r'[.!?]\s+|\n+')
+
+# Karakter bazlı chunk'lamada cümle sonu ve hedef çevresinde aranan mesafe (±karakter)
+_SENTENCE_END = re.compile(r'[.!?]\s+')
+_BOUNDARY_SEARCH_RANGE = 200
+
+
+def _nearest_sentence_end(text: str, window_start: int, window_end: int, target: int) -> Optional[int]:
+    """
+    [window_start, window_end) penceresinde target'a en yakın cümle sonu
+
+    Pencere kopyalanmaz (pos / endpos); eşleşmeler sırayla geldiğinden
+    hedef geçilince arama biter. Pencereden taşan boşluk pencere sonunda
+    kesilir, eşit uzaklıkta öndeki seçilir (pencere metninde re.finditer
+    + min ile aynı sonuç).
+
+    Returns:
+        int: Mutlak bitiş konumu, pencerede cümle sonu yoksa None
+    """
+    best = None
+    for match in _SENTENCE_END.finditer(text, window_start, window_end):
+        end = match.end()
+        if best is None or abs(end - target) < abs(best - target):
+            best = end
+        if end >= target:
+            break
+    return best
+
+
+def chunk_hash(text: str) -> str:
+    """
+    Chunk metninin hızlı hash'i (32 hex karakter)
+
+    xxhash yüklüyse xxh3_128, değilse blake2b (16 bayt). Aynı veritabanını
+    kullanan süreçler aynı algoritmayı kullanmalı: hash değişirse önceki
+    chunk sonuçları bulunamaz (yeniden analiz edilir, yanlış sonuç dönmez).
+    """
+    data = text.encode('utf-8')
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_128_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class ChunkDedupStats:
+    """Belge tipi bazlı önceki sonuçtan karşılanan chunk sayaçları (süreç geneli)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, List[int]] = {}
+
+    def add(self, document_type: str, total: int, reused: int):
+        with self._lock:
+            counts = self._counts.setdefault(document_type, [0, 0])
+            counts[0] += total
+            counts[1] += reused
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                doc_type: {'chunks': total, 'reused': reused, 'reuse_rate': reused / total if total else 0.0}
+                for doc_type, (total, reused) in self._counts.items()
+            }
+
+    def summary(self) -> str:
+        """Tek satır rapor: "CV 3/12 (%25), SGK 4/4 (%100)" """
+        return ", ".join(
+            f"{doc_type} {s['reused']}/{s['chunks']} ({s['reuse_rate']:.0%})"
+            for doc_type, s in self.to_dict().items()
+        )
+
+
+chunk_dedup_stats = ChunkDedupStats()
 
 
 class ChunkManager:
     """Belge chunk yönetim servisi"""
 
-    def __init__(self, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP):
+    def __init__(
+        self,
+        chunk_size: int = CHUNK_SIZE,
+        overlap: int = CHUNK_OVERLAP,
+        token_counter=None,
+        overlap_tokens: int = CHUNK_OVERLAP_TOKENS
+    ):
         """
         Args:
             chunk_size: Chunk karakter sayısı
             overlap: Overlap karakter sayısı
+            token_counter: TokenCounter (token bütçeli chunk'lama için)
+            overlap_tokens: Token bütçeli chunk'lamada overlap token sayısı
         """
         self.chunk_size = chunk_size
         self.overlap = overlap
-
-    def create_chunks(self, text: str) -> List[Chunk]:
+        self.token_counter = token_counter
+        self.overlap_tokens = overlap_tokens
+
+    def create_chunks(
+        self,
+        text: str,
+        max_chunks: Optional[int] = None,
+        token_budget: Optional[int] = None
+    ) -> List[Chunk]:
         """
         PHASE 2.4: Metni chunk'lara böl (cümle sınırında).
 
+        token_budget verilirse (ve token_counter tanımlıysa) chunk'lar
+        karakter yerine gerçek token sayısıyla, bütçeye sığan en büyük
+        boyutta oluşturulur.
+
         Args:
             text: Bölünecek metin
+            max_chunks: Maksimum chunk sayısı (extraction profile'dan, None = sınırsız)
+            token_budget: Chunk başına maksimum belge token'ı
 
         Returns:
             List[Chunk]: Chunk listesi
         """
+        chunk_iter = self.iter_chunks(text, token_budget)
+        chunks = list(islice(chunk_iter, max_chunks)) if max_chunks else list(chunk_iter)
+
+        # Profil chunk sınırı (sınırdan sonra metin kaldıysa)
+        if max_chunks and len(chunks) >= max_chunks and next(chunk_iter, None) is not None:
+            logger.info(f"Profil chunk sınırı: {max_chunks} chunk, kalan metin atlandı")
+
+        if token_budget and self.token_counter is not None and len(text) >= MIN_CHUNK_SIZE:
+            logger.info(
+                f"Metin {len(chunks)} chunk'a bölündü (token bütçesi: {token_budget}, "
+                f"sayım: {self.token_counter.mode})"
+            )
+        elif len(text) >= MIN_CHUNK_SIZE:
+            logger.info(f"Metin {len(chunks)} chunk'a bölündü (cümle sınırında)")
+        return chunks
+
+    def iter_chunks(self, text: str, token_budget: Optional[int] = None) -> Iterator[Chunk]:
+        """
+        Chunk'ları sırayla üret (lazy).
+
+        Sadece ilk chunk'ları kullanan çağıran (ör. sektör belgeleri)
+        iterasyonu bıraktığında metnin geri kalanı taranmaz.
+
+        Args:
+            text: Bölünecek metin
+            token_budget: Chunk başına maksimum belge token'ı (bkz. create_chunks)
+
+        Yields:
+            Chunk: Belge sırasıyla chunk'lar
+        """
         # Çok küçükse chunk'lama
         if len(text) < MIN_CHUNK_SIZE:
-            return [Chunk(
+            yield Chunk(
                 index=0,
                 text=text,
                 start=0,
                 end=len(text),
-                hash=""  # Hash hesaplamayı devre dışı bırak (performans)
-            )]
+                hash=chunk_hash(text),
+                token_count=self.token_counter.count(text) if self.token_counter else 0
+            )
+            return
+
+        if token_budget and self.token_counter is not None:
+            yield from self._iter_token_chunks(text, token_budget)
+        else:
+            yield from self._iter_char_chunks(text)
+
+    def _iter_char_chunks(self, text: str) -> Iterator[Chunk]:
+        """
+        CHUNK_SIZE karakterlik chunk'lar, hedef noktaya en yakın cümle sonunda.
 
-        chunks = []
+        Sadece hedefin ±_BOUNDARY_SEARCH_RANGE karakter çevresi taranır:
+        toplam iş metin boyuyla doğrusal, ilk chunk'lar metnin geri
+        kalanını okumadan üretilir.
+        """
+        text_len = len(text)
         start = 0
         index = 0
 
-        while start < len(text):
+        while start < text_len:
             # Chunk sonu (hedef)
             target_end = start + self.chunk_size
 
             # Son chunk
-            if target_end >= len(text):
-                target_end = len(text)
+            if target_end >= text_len:
+                target_end = text_len
                 chunk_text = text[start:target_end]
             else:
-                # PHASE 2.4: Cümle sınırında böl
-                # Hedef nokta çevresinde cümle sonu ara (., !, ?)
-                search_range = 200  # Hedefin ±200 karakter çevresinde ara
-                search_start = max(start, target_end - search_range)
-                search_end = min(len(text), target_end + search_range)
-                search_text = text[search_start:search_end]
-
-                # Cümle sonu karakterleri ara
-                import re
-                sentence_endings = list(re.finditer(r'[.!?]\s+', search_text))
-
-                if sentence_endings:
-                    # En yakın cümle sonunu bul
-                    best_match = min(sentence_endings,
-                                   key=lambda m: abs((search_start + m.end()) - target_end))
-                    actual_end = search_start + best_match.end()
+                # PHASE 2.4: Cümle sınırında böl (hedefe en yakın cümle sonu)
+                actual_end = _nearest_sentence_end(
+                    text,
+                    max(start, target_end - _BOUNDARY_SEARCH_RANGE),
+                    min(text_len, target_end + _BOUNDARY_SEARCH_RANGE),
+                    target_end
+                )
+
+                if actual_end is not None:
                     chunk_text = text[start:actual_end]
                 else:
                     # Cümle sonu bulunamadıysa, kelime sınırında böl
@@ -95,24 +241,120 @@ class ChunkManager:
                         chunk_text = text[start:target_end]
 
             # Chunk oluştur
-            chunks.append(Chunk(
+            stripped = chunk_text.strip()
+            yield Chunk(
                 index=index,
-                text=chunk_text.strip(),
+                text=stripped,
                 start=start,
                 end=start + len(chunk_text),
-                hash=""  # Hash hesaplamayı devre dışı bırak (performans)
-            ))
+                hash=chunk_hash(stripped)
+            )
 
-            # Son chunk ise döngüden çık
-            if start + len(chunk_text) >= len(text):
-                break
+            # Son chunk ise dur
+            if start + len(chunk_text) >= text_len:
+                return
 
             # Sonraki chunk başlangıcı (overlap ile)
             start = start + len(chunk_text) - self.overlap
             index += 1
 
-        logger.info(f"Metin {len(chunks)} chunk'a bölündü (cümle sınırında)")
-        return chunks
+    def _iter_token_chunks(self, text: str, token_budget: int) -> Iterator[Chunk]:
+        """
+        Metni token bütçesine göre chunk'lara böl.
+
+        Metin cümle / satır sınırlarında parçalara ayrılır, parçalar
+        token sayılarıyla bütçe dolana kadar aynı chunk'a eklenir.
+        Sonraki chunk, öncekinin son parçalarından overlap_tokens kadarıyla
+        başlar.
+
+        Args:
+            text: Bölünecek metin
+            token_budget: Chunk başına maksimum token
+
+        Yields:
+            Chunk: Belge sırasıyla chunk'lar
+        """
+        spans = self._segment_spans(text)
+        counts = self.token_counter.count_segments([text[s:e] for s, e in spans])
+        spans, counts = self._split_oversized(text, spans, counts, token_budget)
+
+        index = 0
+        i = 0
+        n = len(spans)
+
+        while i < n:
+            # Bütçeye sığdığı kadar parça ekle (en az bir parça)
+            j = i
+            total = 0
+            while j < n and (j == i or total + counts[j] <= token_budget):
+                total += counts[j]
+                j += 1
+
+            start, end = spans[i][0], spans[j - 1][1]
+            chunk_text = text[start:end].strip()
+            yield Chunk(
+                index=index,
+                text=chunk_text,
+                start=start,
+                end=end,
+                hash=chunk_hash(chunk_text),
+                token_count=total
+            )
+
+            if j >= n:
+                return
+
+            # Overlap: son parçalardan overlap_tokens kadarı (ilerleme garantili)
+            k = j
+            overlap = 0
+            while k - 1 > i and overlap + counts[k - 1] <= self.overlap_tokens:
+                k -= 1
+                overlap += counts[k]
+            i = k
+            index += 1
+
+    @staticmethod
+    def _segment_spans(text: str) -> List[tuple]:
+        """Cümle / satır sonlarında (start, end) parça aralıkları"""
+        spans = []
+        start = 0
+        for match in _SEGMENT_BOUNDARY.finditer(text):
+            spans.append((start, match.end()))
+            start = match.end()
+        if start < len(text):
+            spans.append((start, len(text)))
+        return spans
+
+    def _split_oversized(
+        self,
+        text: str,
+        spans: List[tuple],
+        counts: List[int],
+        token_budget: int
+    ) -> tuple:
+        """Tek başına bütçeyi aşan parçaları kelime sınırında böl"""
+        if all(c <= token_budget for c in counts):
+            return spans, counts
+
+        new_spans = []
+        for (start, end), count in zip(spans, counts):
+            if count <= token_budget:
+                new_spans.append((start, end))
+                continue
+
+            # Parçanın kendi karakter/token oranıyla %90 bütçelik dilimler
+            piece_chars = max(1, int((end - start) * token_budget / count * 0.9))
+            pos = start
+            while pos < end:
+                cut = min(end, pos + piece_chars)
+                if cut < end:
+                    space = text.rfind(' ', pos + 1, cut)
+                    if space != -1:
+                        cut = space
+                new_spans.append((pos, cut))
+                pos = cut
+
+        return new_spans, self.token_counter.count_segments([text[s:e] for s, e in new_spans])
 
     def merge_chunk_results(self, chunk_results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -230,7 +472,7 @@ class ChunkManager:
 
     def _calculate_hash(self, text: str) -> str:
         """
-        Metin için SHA256 hash hesapla.
+        Metin için hash hesapla (bkz. chunk_hash).
 
         Args:
             text: Metin
@@ -238,7 +480,7 @@ class ChunkManager:
         Returns:
             str: Hash (hex)
         """
-        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+        return chunk_hash(text)
 
     def get_chunk_stats(self, chunks: List[Chunk]) -> Dict[str, Any]:
         """
@@ -0,0 +1,135 @@
+"""
+YÖK e-Devlet Mezun Belgesi Parser
+Her "MEZUNİYET BİLGİSİ" bölümünü ayrı diploma kaydı olarak çıkarır
+(DiplomaAnalyzer prompt'unun "diplomalar" çıktısıyla aynı format).
+"""
+
+import re
+import logging
+from typing import Dict, List, Optional
+
+from services.template_parser import TARIH_PATTERN, extract_pdf_text, find_labeled
+
+logger = logging.getLogger(__name__)
+
+
+class DiplomaParser:
+    """
+    YÖK mezun belgesini parse eder.
+    """
+
+    BOLUM_BASLIGI = re.compile(r'^[ \t]*MEZUN[İI]YET\s+B[İI]LG[İI]S[İI][ \t]*:?[ \t]*$', re.IGNORECASE | re.MULTILINE)
+
+    # Alan → etiket regex'i
+    ETIKETLER = {
+        'universite': r'[ÜU]niversite(?:\s+Ad[ıi])?',
+        'fakulte': r'Fak[üu]lte\s*/\s*Enstit[üu]\s*/\s*Y[üu]ksekokul|Fak[üu]lte\s*/\s*Enstit[üu]|Fak[üu]lte|Enstit[üu]',
+        'program_bolum': r'Program(?:\s+Ad[ıi])?|B[öo]l[üu]m(?:\s+Ad[ıi])?',
+        'durum': r'Durum(?:u)?|Ayr[ıi]lma\s+Nedeni',
+    }
+
+    # Etiketsiz tablo satırı: ÜNİVERSİTE  FAKÜLTE  PROGRAM  TARİH  DİPLOMA NO  NOT
+    TABLO_SATIRI = re.compile(
+        r'^(?P<universite>.+?[ÜU]N[İI]VERS[İI]TES[İI])[ \t]+'
+        r'(?P<fakulte>.+?(?:FAK[ÜU]LTES[İI]|ENST[İI]T[ÜU]S[ÜU]|Y[ÜU]KSEKOKULU|KONSERVATUVARI))[ \t]+'
+        r'(?P<program>.+?)[ \t]+'
+        r'(?P<tarih>' + TARIH_PATTERN + r')[ \t]+'
+        r'(?P<diploma_no>\S+)[ \t]+'
+        r'(?P<not>\d{1,3}(?:[.,]\d{1,2})?)[ \t]*$',
+        re.MULTILINE
+    )
+
+    def parse_diploma_document(self, pdf_bytes: bytes) -> Optional[Dict]:
+        """
+        Diploma belgesini parse et.
+
+        Returns:
+            Dict: {"diplomalar": [...]} veya None (şablon tanınmadı)
+        """
+        try:
+            text = extract_pdf_text(pdf_bytes)
+            return self.parse_text(text)
+        except Exception as e:
+            logger.error(f"Diploma parse hatası: {e}", exc_info=True)
+            return None
+
+    def parse_text(self, text: str) -> Optional[Dict]:
+        """Metinden diploma kayıtlarını çıkar"""
+        if not text or not self.BOLUM_BASLIGI.search(text):
+            logger.info("MEZUNİYET BİLGİSİ bölümü bulunamadı, şablon tanınmadı")
+            return None
+
+        kisi = self._extract_person(text)
+
+        # Başlıklar arasındaki her bölüm bir mezuniyet kaydı
+        sections = self.BOLUM_BASLIGI.split(text)[1:]
+        diplomalar = []
+        for section in sections:
+            diplomalar.extend(self._parse_section(section))
+
+        # Zorunlu alanlar: üniversite + mezuniyet tarihi
+        diplomalar = [d for d in diplomalar if d.get('universite') and d.get('mezuniyet_tarihi')]
+        if not diplomalar:
+            logger.info("Mezuniyet bölümünde üniversite / tarih bulunamadı")
+            return None
+
+        for diploma in diplomalar:
+            for key, value in kisi.items():
+                diploma.setdefault(key, value)
+
+        return {'diplomalar': diplomalar}
+
+    def _extract_person(self, text: str) -> Dict:
+        """Kişi bilgileri (belge başı)"""
+        tc = find_labeled(text, r'T\.?\s*C\.?\s*Kimlik\s*No(?:su)?', r'\d{11}', line_end=False)
+
+        ad = soyad = None
+        ad_soyad = find_labeled(text, r'Ad[ıi]?\s*Soyad[ıi]?', r"[A-ZÇĞİÖŞÜ][A-ZÇĞİÖŞÜ' ]+")
+        if ad_soyad and ' ' in ad_soyad:
+            ad, soyad = ad_soyad.rsplit(' ', 1)
+        else:
+            ad = find_labeled(text, r'Ad[ıi]', r"[A-ZÇĞİÖŞÜ][A-ZÇĞİÖŞÜ' ]*?")
+            soyad = find_labeled(text, r'Soyad[ıi]', r"[A-ZÇĞİÖŞÜ][A-ZÇĞİÖŞÜ' ]*?")
+
+        return {'tc_kimlik_no': tc, 'ad': ad, 'soyad': soyad}
+
+    def _parse_section(self, section: str) -> List[Dict]:
+        """Tek MEZUNİYET BİLGİSİ bölümü (etiketli veya tablo satırlı)"""
+        diploma = {key: find_labeled(section, labels) for key, labels in self.ETIKETLER.items()}
+        diploma['mezuniyet_tarihi'] = find_labeled(
+            section, r'Mezuniyet\s+Tarihi', TARIH_PATTERN, line_end=False
+        )
+        diploma['diploma_numarasi'] = find_labeled(
+            section, r'Diploma\s+No(?:su)?|Diploma\s+Numaras[ıi]', r'[^\s]+', line_end=False
+        )
+        diploma['diploma_notu'] = self._to_float(find_labeled(
+            section, r'Diploma\s+Notu|Mezuniyet\s+Notu|Not\s+Ortalamas[ıi]', r'\d{1,3}(?:[.,]\d{1,2})?', line_end=False
+        ))
+
+        if diploma['universite'] and diploma['mezuniyet_tarihi']:
+            diploma['mezuniyet_tarihi'] = diploma['mezuniyet_tarihi'].replace('.', '/')
+            diploma['durum'] = diploma['durum'] or 'Mezuniyet'
+            return [diploma]
+
+        # Etiket yoksa tablo satırları (bir bölümde birden fazla satır olabilir)
+        rows = []
+        for match in self.TABLO_SATIRI.finditer(section):
+            rows.append({
+                'universite': match.group('universite').strip(),
+                'fakulte': match.group('fakulte').strip(),
+                'program_bolum': match.group('program').strip(),
+                'mezuniyet_tarihi': match.group('tarih').replace('.', '/'),
+                'diploma_numarasi': match.group('diploma_no'),
+                'diploma_notu': self._to_float(match.group('not')),
+                'durum': 'Mezuniyet',
+            })
+        return rows
+
+    @staticmethod
+    def _to_float(value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        try:
+            return float(value.replace(',', '.'))
+        except ValueError:
+            return None
@@ -6,16 +6,9 @@ PDF, görsel ve diğer belge formatlarını işler.
 import base64
 import logging
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import io
 
-try:
-    from PIL import Image
-    PILLOW_AVAILABLE = True
-except ImportError:
-    PILLOW_AVAILABLE = False
-    logging.warning("Pillow yüklü değil, görsel işleme devre dışı")
-
 try:
     import pdfplumber
     PDFPLUMBER_AVAILABLE = True
@@ -23,7 +16,16 @@ except ImportError:
     PDFPLUMBER_AVAILABLE = False
     logging.warning("pdfplumber yüklü değil, PDF işleme sınırlı")
 
-from config.settings import SUPPORTED_EXTENSIONS, MAX_FILE_SIZE
+from config.settings import (
+    SUPPORTED_EXTENSIONS, MAX_FILE_SIZE,
+    OCR_PREPROCESS_ENABLED, OCR_PREPROCESS_BINARIZE, OCR_DPI,
+    VISION_MAX_SIDE, VISION_JPEG_QUALITY, VISION_CROP, VISION_SCAN_PAGES, VISION_MAX_PAGES,
+    VISION_RENDER_DPI, VISION_CACHE_SIZE
+)
+from app.services.image_preprocessor import ImagePreprocessor, PreprocessOptions
+from app.services.vision_optimizer import VisionInputOptions, get_vision_optimizer
+from app.models.extraction_profiles import ExtractionProfile
+from app.models.ocr_result import OCRPage, MIN_OCR_PAGE_CHARS, pages_to_text, summarize_pages
 
 logger = logging.getLogger(__name__)
 
@@ -62,26 +64,59 @@ class DocumentProcessor:
             return None
 
     @staticmethod
-    def extract_text_from_pdf(pdf_bytes: bytes, use_ocr: bool = True) -> Optional[str]:
+    def extract_text_from_pdf(
+        pdf_bytes: bytes,
+        use_ocr: bool = True,
+        profile: Optional[ExtractionProfile] = None,
+        ocr_dpi: int = OCR_DPI
+    ) -> Optional[str]:
         """
         PDF'den metin çıkar. Metin yoksa OCR kullan.
 
         Args:
             pdf_bytes: PDF dosya bytes'ı
             use_ocr: Metin yoksa OCR kullan mı?
+            profile: Belge tipi çıkarma profili (sayfa sınırı, erken durma)
+            ocr_dpi: OCR render çözünürlüğü
 
         Returns:
             str: Çıkarılan metin, başarısızsa None
         """
+        pages = DocumentProcessor.extract_pages_from_pdf(pdf_bytes, use_ocr, profile, ocr_dpi)
+        full_text = pages_to_text(pages) if pages else ""
+        return full_text if full_text.strip() else None
+
+    @staticmethod
+    def extract_pages_from_pdf(
+        pdf_bytes: bytes,
+        use_ocr: bool = True,
+        profile: Optional[ExtractionProfile] = None,
+        ocr_dpi: int = OCR_DPI
+    ) -> List[OCRPage]:
+        """
+        PDF'den sayfa bazlı yapılandırılmış sonuç çıkar. Metin yoksa OCR kullan.
+
+        Metin katmanı olan sayfalar source='text', OCR'lanan sayfalar satır,
+        kutu ve güven skorlarıyla source='ocr' / 'ocr-full' olarak döner.
+
+        Args:
+            pdf_bytes: PDF dosya bytes'ı
+            use_ocr: Metin yoksa OCR kullan mı?
+            profile: Belge tipi çıkarma profili (sayfa sınırı, erken durma)
+            ocr_dpi: OCR render çözünürlüğü
+
+        Returns:
+            List[OCRPage]: Sayfa sonuçları (başarısızsa boş liste)
+        """
         if not PDFPLUMBER_AVAILABLE:
             logger.error("pdfplumber yüklü değil")
             # OCR ile denemeye devam et
             if use_ocr:
                 logger.info("pdfplumber olmadan OCR denenecek")
-                return DocumentProcessor._extract_text_with_ocr_from_bytes(pdf_bytes)
-            return None
+                return DocumentProcessor._extract_text_with_ocr_from_bytes(pdf_bytes, profile, ocr_dpi)
+            return []
 
-        text_parts = []
+        pages = []
         ocr_needed_pages = []
         page_count = 0
 
@@ -95,177 +130,258 @@ class DocumentProcessor:
                     # OCR ile tüm PDF'i işle
                     if use_ocr:
                         logger.info("0 sayfalı PDF için OCR denenecek")
-                        return DocumentProcessor._extract_text_with_ocr_from_bytes(pdf_bytes)
-                    return None
+                        return DocumentProcessor._extract_text_with_ocr_from_bytes(pdf_bytes, profile, ocr_dpi)
+                    return []
 
                 # Her sayfayı işle
+                anchors_done = False
                 for page_num, page in enumerate(pdf.pages, 1):
+                    # Profil sayfa sınırı
+                    if profile and not profile.page_allowed(page_num):
+                        logger.info(f"Profil sayfa sınırı: {page_num - 1}/{page_count} sayfa okundu")
+                        break
+
                     text = page.extract_text()
                     if text and len(text.strip()) > 50:  # En az 50 karakter varsa
-                        text_parts.append(f"--- Sayfa {page_num} ---\n{text}")
+                        pages.append(OCRPage(page_num=page_num, source='text', text=text))
                     else:
                         # Metin yok veya çok az - OCR gerekli
                         ocr_needed_pages.append((page_num, page))
 
-            # OCR gerekiyorsa
-            if ocr_needed_pages and use_ocr:
-                logger.info(f"OCR gerekiyor: {len(ocr_needed_pages)} sayfa")
-                ocr_text = DocumentProcessor._extract_text_with_ocr(ocr_needed_pages)
-                if ocr_text:
-                    text_parts.extend(ocr_text)
-
-            full_text = '\n\n'.join(text_parts)
+                    # Erken durma: gerekli anchor'lar bulundu mu?
+                    if profile and profile.anchors_found(pages_to_text(pages)):
+                        logger.info(f"Anchor'lar bulundu, sayfa {page_num}/{page_count} sonrası okunmayacak")
+                        anchors_done = True
+                        break
+
+                # OCR gerekiyorsa (sayfalar PDF açıkken render edilmeli)
+                if ocr_needed_pages and use_ocr and not anchors_done:
+                    logger.info(f"OCR gerekiyor: {len(ocr_needed_pages)} sayfa ({ocr_dpi} DPI)")
+                    pages.extend(DocumentProcessor._extract_text_with_ocr(
+                        ocr_needed_pages,
+                        profile=profile,
+                        existing_text=pages_to_text(pages),
+                        dpi=ocr_dpi
+                    ))
+
+            pages.sort(key=lambda p: p.page_num)
+            full_text = pages_to_text(pages)
 
             logger.info(f"PDF'den {len(full_text)} karakter metin çıkarıldı ({page_count} sayfa)")
 
             # Hiç metin çıkmadıysa ve OCR kullanılacaksa, tüm PDF'i OCR ile dene
             if not full_text.strip() and use_ocr:
                 logger.warning("PDF'den hiç metin çıkarılamadı, tüm PDF OCR ile işlenecek")
-                return DocumentProcessor._extract_text_with_ocr_from_bytes(pdf_bytes)
+                return DocumentProcessor._extract_text_with_ocr_from_bytes(pdf_bytes, profile, ocr_dpi)
 
-            return full_text if full_text.strip() else None
+            return pages
 
         except Exception as e:
             logger.error(f"PDF açma/işleme hatası: {e}")
             # PDF açılamadıysa veya hata olduysa, OCR ile denemeye devam et
             if use_ocr:
                 logger.info("PDF işlenemedi, OCR ile deneniyor")
-                return DocumentProcessor._extract_text_with_ocr_from_bytes(pdf_bytes)
-            return None
+                return DocumentProcessor._extract_text_with_ocr_from_bytes(pdf_bytes, profile, ocr_dpi)
+            return []
 
     @staticmethod
-    def _extract_text_with_ocr(pages_list) -> list:
+    def _prepare_ocr_input(pil_image):
+        """
+        PIL görselini EasyOCR girdisine çevir (ön işleme açıksa uygula).
+
+        Args:
+            pil_image: Render edilmiş sayfa görseli
+
+        Returns:
+            np.ndarray: readtext'e verilecek array
+        """
+        import numpy as np
+
+        if not OCR_PREPROCESS_ENABLED:
+            return np.array(pil_image)
+
+        try:
+            return ImagePreprocessor.preprocess(
+                pil_image,
+                PreprocessOptions(binarize=OCR_PREPROCESS_BINARIZE)
+            )
+        except Exception as e:
+            logger.warning(f"Görsel ön işleme hatası, ham görsel kullanılacak: {e}")
+            return np.array(pil_image)
+
+    @staticmethod
+    def _get_easyocr_reader():
+        """EasyOCR reader'ı döndür (singleton pattern - tek seferlik)"""
+        import easyocr
+
+        if not hasattr(DocumentProcessor, '_easyocr_reader'):
+            logger.info("EasyOCR reader başlatılıyor (Türkçe + İngilizce)...")
+            DocumentProcessor._easyocr_reader = easyocr.Reader(['tr', 'en'], gpu=False)
+
+        return DocumentProcessor._easyocr_reader
+
+    @staticmethod
+    def _extract_text_with_ocr(
+        pages_list,
+        profile: Optional[ExtractionProfile] = None,
+        existing_text: str = "",
+        dpi: int = OCR_DPI
+    ) -> List[OCRPage]:
         """
         OCR ile PDF sayfalarından metin çıkar.
 
         Args:
             pages_list: [(page_num, page), ...] listesi
+            profile: Çıkarma profili (anchor'lar bulununca OCR durur)
+            existing_text: OCR öncesi çıkarılmış metin (anchor kontrolü için)
+            dpi: Render çözünürlüğü
 
         Returns:
-            list: Metin listesi
+            List[OCRPage]: Satır, kutu ve güven skorlu sayfa sonuçları
         """
         try:
-            import easyocr
-            import numpy as np
-            from PIL import Image
+            reader = DocumentProcessor._get_easyocr_reader()
         except ImportError:
             logger.warning("OCR için easyocr veya Pillow yüklü değil")
             return []
 
-        # EasyOCR reader'ı oluştur (singleton pattern - tek seferlik)
-        if not hasattr(DocumentProcessor, '_easyocr_reader'):
-            logger.info("EasyOCR reader başlatılıyor (Türkçe + İngilizce)...")
-            DocumentProcessor._easyocr_reader = easyocr.Reader(['tr', 'en'], gpu=False)
-
-        reader = DocumentProcessor._easyocr_reader
-        ocr_texts = []
+        ocr_pages = []
 
         for page_num, page in pages_list:
             try:
                 # PDF sayfasını görsel olarak render et
-                pil_image = page.to_image(resolution=300).original
+                pil_image = page.to_image(resolution=dpi).original
 
-                # PIL Image'i numpy array'e çevir (EasyOCR için gerekli)
-                image_array = np.array(pil_image)
+                # Ön işleme + numpy array (EasyOCR için gerekli)
+                image_array = DocumentProcessor._prepare_ocr_input(pil_image)
 
-                # OCR uygula
+                # OCR uygula (kutu + metin + güven)
                 result = reader.readtext(image_array)
-
-                # Sonuçları birleştir
-                ocr_text = '\n'.join([detection[1] for detection in result])
-
-                if ocr_text and len(ocr_text.strip()) > 20:
-                    ocr_texts.append(f"--- Sayfa {page_num} (OCR) ---\n{ocr_text}")
-                    logger.info(f"Sayfa {page_num}: OCR ile {len(ocr_text)} karakter çıkarıldı")
+                ocr_page = OCRPage.from_detections(page_num, result, source='ocr', dpi=dpi)
+                ocr_pages.append(ocr_page)
+
+                if len(ocr_page.text.strip()) > MIN_OCR_PAGE_CHARS:
+                    logger.info(
+                        f"Sayfa {page_num}: OCR ile {len(ocr_page.text)} karakter çıkarıldı "
+                        f"(güven: {ocr_page.mean_confidence:.2f})"
+                    )
                 else:
                     logger.warning(f"Sayfa {page_num}: OCR başarısız veya boş")
 
+                # Erken durma: kalan sayfaları OCR'lama
+                if profile and profile.anchors_found(existing_text + '\n' + pages_to_text(ocr_pages)):
+                    logger.info(f"Anchor'lar bulundu, sayfa {page_num} sonrası OCR atlanıyor")
+                    break
+
             except Exception as e:
                 logger.error(f"Sayfa {page_num} OCR hatası: {e}")
                 continue
 
-        return ocr_texts
+        return ocr_pages
 
     @staticmethod
-    def _extract_text_with_ocr_from_bytes(pdf_bytes: bytes) -> Optional[str]:
+    def _extract_text_with_ocr_from_bytes(
+        pdf_bytes: bytes,
+        profile: Optional[ExtractionProfile] = None,
+        dpi: int = OCR_DPI
+    ) -> List[OCRPage]:
         """
         PDF bytes'ını görsel olarak render edip OCR uygula.
         PDF açılamadığında veya 0 sayfa olduğunda kullanılır.
 
         Args:
             pdf_bytes: PDF dosya bytes'ı
+            profile: Çıkarma profili (sadece ilk max_pages sayfa render edilir)
+            dpi: Render çözünürlüğü
 
         Returns:
-            str: OCR ile çıkarılan metin, başarısızsa None
+            List[OCRPage]: OCR sayfa sonuçları, başarısızsa boş liste
         """
         try:
-            import easyocr
-            import numpy as np
-            from PIL import Image
             from pdf2image import convert_from_bytes
+            reader = DocumentProcessor._get_easyocr_reader()
         except ImportError:
             logger.error("OCR için easyocr, Pillow veya pdf2image yüklü değil")
             logger.info("pip install easyocr pillow pdf2image")
-            return None
+            return []
 
         try:
-            logger.info("PDF'i görsele çevirip OCR yapılıyor...")
+            logger.info(f"PDF'i görsele çevirip OCR yapılıyor ({dpi} DPI)...")
 
-            # PDF'i görsellere çevir (300 DPI)
-            images = convert_from_bytes(pdf_bytes, dpi=300)
+            # PDF'i görsellere çevir (profil varsa sadece ilk sayfalar)
+            if profile and profile.max_pages:
+                images = convert_from_bytes(pdf_bytes, dpi=dpi, first_page=1, last_page=profile.max_pages)
+            else:
+                images = convert_from_bytes(pdf_bytes, dpi=dpi)
 
             if not images:
                 logger.error("PDF'den görsel çıkarılamadı")
-                return None
+                return []
 
             logger.info(f"{len(images)} görsel oluşturuldu, OCR uygulanıyor...")
 
-            # EasyOCR reader'ı oluştur (singleton pattern)
-            if not hasattr(DocumentProcessor, '_easyocr_reader'):
-                logger.info("EasyOCR reader başlatılıyor (Türkçe + İngilizce)...")
-                DocumentProcessor._easyocr_reader = easyocr.Reader(['tr', 'en'], gpu=False)
-
-            reader = DocumentProcessor._easyocr_reader
-            ocr_texts = []
+            ocr_pages = []
 
             for page_num, image in enumerate(images, 1):
                 try:
-                    # PIL Image'i numpy array'e çevir
-                    image_array = np.array(image)
+                    # Ön işleme + numpy array
+                    image_array = DocumentProcessor._prepare_ocr_input(image)
 
-                    # OCR uygula
+                    # OCR uygula (kutu + metin + güven)
                     result = reader.readtext(image_array)
-
-                    # Sonuçları birleştir
-                    ocr_text = '\n'.join([detection[1] for detection in result])
-
-                    if ocr_text and len(ocr_text.strip()) > 20:
-                        ocr_texts.append(f"--- Sayfa {page_num} (OCR-Full) ---\n{ocr_text}")
-                        logger.info(f"Sayfa {page_num}: OCR ile {len(ocr_text)} karakter çıkarıldı")
+                    ocr_page = OCRPage.from_detections(page_num, result, source='ocr-full', dpi=dpi)
+                    ocr_pages.append(ocr_page)
+
+                    if len(ocr_page.text.strip()) > MIN_OCR_PAGE_CHARS:
+                        logger.info(
+                            f"Sayfa {page_num}: OCR ile {len(ocr_page.text)} karakter çıkarıldı "
+                            f"(güven: {ocr_page.mean_confidence:.2f})"
+                        )
                     else:
                         logger.warning(f"Sayfa {page_num}: OCR boş sonuç verdi")
 
+                    # Erken durma
+                    if profile and profile.anchors_found(pages_to_text(ocr_pages)):
+                        logger.info(f"Anchor'lar bulundu, sayfa {page_num} sonrası OCR atlanıyor")
+                        break
+
                 except Exception as e:
                     logger.error(f"Sayfa {page_num} OCR hatası: {e}")
                     continue
 
-            full_text = '\n\n'.join(ocr_texts)
+            full_text = pages_to_text(ocr_pages)
 
             if full_text.strip():
                 logger.info(f"OCR tamamlandı: {len(full_text)} karakter çıkarıldı")
-                return full_text
             else:
                 logger.warning("OCR hiç metin çıkaramadı")
-                return None
+
+            return ocr_pages
 
         except Exception as e:
             logger.error(f"PDF-to-Image OCR hatası: {e}")
-            return None
+            return []
+
+    @staticmethod
+    def _vision_optimizer():
+        """Ayarlardaki parametrelerle paylaşılan vision girdi optimizer'ı"""
+        return get_vision_optimizer(
+            VisionInputOptions(
+                max_side=VISION_MAX_SIDE,
+                jpeg_quality=VISION_JPEG_QUALITY,
+                crop=VISION_CROP,
+                scan_pages=VISION_SCAN_PAGES,
+                max_pages=VISION_MAX_PAGES,
+                tile=VISION_MAX_PAGES > 1,
+                render_dpi=VISION_RENDER_DPI
+            ),
+            cache_size=VISION_CACHE_SIZE
+        )
 
     @staticmethod
     def process_image(image_bytes: bytes) -> Optional[str]:
         """
-        Görsel dosyayı işle ve Base64'e çevir.
+        Görsel dosyayı vision girdisine çevir (kırp + küçült + JPEG + Base64).
 
         Args:
             image_bytes: Görsel dosya bytes'ı
@@ -273,38 +389,36 @@ class DocumentProcessor:
         Returns:
             str: Base64 encoded görsel, başarısızsa None
         """
-        if not PILLOW_AVAILABLE:
-            logger.error("Pillow yüklü değil")
-            return None
-
+        # Pillow yoksa optimizer None döner (hata loglanır)
         try:
-            # Görseli yükle
-            image = Image.open(io.BytesIO(image_bytes))
+            return DocumentProcessor._vision_optimizer().optimize_image(image_bytes)
 
-            # RGBA ise RGB'ye çevir
-            if image.mode == 'RGBA':
-                image = image.convert('RGB')
+        except Exception as e:
+            logger.error(f"Görsel işleme hatası: {e}")
+            return None
 
-            # Boyut küçült (gereksiz büyük görsel varsa)
-            max_dimension = 2000
-            if max(image.size) > max_dimension:
-                ratio = max_dimension / max(image.size)
-                new_size = tuple(int(dim * ratio) for dim in image.size)
-                image = image.resize(new_size, Image.Resampling.LANCZOS)
+    @staticmethod
+    def render_pdf_vision_image(pdf_bytes: bytes) -> Optional[str]:
+        """
+        PDF'in içerik taşıyan sayfalarını tek vision girdisine çevir (vision fallback).
 
-            # Base64'e çevir
-            buffer = io.BytesIO()
-            image.save(buffer, format='JPEG', quality=85)
-            buffer.seek(0)
+        Boş sayfalar atlanır; ilk sayfa ve en dolu sayfalar (VISION_MAX_PAGES)
+        yan yana döşenir.
 
-            encoded = base64.b64encode(buffer.read()).decode('utf-8')
+        Args:
+            pdf_bytes: PDF dosya bytes'ı
 
-            logger.info(f"Görsel işlendi: {image.size} -> Base64 ({len(encoded)} karakter)")
+        Returns:
+            str: Base64 encoded JPEG, başarısızsa None
+        """
+        if not PDFPLUMBER_AVAILABLE:
+            return None
 
-            return encoded
+        try:
+            return DocumentProcessor._vision_optimizer().optimize_pdf(pdf_bytes)
 
         except Exception as e:
-            logger.error(f"Görsel işleme hatası: {e}")
+            logger.error(f"PDF sayfa render hatası: {e}")
             return None
 
     @staticmethod
@@ -342,7 +456,9 @@ class DocumentProcessor:
     @staticmethod
     def process_document(
         base64_content: str,
-        file_extension: Optional[str] = None
+        file_extension: Optional[str] = None,
+        profile: Optional[ExtractionProfile] = None,
+        ocr_dpi: int = OCR_DPI
     ) -> Dict[str, Any]:
         """
         Belgeyi işle (tip otomatik tespit).
@@ -350,12 +466,16 @@ class DocumentProcessor:
         Args:
             base64_content: Base64 encoded belge
             file_extension: Dosya uzantısı (opsiyonel)
+            profile: Belge tipi çıkarma profili (opsiyonel)
+            ocr_dpi: OCR render çözünürlüğü
 
         Returns:
             Dict: {
                 'type': 'pdf' | 'image' | 'unknown',
                 'text': str (PDF ise),
                 'image_base64': str (görsel ise),
+                'pages': List[OCRPage] (PDF ise),
+                'ocr_stats': Dict (PDF ise, summarize_pages çıktısı),
                 'success': bool,
                 'error': str (hata varsa)
             }
@@ -364,6 +484,8 @@ class DocumentProcessor:
             'type': 'unknown',
             'text': None,
             'image_base64': None,
+            'pages': [],
+            'ocr_stats': None,
             'success': False,
             'error': None,
         }
@@ -390,8 +512,11 @@ class DocumentProcessor:
 
             # PDF ise metin çıkar
             if file_type == 'pdf':
-                text = DocumentProcessor.extract_text_from_pdf(file_bytes)
-                if text:
+                pages = DocumentProcessor.extract_pages_from_pdf(file_bytes, profile=profile, ocr_dpi=ocr_dpi)
+                text = pages_to_text(pages)
+                result['pages'] = pages
+                result['ocr_stats'] = summarize_pages(pages)
+                if text.strip():
                     result['text'] = text
                     result['success'] = True
                 else:
@@ -0,0 +1,158 @@
+"""
+HİTAP Hizmet Dökümü Parser
+Kamu görev satırlarını (kurum, unvan, başlangıç, bitiş) çıkarır ve
+toplam hizmet süresini hesaplar (SGKParser ile aynı çıktı alanları).
+"""
+
+import re
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from services.template_parser import TARIH_PATTERN, extract_pdf_text, find_labeled, parse_date
+
+logger = logging.getLogger(__name__)
+
+
+class HitapParser:
+    """
+    HİTAP hizmet dökümü tablosunu parse eder.
+    """
+
+    DAYS_PER_YEAR = 365
+    DAYS_PER_MONTH = 30
+
+    BELGE_BASLIGI = re.compile(r'H[İI]TAP|H[İI]ZMET\s+(?:BELGES[İI]|CETVEL[İI]|D[ÖO]K[ÜU]M[ÜU])', re.IGNORECASE)
+
+    # Görev satırı: <kurum / unvan>  GG.AA.YYYY  GG.AA.YYYY|DEVAM|HALEN|boş  [süre]
+    GOREV_SATIRI = re.compile(
+        r'^(?P<aciklama>.*?\S)[ \t]+'
+        r'(?P<baslangic>' + TARIH_PATTERN + r')[ \t]*[-–]?[ \t]*'
+        r'(?P<bitis>' + TARIH_PATTERN + r'|DEVAM\S*|HALEN|H[ÂA]LEN)?'
+        r'(?P<kalan>.*)$',
+        re.IGNORECASE | re.MULTILINE
+    )
+
+    # "Toplam Hizmet Süresi : 12 Yıl 5 Ay 3 Gün"
+    TOPLAM_SURE = re.compile(
+        r'Toplam\s+(?:Hizmet|G[öo]rev)?\s*S[üu]resi\s*:?\s*(?P<yil>\d+)\s*Y[ıi]l\s*(?:(?P<ay>\d+)\s*Ay)?\s*(?:(?P<gun>\d+)\s*G[üu]n)?',
+        re.IGNORECASE
+    )
+
+    # Kurum adının sonu: BAKANLIĞI, MÜDÜRLÜĞÜ, VALİLİĞİ, BELEDİYESİ ... (kalan kısım unvan)
+    KURUM_SONU = re.compile(
+        r'\S*(?:L[IİUÜ][ĞG][IİUÜ]|BELED[İI]YES[İI]|[ÜU]N[İI]VERS[İI]TES[İI]|KURUMU|ENST[İI]T[ÜU]S[ÜU])(?=\s|$)',
+        re.IGNORECASE
+    )
+
+    def parse_hitap_document(self, pdf_bytes: bytes) -> Optional[Dict]:
+        """
+        HİTAP belgesini parse et.
+
+        Returns:
+            Dict: Toplam deneyim ve görev listesi veya None (şablon tanınmadı)
+        """
+        try:
+            text = extract_pdf_text(pdf_bytes)
+            return self.parse_text(text)
+        except Exception as e:
+            logger.error(f"HİTAP parse hatası: {e}", exc_info=True)
+            return None
+
+    def parse_text(self, text: str, today: Optional[datetime] = None) -> Optional[Dict]:
+        """Metinden görev geçmişini ve toplam süreyi çıkar"""
+        if not text or not self.BELGE_BASLIGI.search(text):
+            logger.info("HİTAP başlığı bulunamadı, şablon tanınmadı")
+            return None
+
+        today = today or datetime.now()
+        gorevler = self._extract_rows(text, today)
+        toplam = self._stated_total(text)
+
+        if not gorevler and toplam is None:
+            logger.info("HİTAP belgesinde görev satırı / toplam süre bulunamadı")
+            return None
+
+        if toplam is None:
+            toplam = self._merged_days(gorevler, today)
+
+        ad_soyad = find_labeled(text, r'Ad[ıi]?\s*Soyad[ıi]?', r"[A-ZÇĞİÖŞÜ][A-ZÇĞİÖŞÜ' ]+")
+        baslangiclar = [g['baslangic_tarihi'] for g in gorevler]
+        devam_ediyor = any(g['bitis_tarihi'] is None for g in gorevler)
+
+        return {
+            'ad_soyad': ad_soyad,
+            'tc_kimlik_no': find_labeled(text, r'T\.?\s*C\.?\s*Kimlik\s*No(?:su)?', r'\d{11}', line_end=False),
+            'sicil_no': find_labeled(text, r'Sicil\s*No(?:su)?|Kurum\s+Sicil\s+No', r'\d+', line_end=False),
+            'toplam_gun': toplam,
+            'toplam_is_deneyimi_yil': toplam // self.DAYS_PER_YEAR,
+            'toplam_is_deneyimi_ay': (toplam % self.DAYS_PER_YEAR) // self.DAYS_PER_MONTH,
+            'ilk_ise_giris_tarihi': min(baslangiclar, key=self._sort_key) if baslangiclar else None,
+            'son_cikis_tarihi': None if devam_ediyor or not gorevler else max(
+                (g['bitis_tarihi'] for g in gorevler), key=self._sort_key
+            ),
+            'kayit_sayisi': len(gorevler),
+            'gorevler': gorevler,
+        }
+
+    def _extract_rows(self, text: str, today: datetime) -> List[Dict]:
+        """Başlangıç tarihi içeren görev satırları"""
+        gorevler = []
+        for match in self.GOREV_SATIRI.finditer(text):
+            aciklama = match.group('aciklama').strip()
+            # Etiket satırları (Doğum Tarihi, Belge Tarihi ...) görev değil
+            if re.search(r'tarih[iı]?\s*:?$', aciklama, re.IGNORECASE):
+                continue
+
+            baslangic = parse_date(match.group('baslangic'))
+            bitis_raw = match.group('bitis')
+            bitis = parse_date(bitis_raw) if bitis_raw else None
+            if not baslangic or (bitis and bitis < baslangic) or baslangic > today:
+                continue
+
+            kurum_sonlari = list(self.KURUM_SONU.finditer(aciklama))
+            kurum_end = kurum_sonlari[-1].end() if kurum_sonlari else len(aciklama)
+
+            gorevler.append({
+                'kurum': aciklama[:kurum_end].strip(),
+                'gorev': aciklama[kurum_end:].strip() or None,
+                'baslangic_tarihi': baslangic.strftime('%d.%m.%Y'),
+                'bitis_tarihi': bitis.strftime('%d.%m.%Y') if bitis else None,
+                'gorev_gun': ((bitis or today) - baslangic).days + 1,
+            })
+        return gorevler
+
+    def _stated_total(self, text: str) -> Optional[int]:
+        """Belgede yazan toplam hizmet süresi (gün)"""
+        match = self.TOPLAM_SURE.search(text)
+        if not match:
+            return None
+        return (
+            int(match.group('yil')) * self.DAYS_PER_YEAR
+            + int(match.group('ay') or 0) * self.DAYS_PER_MONTH
+            + int(match.group('gun') or 0)
+        )
+
+    def _merged_days(self, gorevler: List[Dict], today: datetime) -> int:
+        """Çakışan görev aralıklarını birleştirip toplam gün hesapla"""
+        intervals: List[Tuple[datetime, datetime]] = sorted(
+            (parse_date(g['baslangic_tarihi']), parse_date(g['bitis_tarihi']) or today)
+            for g in gorevler
+        )
+
+        total = 0
+        current_start, current_end = None, None
+        for start, end in intervals:
+            if current_end is None or start > current_end:
+                if current_end is not None:
+                    total += (current_end - current_start).days + 1
+                current_start, current_end = start, end
+            else:
+                current_end = max(current_end, end)
+        if current_end is not None:
+            total += (current_end - current_start).days + 1
+        return total
+
+    @staticmethod
+    def _sort_key(value: str) -> datetime:
+        return parse_date(value) or datetime.max
@@ -0,0 +1,80 @@
+"""
+İki kademeli model (cascade)
+
+Her belge önce küçük / hızlı modelle analiz edilir; sonuç aşağıdaki
+kontrollerden birine takılırsa aynı metin büyük modelle yeniden analiz
+edilir:
+
+- sonuc_yok: Küçük model geçerli JSON üretemedi
+- validasyon: BaseAnalyzer._validate_result uyarı verdi
+- capraz_dogrulama: Üst yazıdaki bilgilerle çelişiyor (CrossValidator)
+- eksik_alan: Dolu alan oranı tamlık eşiğinin altında
+
+Basit belgelerin çoğu küçük modelde biter; belge tipi bazlı yükseltme
+oranları cascade_stats'ta (ve belge_analiz_log.model_kademesi'nde) izlenir.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+SONUC_YOK = "sonuc_yok"
+VALIDASYON = "validasyon"
+CAPRAZ_DOGRULAMA = "capraz_dogrulama"
+EKSIK_ALAN = "eksik_alan"
+
+
+def completeness(result: Dict[str, Any]) -> float:
+    """
+    Sonuçtaki dolu alan oranı (0-1)
+
+    İç alanlar (_chunk_data vb.) sayılmaz; None, boş string ve boş
+    liste / sözlük boş kabul edilir.
+    """
+    fields = [key for key in result if not key.startswith('_')]
+    if not fields:
+        return 0.0
+    filled = sum(1 for key in fields if result[key] not in (None, '', [], {}))
+    return filled / len(fields)
+
+
+class CascadeStats:
+    """Belge tipi bazlı kademe / yükseltme sayaçları (süreç geneli)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, document_type: str, reasons: List[str]):
+        with self._lock:
+            counts = self._counts.setdefault(document_type, {'documents': 0, 'escalated': 0, 'reasons': {}})
+            counts['documents'] += 1
+            if reasons:
+                counts['escalated'] += 1
+                for reason in reasons:
+                    counts['reasons'][reason] = counts['reasons'].get(reason, 0) + 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                doc_type: {
+                    'documents': c['documents'],
+                    'escalated': c['escalated'],
+                    'escalation_rate': c['escalated'] / c['documents'] if c['documents'] else 0.0,
+                    'reasons': dict(c['reasons']),
+                }
+                for doc_type, c in self._counts.items()
+            }
+
+    def summary(self) -> str:
+        """Tek satır rapor: "CV 2/10 (%20), SGK 0/4 (%0)" """
+        return ", ".join(
+            f"{doc_type} {s['escalated']}/{s['documents']} ({s['escalation_rate']:.0%})"
+            for doc_type, s in self.to_dict().items()
+        )
+
+
+cascade_stats = CascadeStats()
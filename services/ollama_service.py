@@ -6,24 +6,122 @@ LLM ile belge analizi yapar.
 import requests
 import json
 import logging
-import time
 from typing import Dict, Optional, Any
-from tenacity import retry, stop_after_attempt, wait_exponential
 
 from config.settings import (
+    OLLAMA_BACKENDS,
+    OLLAMA_HEALTH_INTERVAL,
     OLLAMA_API_URL,
     OLLAMA_MODEL,
     OLLAMA_TIMEOUT,
     OLLAMA_MAX_RETRIES,
+    OLLAMA_RETRY_DELAY,
+    OLLAMA_BREAKER_THRESHOLD,
+    OLLAMA_BREAKER_RESET_SECONDS,
+    OLLAMA_RETRY_BUDGET_RATIO,
+    OLLAMA_RETRY_BUDGET_MIN,
+    OLLAMA_POOL_SIZE,
+    OLLAMA_VERIFY_SSL,
     OLLAMA_OPTIONS,
+    OLLAMA_STREAM,
+    OLLAMA_JSON_FORMAT,
+    OLLAMA_KEEP_ALIVE,
+    OLLAMA_VISION_MODEL,
+    OLLAMA_WARMUP,
+    OLLAMA_IDLE_KEEP_ALIVE,
+    OLLAMA_CASCADE_ENABLED,
+    OLLAMA_CASCADE_SMALL_MODEL,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL_HOURS,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_MAX_MB,
+    LLM_SCHEDULER_ENABLED,
+    LLM_SCHEDULER_SLOTS,
+    LLM_SCHEDULER_WEIGHTS,
+    LLM_SCHEDULER_CAPS,
+    LLM_SCHEDULER_SHARED_PATH,
+    LLM_SCHEDULER_LEASE_SECONDS,
+    CHARS_PER_TOKEN,
+    TOKEN_COUNTER,
+    TOKENIZER_PATH,
 )
+from app.services.llm_cache import get_llm_cache
+from app.services.llm_scheduler import get_llm_scheduler
+from app.services.circuit_breaker import LLMUnavailableError
+from app.services.ollama_client import OllamaClient, extract_usage, llm_stats
+from app.services.token_counter import get_token_counter
+from app.services.model_warmup import get_model_warmup
+from app.prompts.base_prompt import DOCUMENT_PLACEHOLDER, build_prefix_first_prompt
 
 logger = logging.getLogger(__name__)
 
+# Bu süreçte istek gönderilen modeller (sıralı küme): cool_down, warm-up
+# listesinde olmayıp sonradan yüklenenleri de (cascade büyük modeli) bırakır
+_requested_models: Dict[str, None] = {}
+
+
+def parse_json_response(response_text: str) -> Any:
+    """
+    Model yanıtındaki JSON'u ayrıştır (baştaki / sondaki markdown code block atılır)
+
+    Raises:
+        json.JSONDecodeError: Geçerli JSON değil
+    """
+    response_text = response_text.strip()
+    if response_text.startswith('```json'):
+        response_text = response_text[7:]
+    if response_text.startswith('```'):
+        response_text = response_text[3:]
+    if response_text.endswith('```'):
+        response_text = response_text[:-3]
+    return json.loads(response_text.strip())
+
+
+def is_json_response(result: Dict[str, Any]) -> bool:
+    """Yanıt JSON olarak ayrıştırılabiliyor mu? (cache'e sadece bunlar yazılır)"""
+    try:
+        parse_json_response(result.get('response', ''))
+        return True
+    except ValueError:
+        return False
+
+
+def get_response_cache():
+    """Ayarlardan yapılandırılmış paylaşılan LLM yanıt cache'i"""
+    return get_llm_cache(
+        LLM_CACHE_PATH,
+        ttl_seconds=LLM_CACHE_TTL_HOURS * 3600,
+        max_entries=LLM_CACHE_MAX_ENTRIES,
+        max_bytes=LLM_CACHE_MAX_MB * 1024 * 1024,
+        enabled=LLM_CACHE_ENABLED
+    )
+
+
+def get_request_scheduler():
+    """Ayarlardan yapılandırılmış paylaşılan öncelikli istek zamanlayıcı (kapalıysa None)"""
+    if not LLM_SCHEDULER_ENABLED:
+        return None
+    return get_llm_scheduler(
+        OLLAMA_BACKENDS,
+        shared_path=LLM_SCHEDULER_SHARED_PATH or None,
+        lease_seconds=LLM_SCHEDULER_LEASE_SECONDS,
+        slots=LLM_SCHEDULER_SLOTS,
+        weights=LLM_SCHEDULER_WEIGHTS,
+        caps=LLM_SCHEDULER_CAPS
+    )
+
 
 class OllamaService:
     """Ollama API client servisi"""
 
+    # analyze_document sistem promptu (chunk token bütçesinde de sayılır)
+    DOCUMENT_SYSTEM_PROMPT = (
+        "Sen bir belge analiz asistanısın. "
+        "Verilen belgeyi analiz edip istenen bilgileri JSON formatında çıkar. "
+        "Sadece JSON döndür, başka açıklama yapma."
+    )
+
     def __init__(self, model: str = OLLAMA_MODEL):
         """
         Args:
@@ -32,38 +130,67 @@ class OllamaService:
         self.model = model
         self.api_url = OLLAMA_API_URL
         self.timeout = OLLAMA_TIMEOUT
+        self.cache = get_response_cache()
+        self.client = OllamaClient(
+            OLLAMA_BACKENDS,
+            timeout=OLLAMA_TIMEOUT,
+            max_retries=OLLAMA_MAX_RETRIES,
+            retry_delay=OLLAMA_RETRY_DELAY,
+            verify=OLLAMA_VERIFY_SSL,
+            pool_size=OLLAMA_POOL_SIZE,
+            stream=OLLAMA_STREAM,
+            cache=self.cache,
+            health_interval=OLLAMA_HEALTH_INTERVAL,
+            breaker_threshold=OLLAMA_BREAKER_THRESHOLD,
+            breaker_reset_seconds=OLLAMA_BREAKER_RESET_SECONDS,
+            retry_budget_ratio=OLLAMA_RETRY_BUDGET_RATIO,
+            retry_budget_min=OLLAMA_RETRY_BUDGET_MIN,
+            scheduler=get_request_scheduler()
+        )
+        self.token_counter = get_token_counter(
+            model,
+            mode=TOKEN_COUNTER,
+            tokenizer_path=TOKENIZER_PATH or None,
+            client=self.client,
+            chars_per_token=CHARS_PER_TOKEN
+        )
 
-    @retry(
-        stop=stop_after_attempt(OLLAMA_MAX_RETRIES),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
-    )
     def generate(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
-        images: Optional[list] = None
+        images: Optional[list] = None,
+        use_cache: bool = True,
+        model: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None,
+        format: Optional[str] = None,
+        cache_if=None
     ) -> Dict[str, Any]:
         """
         Ollama generate API çağrısı.
 
+        Retry, bağlantı havuzu, stream ve cache OllamaClient'ta.
+
         Args:
             prompt: Ana prompt
             system_prompt: Sistem promptu (opsiyonel)
             images: Base64 encoded görseller (vision model için)
+            use_cache: False ise cache okunmaz (yanıt yine yazılır)
+            model: Model (None = servis modeli)
+            options: OLLAMA_OPTIONS üzerine yazılacak seçenekler
+            format: Ollama çıktı formatı ("json" = JSON modu, None = serbest metin)
+            cache_if: Yanıtı cache'e yazmadan önce doğrula (None = her yanıt yazılır)
 
         Returns:
-            Dict: API response
+            Dict: API response ('usage': token / süre sayaçları, cache'ten geldiyse None)
 
         Raises:
             Exception: API hatası
         """
-        start_time = time.time()
-
         payload = {
-            "model": self.model,
+            "model": model or self.model,
             "prompt": prompt,
-            "stream": False,
-            "options": OLLAMA_OPTIONS,
+            "options": {**OLLAMA_OPTIONS, **options} if options else OLLAMA_OPTIONS,
         }
 
         if system_prompt:
@@ -72,21 +199,37 @@ class OllamaService:
         if images:
             payload["images"] = images
 
+        if format:
+            payload["format"] = format
+
+        if OLLAMA_KEEP_ALIVE:
+            payload["keep_alive"] = OLLAMA_KEEP_ALIVE
+
+        _requested_models.setdefault(payload["model"], None)
+
         try:
             logger.debug(f"Ollama API isteği gönderiliyor: {self.api_url}")
 
-            response = requests.post(
-                self.api_url,
-                json=payload,
-                timeout=self.timeout
-            )
+            result = self.client.generate(payload, use_cache=use_cache, cache_if=cache_if)
+            duration = result['duration']
 
-            response.raise_for_status()
+            # prompt_eval_count KV cache'ten gelen prefix'i içermez: token oranı
+            # buradan kalibre edilmez (bkz. TokenCounter.calibrate)
 
-            result = response.json()
-            duration = time.time() - start_time
+            if result.get('ttft') is not None and not result.get('cached'):
+                logger.info(
+                    f"Ollama API başarılı (süre: {duration:.2f}s, ilk token: {result['ttft']:.2f}s"
+                    f"{', erken sonlandırıldı' if result.get('early_stop') else ''})"
+                )
+            elif not result.get('cached'):
+                logger.info(f"Ollama API başarılı (süre: {duration:.2f}s)")
 
-            logger.info(f"Ollama API başarılı (süre: {duration:.2f}s)")
+            # KV cache'ten gelen prefix token'ları prompt_eval_count'a dahil değildir
+            if result.get('prompt_eval_duration') is not None:
+                logger.debug(
+                    f"Prompt eval: {result.get('prompt_eval_count', 0)} token, "
+                    f"{result['prompt_eval_duration'] / 1e9:.2f}s"
+                )
 
             return {
                 'success': True,
@@ -94,9 +237,17 @@ class OllamaService:
                 'duration': duration,
                 'model': result.get('model'),
                 'context': result.get('context'),
+                'ttft': result.get('ttft'),
+                'early_stop': result.get('early_stop', False),
+                'cached': result.get('cached', False),
+                'usage': extract_usage(result),
                 'raw': result,
             }
 
+        except LLMUnavailableError as e:
+            logger.warning(f"Ollama isteği gönderilmedi: {e}")
+            raise
+
         except requests.Timeout:
             logger.error(f"Ollama API timeout ({self.timeout}s)")
             raise
@@ -113,7 +264,8 @@ class OllamaService:
         self,
         document_text: str,
         document_type: str,
-        prompt_template: str
+        prompt_template: str,
+        model: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Belge analizi yap.
@@ -122,35 +274,40 @@ class OllamaService:
             document_text: Belge metni
             document_type: Belge tipi
             prompt_template: Prompt template
+            model: Model (None = servis modeli; cascade kademesi için)
 
         Returns:
             Dict: Analiz sonucu (JSON parse edilmiş)
         """
         try:
-            # Prompt oluştur
-            prompt = prompt_template.format(
-                document_text=document_text,
-                document_type=document_type
+            # Prompt oluştur: şablonun statik kısmı önde, belge metni sonda
+            # (aynı belge tipinin tüm chunk'larında prefix birebir aynı → KV cache)
+            prompt = build_prefix_first_prompt(
+                prompt_template.format(
+                    document_text=DOCUMENT_PLACEHOLDER,
+                    document_type=document_type
+                ),
+                document_text
             )
 
-            system_prompt = (
-                "Sen bir belge analiz asistanısın. "
-                "Verilen belgeyi analiz edip istenen bilgileri JSON formatında çıkar. "
-                "Sadece JSON döndür, başka açıklama yapma."
-            )
+            system_prompt = self.DOCUMENT_SYSTEM_PROMPT
 
             # 🔍 LOG: REQUEST
             logger.info(f"{'='*80}")
             logger.info(f"📤 OLLAMA REQUEST - Belge Tipi: {document_type}")
-            logger.info(f"Model: {self.model}")
+            logger.info(f"Model: {model or self.model}")
             logger.info(f"Prompt uzunluğu: {len(prompt)} karakter")
             logger.info(f"Document text ilk 200 char: {document_text[:200]}...")
             logger.info(f"{'='*80}")
 
             # API çağrısı
+            # Ayrıştırılamayan yanıt cache'e yazılmaz: tekrar çalıştırmada LLM yeniden denenir
             result = self.generate(
                 prompt=prompt,
-                system_prompt=system_prompt
+                system_prompt=system_prompt,
+                model=model,
+                format="json" if OLLAMA_JSON_FORMAT else None,
+                cache_if=is_json_response
             )
 
             if not result['success']:
@@ -168,18 +325,8 @@ class OllamaService:
             logger.info(f"Süre: {result.get('duration', 0):.2f}s")
             logger.info(f"{'='*80}")
 
-            # JSON temizleme (markdown code block varsa)
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.startswith('```'):
-                response_text = response_text[3:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-
-            response_text = response_text.strip()
-
-            # Parse
-            parsed = json.loads(response_text)
+            # Parse (markdown code block varsa atılır)
+            parsed = parse_json_response(response_text)
 
             # 🔍 LOG: PARSED JSON
             logger.info(f"{'='*80}")
@@ -211,14 +358,20 @@ class OllamaService:
                 'data': parsed,
                 'duration': result['duration'],
                 'model': result['model'],
+                'usage': result.get('usage'),
                 'success': True,
             }
 
         except json.JSONDecodeError as e:
+            llm_stats.add(parse_failures=1)
             logger.error(f"JSON parse hatası: {e}")
             logger.error(f"Response: {result.get('response', '')[:200]}")
             return None
 
+        except LLMUnavailableError:
+            # Analyzer'a kadar çıkar: başvuru bekletilir, sonraki belgeler denenmez
+            raise
+
         except Exception as e:
             logger.error(f"Belge analiz hatası: {e}")
             return None
@@ -252,33 +405,29 @@ class OllamaService:
             result = self.generate(
                 prompt=prompt,
                 system_prompt=system_prompt,
-                images=[image_base64]
+                images=[image_base64],
+                model=OLLAMA_VISION_MODEL,
+                format="json" if OLLAMA_JSON_FORMAT else None,
+                cache_if=is_json_response
             )
 
             if not result['success']:
                 return None
 
             # JSON parse
-            response_text = result['response'].strip()
-
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.startswith('```'):
-                response_text = response_text[3:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-
-            response_text = response_text.strip()
-
-            parsed = json.loads(response_text)
+            parsed = parse_json_response(result['response'])
 
             return {
                 'data': parsed,
                 'duration': result['duration'],
                 'model': result['model'],
+                'usage': result.get('usage'),
                 'success': True,
             }
 
+        except LLMUnavailableError:
+            raise
+
         except Exception as e:
             logger.error(f"Vision analiz hatası: {e}")
             return None
@@ -291,10 +440,85 @@ class OllamaService:
             bool: API erişilebilir mi?
         """
         try:
-            # Basit bir test promptu
-            result = self.generate("test", system_prompt="Say hello")
+            # Basit bir test promptu (kısa çıktı yeterli); cache okunmaz ve yazılmaz
+            result = self.generate(
+                "test", system_prompt="Say hello", use_cache=False, options={"num_predict": 8},
+                cache_if=lambda _: False
+            )
             return result['success']
 
         except Exception as e:
             logger.error(f"Ollama health check başarısız: {e}")
             return False
+
+    def is_available(self) -> bool:
+        """
+        Devre kesici çağrı kabul ediyor mu? (istek göndermeden)
+
+        Half-open'da deneme isteği sürerken de True: çağrılar reddedilmez,
+        denemenin sonucunu bekler.
+
+        Returns:
+            bool: False ise Ollama çağrıları hemen LLMUnavailableError alır
+        """
+        return self.client.breaker.available()
+
+    def _warmup_models(self) -> list:
+        """
+        Toplu çalıştırma başında yüklenecek modeller.
+
+        Cascade'de büyük model ısıtılmaz; ilk yükseltmede yüklenir ve
+        cool_down'da bırakılır (bkz. _requested_models).
+
+        Returns:
+            list: Model adları (metin + vision)
+        """
+        if OLLAMA_CASCADE_ENABLED:
+            return [OLLAMA_CASCADE_SMALL_MODEL, OLLAMA_VISION_MODEL]
+        return [self.model, OLLAMA_VISION_MODEL]
+
+    def warm_up(self, force: bool = False, verify: bool = True) -> bool:
+        """
+        Kullanılan modelleri (metin + vision) her backend'de yükle.
+
+        Toplu çalıştırma / worker başında çağrılır; ilk chunk model yükleme
+        süresini beklemez. Modeller OLLAMA_KEEP_ALIVE boyunca bellekte kalır.
+
+        Args:
+            force: Yakın zamanda ısıtılmış olsa da tekrar yükle
+            verify: Yüklemeden sonra check_health ile doğrula
+
+        Returns:
+            bool: Ollama hazır mı?
+        """
+        if not OLLAMA_WARMUP:
+            return self.check_health() if verify else True
+
+        warmup = get_model_warmup(self.client, OLLAMA_KEEP_ALIVE, load_timeout=OLLAMA_TIMEOUT)
+        if not force and not verify and all(warmup.is_warm(m) for m in self._warmup_models()):
+            return True
+
+        loaded = warmup.warm_up(self._warmup_models(), force=force)
+        if not all(loaded.values()):
+            logger.error(f"Ollama model yüklenemedi: {[m for m, ok in loaded.items() if not ok]}")
+            return False
+
+        if verify and not self.check_health():
+            return False
+
+        return True
+
+    def cool_down(self) -> int:
+        """
+        Kuyruk boşaldığında modelleri OLLAMA_IDLE_KEEP_ALIVE ile bırak.
+
+        Isıtılan modellerin yanında bu süreçte istek gönderilen diğer modeller
+        de (cascade büyük modeli) bırakılır; kullanılmayan model yüklenmez.
+
+        Returns:
+            int: Bırakılan backend × model sayısı
+        """
+        if OLLAMA_IDLE_KEEP_ALIVE == "":
+            return 0
+        warmup = get_model_warmup(self.client, OLLAMA_KEEP_ALIVE, load_timeout=OLLAMA_TIMEOUT)
+        return warmup.cool_down(self._warmup_models() + list(_requested_models), OLLAMA_IDLE_KEEP_ALIVE)
@@ -0,0 +1,111 @@
+"""
+Şablon (template) belgeler için ortak parser yardımcıları
+
+YÖK diploması, adli sicil kaydı, HİTAP ve SGK dökümleri e-Devlet
+şablonundan üretilir; alanlar sabit etiketlerle ve tablolarla gelir.
+Bu belgeler LLM chunk analizine (30-180 sn) gitmeden regex / tablo
+kalıplarıyla milisaniyeler içinde parse edilir. Parser sonuç
+bulamazsa analyzer LLM'e düşer (SGKAnalyzer ile aynı sözleşme).
+
+parse_stats: Belge tipi bazlı deterministik parse isabet oranı
+(süreç geneli).
+"""
+
+import io
+import re
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import pdfplumber
+
+logger = logging.getLogger(__name__)
+
+# GG.AA.YYYY veya GG/AA/YYYY
+TARIH_PATTERN = r'\d{2}[./]\d{2}[./]\d{4}'
+
+
+def extract_pdf_text(pdf_bytes: bytes) -> str:
+    """PDF'in metin katmanını çıkar (taranmış PDF'te boş döner)"""
+    try:
+        with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+            return "\n".join(page.extract_text() or "" for page in pdf.pages)
+    except Exception as e:
+        logger.warning(f"PDF metin çıkarma hatası: {e}")
+        return ""
+
+
+def find_labeled(text: str, labels: str, value: str = r'.+?', line_end: bool = True) -> Optional[str]:
+    """
+    "Etiket : Değer" satırından değeri al
+
+    Args:
+        text: Belge metni
+        labels: Etiket regex'i (ör. r'Diploma\\s+No(?:su)?')
+        value: Değer regex'i
+        line_end: Değer satır sonuna kadar mı? (serbest metin alanları için)
+
+    Returns:
+        str veya None
+    """
+    pattern = rf'^[ \t]*(?:{labels})[ \t]*:?[ \t]*({value})[ \t]*' + ('$' if line_end else '')
+    match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+    if not match and not line_end:
+        # Aynı satırda birden fazla etiket olabilir ("T.C. Kimlik No 123 Adı ELİF")
+        match = re.search(rf'(?:{labels})[ \t]*:?[ \t]*({value})', text, re.IGNORECASE)
+    if not match:
+        return None
+    return match.group(1).strip() or None
+
+
+def parse_date(value: Optional[str]) -> Optional[datetime]:
+    """GG.AA.YYYY / GG/AA/YYYY → datetime"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value.replace('/', '.'), '%d.%m.%Y')
+    except ValueError:
+        return None
+
+
+class ParseStats:
+    """Belge tipi bazlı deterministik parse isabet sayaçları (süreç geneli)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, List] = {}
+
+    def record(self, document_type: str, hit: bool, elapsed: float = 0.0):
+        with self._lock:
+            counts = self._counts.setdefault(document_type, [0, 0, 0.0])
+            counts[0] += 1
+            counts[1] += 1 if hit else 0
+            counts[2] += elapsed
+
+    def hit_rate(self, document_type: str) -> float:
+        with self._lock:
+            attempts, hits, _ = self._counts.get(document_type, (0, 0, 0.0))
+            return hits / attempts if attempts else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                doc_type: {
+                    'attempts': attempts,
+                    'hits': hits,
+                    'hit_rate': hits / attempts if attempts else 0.0,
+                    'avg_parse_ms': elapsed * 1000 / attempts if attempts else 0.0,
+                }
+                for doc_type, (attempts, hits, elapsed) in self._counts.items()
+            }
+
+    def summary(self) -> str:
+        """Tek satır rapor: "Diploma 4/5 (%80), Adli Sicil 3/3 (%100)" """
+        return ", ".join(
+            f"{doc_type} {s['hits']}/{s['attempts']} ({s['hit_rate']:.0%})"
+            for doc_type, s in self.to_dict().items()
+        )
+
+
+parse_stats = ParseStats()